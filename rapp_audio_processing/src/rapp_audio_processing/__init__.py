@@ -25,3 +25,11 @@ from rapp_sox_denoise import SoxDenoise
 from rapp_utilities import Utilities
 from rapp_set_noise_profile import SetNoiseProfile
 from rapp_transform_audio import TransformAudio
+from rapp_signal_statistics import SignalStatistics
+from rapp_audio_backends import SoxAudioBackend, NumpyAudioBackend
+from rapp_audio_pipeline import AudioPipeline
+from rapp_audio_cache import AudioCache
+from rapp_spectral_denoise import SpectralDenoise
+from rapp_noise_profile_registry import NoiseProfileRegistry
+from rapp_trim_silence import TrimSilence
+from rapp_batch_processing import BatchProcessing
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import numpy
+import rospkg
+from scipy.io import wavfile
+
+from rapp_audio_processing import SetNoiseProfile
+from rapp_audio_processing import SoxDenoise
+from rapp_audio_processing import SpectralDenoise
+
+## @class DenoiseBenchmark
+# Compares the sox noisered denoising of rapp_sox_denoise.SoxDenoise against
+# the native spectral subtraction of rapp_spectral_denoise.SpectralDenoise
+# over the mono wav files of rapp_testing_tools/test_data
+#
+# The noise profile is set from silence_sample.wav for a temporary benchmark
+# user. For each file the mean latency, the energy reduction and the
+# agreement (SNR) of the native output with the sox output are reported.
+# The residual noise is measured on the noise file itself.
+class DenoiseBenchmark:
+
+  ## The benchmark user
+  user = "rapp_denoise_benchmark"
+  ## The benchmark audio type
+  audio_type = "nao_wav_1_ch"
+
+  ## Performs the benchmark
+  #
+  # @param repetitions [int] Number of runs per file and implementation
+  # @param scale       [float] Denoise scale
+  def __init__(self, repetitions, scale):
+    rospack = rospkg.RosPack()
+    test_data = rospack.get_path("rapp_testing_tools") + "/test_data/"
+    self._sox_denoise = SoxDenoise()
+    self._spectral_denoise = SpectralDenoise()
+    self._output_dir = tempfile.mkdtemp(prefix = 'denoise_benchmark_')
+    user_directory = os.path.expanduser(\
+        "~/rapp_platform_files/audio_processing/") + self.user
+
+    try:
+      status = SetNoiseProfile().setNoise_profile(\
+          self.user, test_data + "silence_sample.wav", self.audio_type)
+      if status != "true":
+        print "Noise profile error: " + status
+        return
+
+      total_sox = 0.0
+      total_native = 0.0
+      for f in sorted(os.listdir(test_data)):
+        if not f.endswith(".wav"):
+          continue
+        samp_freq, signal = wavfile.read(test_data + f)
+        if len(signal.shape) != 1 or samp_freq != 16000:
+          continue
+
+        [sox_time, sox_signal] = self._measure(self._soxDenoise, \
+            test_data + f, scale, repetitions)
+        [native_time, native_signal] = self._measure(self._nativeDenoise, \
+            test_data + f, scale, repetitions)
+        if sox_signal is None or native_signal is None:
+          print f + ": denoising failed"
+          continue
+
+        total_sox += sox_time
+        total_native += native_time
+        print f + ": sox " + str(round(sox_time * 1000.0, 2)) + " ms (" + \
+            str(self._reduction(signal, sox_signal)) + " dB), native " + \
+            str(round(native_time * 1000.0, 2)) + " ms (" + \
+            str(self._reduction(signal, native_signal)) + \
+            " dB), native/sox SNR " + \
+            str(self._snr(sox_signal, native_signal)) + " dB" + \
+            (" <- noise file" if f == "silence_sample.wav" else "")
+
+      print "-------------------------------------------------"
+      if total_native > 0:
+        print "Overall speedup: x" + str(round(total_sox / total_native, 1))
+    finally:
+      shutil.rmtree(self._output_dir)
+      shutil.rmtree(user_directory, ignore_errors = True)
+
+  ## Measures the mean execution time of a denoising implementation
+  #
+  # @param implementation [function] The implementation to be measured
+  # @param audio_file     [string] The input audio file
+  # @param scale          [float] Denoise scale
+  # @param repetitions    [int] Number of runs
+  #
+  # @return mean_time [float] The mean execution time in seconds
+  # @return signal    [numpy.ndarray] The denoised signal (None on failure)
+  def _measure(self, implementation, audio_file, scale, repetitions):
+    start = time.time()
+    for i in range(0, repetitions):
+      signal = implementation(audio_file, scale)
+    return [(time.time() - start) / repetitions, signal]
+
+  ## Denoises a file employing sox
+  #
+  # @param audio_file [string] The input audio file
+  # @param scale      [float] Denoise scale
+  #
+  # @return signal [numpy.ndarray] The denoised signal (None on failure)
+  def _soxDenoise(self, audio_file, scale):
+    output = os.path.join(self._output_dir, "sox.wav")
+    status = self._sox_denoise.soxDenoise(\
+        self.user, self.audio_type, audio_file, output, scale)
+    if status != "true":
+      return None
+    return wavfile.read(output)[1]
+
+  ## Denoises a file employing the native spectral subtraction
+  #
+  # @param audio_file [string] The input audio file
+  # @param scale      [float] Denoise scale
+  #
+  # @return signal [numpy.ndarray] The denoised signal (None on failure)
+  def _nativeDenoise(self, audio_file, scale):
+    output = os.path.join(self._output_dir, "native.wav")
+    status = self._spectral_denoise.spectralDenoise(\
+        self.user, self.audio_type, audio_file, output, scale)
+    if status != "true":
+      return None
+    return wavfile.read(output)[1]
+
+  ## Computes the energy reduction of a denoised signal
+  #
+  # @param original [numpy.ndarray] The original signal
+  # @param denoised [numpy.ndarray] The denoised signal
+  #
+  # @return reduction [float] The energy reduction in dB
+  def _reduction(self, original, denoised):
+    energy_orig = numpy.sum(numpy.square(original.astype(numpy.float64)))
+    energy_denoised = numpy.sum(numpy.square(denoised.astype(numpy.float64)))
+    return round(10 * numpy.log10(energy_orig / max(energy_denoised, 1e-10)), 2)
+
+  ## Computes the SNR of a signal with regard to a reference signal
+  #
+  # @param reference [numpy.ndarray] The reference signal
+  # @param signal    [numpy.ndarray] The compared signal
+  #
+  # @return snr [float] The SNR in dB
+  def _snr(self, reference, signal):
+    samples = min(len(reference), len(signal))
+    reference = reference[:samples].astype(numpy.float64)
+    error = reference - signal[:samples]
+    return round(10 * numpy.log10(numpy.sum(numpy.square(reference)) / \
+        max(numpy.sum(numpy.square(error)), 1e-10)), 2)
+
+# Main function
+if __name__ == "__main__":
+  repetitions = 5
+  scale = 0.15
+  if len(sys.argv) >= 2:
+    repetitions = int(sys.argv[1])
+  if len(sys.argv) == 3:
+    scale = float(sys.argv[2])
+  DenoiseBenchmark(repetitions, scale)
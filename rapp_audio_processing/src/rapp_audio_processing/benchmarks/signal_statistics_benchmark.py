@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import os
+import sys
+import time
+import numpy
+import rospkg
+from scipy.io import wavfile
+
+from rapp_audio_processing import SignalStatistics
+
+## @class SignalStatisticsBenchmark
+# Compares the per-sample loops previously used by
+# rapp_detect_silence.DetectSilence and rapp_energy_denoise.EnergyDenoise
+# against the vectorized rapp_signal_statistics.SignalStatistics, over the
+# wav files of rapp_testing_tools/test_data
+class SignalStatisticsBenchmark:
+
+  ## Performs the benchmark
+  #
+  # @param repetitions [int] Number of runs per file and implementation
+  def __init__(self, repetitions):
+    rospack = rospkg.RosPack()
+    test_data = rospack.get_path("rapp_testing_tools") + "/test_data/"
+    self._statistics = SignalStatistics()
+
+    files = sorted([f for f in os.listdir(test_data) if f.endswith(".wav")])
+    total_loop = 0.0
+    total_vectorized = 0.0
+    for f in files:
+      samp_freq, signal = wavfile.read(test_data + f)
+      if len(signal.shape) != 1:
+        # The energy denoising/silence detection operate on mono audio
+        signal = signal[:, 0].copy()
+
+      loop_time = self._measure(self._loopImplementation, signal, repetitions)
+      vect_time = self._measure(self._vectorizedImplementation, signal, \
+          repetitions)
+
+      # Both implementations must produce identical results
+      [loop_rsd, loop_signal] = self._loopImplementation(signal)
+      [vect_rsd, vect_signal] = self._vectorizedImplementation(signal)
+      identical = numpy.allclose(loop_rsd, vect_rsd) and \
+          numpy.array_equal(loop_signal, vect_signal)
+
+      total_loop += loop_time
+      total_vectorized += vect_time
+      print f + " (" + str(len(signal)) + " samples): loop " + \
+          str(round(loop_time * 1000.0, 3)) + " ms, vectorized " + \
+          str(round(vect_time * 1000.0, 3)) + " ms, speedup x" + \
+          str(round(loop_time / vect_time, 1)) + \
+          ("" if identical else " -- RESULTS DIFFER")
+
+    print "-------------------------------------------------"
+    print "Overall speedup: x" + str(round(total_loop / total_vectorized, 1))
+
+  ## Measures the mean execution time of an implementation
+  #
+  # @param implementation [function] The implementation to be measured
+  # @param signal         [numpy.ndarray] The input signal
+  # @param repetitions    [int] Number of runs
+  #
+  # @return mean_time [float] The mean execution time in seconds
+  def _measure(self, implementation, signal, repetitions):
+    start = time.time()
+    for i in range(0, repetitions):
+      implementation(signal)
+    return (time.time() - start) / repetitions
+
+  ## The legacy per-sample implementation
+  #
+  # @param signal [numpy.ndarray] The input signal
+  #
+  # @return rsd_sq   [float] The relative standard deviation of the power
+  # @return denoised [numpy.ndarray] The energy denoised signal (scale 0.125)
+  def _loopImplementation(self, signal):
+    denoised = signal.copy()
+    sq_signal = signal * 1.0
+    for i in range(0, len(sq_signal)):
+      sq_signal[i] *= sq_signal[i]
+    mean_sq = numpy.mean(sq_signal)
+    std_sq = numpy.std(sq_signal)
+    rsd_sq = std_sq / mean_sq
+    for i in range(0, len(sq_signal)):
+      if sq_signal[i] < 0.125 * mean_sq:
+        denoised[i] = 0
+    return [rsd_sq, denoised]
+
+  ## The vectorized implementation
+  #
+  # @param signal [numpy.ndarray] The input signal
+  #
+  # @return rsd_sq   [float] The relative standard deviation of the power
+  # @return denoised [numpy.ndarray] The energy denoised signal (scale 0.125)
+  def _vectorizedImplementation(self, signal):
+    denoised = signal.copy()
+    sq_signal = self._statistics.squareSignal(signal)
+    [mean_sq, std_sq] = self._statistics.powerStatistics(sq_signal)
+    rsd_sq = std_sq / mean_sq
+    denoised[self._statistics.thresholdMask(sq_signal, 0.125, mean_sq)] = 0
+    return [rsd_sq, denoised]
+
+# Main function
+if __name__ == "__main__":
+  repetitions = 5
+  if len(sys.argv) == 2:
+    repetitions = int(sys.argv[1])
+  SignalStatisticsBenchmark(repetitions)
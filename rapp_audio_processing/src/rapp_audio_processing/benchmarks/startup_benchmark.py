@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import sys
+import subprocess
+
+## The code measuring the node's startup in a fresh interpreter. The
+# rapp_audio_processing modules previously performed 'from pylab import *',
+# which is reproduced by the 'before' setup.
+measurement_code = """
+import os
+import time
+import resource
+start = time.time()
+%s
+from rapp_audio_processing.rapp_audio_processing import AudioProcessing
+from rapp_audio_processing import AudioPipeline, TrimSilence
+AudioPipeline()
+TrimSilence()
+elapsed = time.time() - start
+print str(elapsed) + ' ' + \\
+    str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+## @class StartupBenchmark
+# Measures the startup time and resident memory of the AudioProcessing node
+# modules, importing pylab (as the modules did before) or not. Each
+# measurement is performed in a fresh interpreter.
+class StartupBenchmark:
+
+  ## Performs the benchmark
+  #
+  # @param repetitions [int] Number of runs per setup
+  def __init__(self, repetitions):
+    setups = [ \
+        ['before (pylab)', 'from pylab import *'], \
+        ['after', ''] \
+        ]
+    results = []
+    for [name, setup] in setups:
+      [startup_time, max_rss] = self._measure(setup, repetitions)
+      results.append([startup_time, max_rss])
+      print name + ": startup " + str(round(startup_time * 1000.0, 1)) + \
+          " ms, max RSS " + str(round(max_rss / 1024.0, 1)) + " MB"
+
+    print "-------------------------------------------------"
+    print "Startup speedup: x" + \
+        str(round(results[0][0] / results[1][0], 1)) + ", RSS saved: " + \
+        str(round((results[0][1] - results[1][1]) / 1024.0, 1)) + " MB"
+
+  ## Measures the mean startup time and the maximum RSS of a setup
+  #
+  # @param setup       [string] The code executed before the imports
+  # @param repetitions [int] Number of runs
+  #
+  # @return startup_time [float] The mean startup time in seconds
+  # @return max_rss      [int] The maximum resident set size in KB
+  def _measure(self, setup, repetitions):
+    total_time = 0.0
+    max_rss = 0
+    for i in range(0, repetitions):
+      output = subprocess.check_output(\
+          [sys.executable, '-c', measurement_code % setup])
+      [startup_time, rss] = output.split()[-2:]
+      total_time += float(startup_time)
+      max_rss = max(max_rss, int(rss))
+    return [total_time / repetitions, max_rss]
+
+# Main function
+if __name__ == "__main__":
+  repetitions = 5
+  if len(sys.argv) == 2:
+    repetitions = int(sys.argv[1])
+  StartupBenchmark(repetitions)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Aris Thallas
+# contact: aris.thallas@{iti.gr, gmail.com}
+
+import os
+import sys
+import tempfile
+import shutil
+import rospkg
+from scipy.io import wavfile
+
+from rapp_audio_processing import TransformAudio
+
+## @class TransformAudioBenchmark
+# @brief Reports the per-backend latency of rapp_transform_audio.TransformAudio
+#
+# Transforms every wav/ogg file of rapp_testing_tools/test_data to a mono
+# 16kHz wav (the Sphinx4 input format) and to flac, first employing only SoX
+# and then the default (in-process with SoX fallback) backends.
+class TransformAudioBenchmark:
+
+    ## @brief Performs the benchmark
+    # @param repetitions [int] Number of transformations per file
+    def __init__(self, repetitions):
+        rospack = rospkg.RosPack()
+        test_data = rospack.get_path( "rapp_testing_tools" ) + "/test_data/"
+        self._output_dir = tempfile.mkdtemp( prefix = 'transform_benchmark_' )
+
+        try:
+            for backend in [ 'sox', 'auto' ]:
+                module = TransformAudio( backend )
+                self._transformFiles( module, test_data, repetitions )
+                self._printReport( backend, module.getLatencyReport() )
+        finally:
+            shutil.rmtree( self._output_dir )
+
+    ## @brief Transforms all the test files
+    # @param module [TransformAudio] The transformation module
+    # @param folder [string] The test files folder
+    # @param repetitions [int] Number of transformations per file
+    def _transformFiles(self, module, folder, repetitions):
+        for filename in sorted( os.listdir( folder ) ):
+            [ name, extension ] = os.path.splitext( filename )
+            source_name = os.path.join( folder, filename )
+            if extension == '.ogg':
+                source_type = 'nao_ogg'
+            elif extension == '.wav':
+                samp_freq, signal = wavfile.read( source_name )
+                if len( signal.shape ) == 1:
+                    source_type = 'nao_wav_1_ch'
+                else:
+                    source_type = 'nao_wav_4_ch'
+            else:
+                continue
+
+            for target_type in [ 'wav', 'flac' ]:
+                target_name = os.path.join( self._output_dir, \
+                        name + '.' + target_type )
+                for i in range( 0, repetitions ):
+                    [ status, fullpath ] = module.transform_audio( \
+                            source_type, source_name, target_type, \
+                            target_name, 1, 16000 )
+                    if status != 'success':
+                        print filename + ': ' + status
+
+    ## @brief Prints the latency report
+    # @param backend [string] The requested backend
+    # @param report [dictionary] The TransformAudio latency report
+    def _printReport(self, backend, report):
+        print "Requested backend: " + backend
+        for name in report:
+            stats = report[ name ]
+            print "  " + name + ": " + str( stats['calls'] ) + " calls, mean " + \
+                str( round( stats['mean_ms'], 2 ) ) + " ms, min " + \
+                str( round( stats['min_ms'], 2 ) ) + " ms, max " + \
+                str( round( stats['max_ms'], 2 ) ) + " ms"
+        print "-------------------------------------------------"
+
+# Main function
+if __name__ == "__main__":
+    repetitions = 5
+    if len( sys.argv ) == 2:
+        repetitions = int( sys.argv[1] )
+    TransformAudioBenchmark( repetitions )
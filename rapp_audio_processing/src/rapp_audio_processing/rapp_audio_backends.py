@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Aris Thallas
+# contact: aris.thallas@{iti.gr, gmail.com}
+
+import os
+import subprocess
+import numpy
+from fractions import gcd
+from scipy.io import wavfile
+from scipy.signal import resample
+
+try:
+    from scipy.signal import resample_poly
+except ImportError:
+    resample_poly = None
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+## @class SoxAudioBackend
+# @brief Performs audio transformations employing the SoX and flac applications
+#
+# Every conversion forks a shell and a sox/flac process. Supports all the
+# audio types and formats, thus it is used as the fallback backend of
+# rapp_transform_audio.TransformAudio.
+class SoxAudioBackend:
+
+    ## The backend name used in the latency reports
+    name = 'sox'
+
+    ## @brief Checks if the backend can perform the requested transformation
+    # @param source_type [string] The source audio file's type
+    # @param source_channels [int] The source channel number (0 if unknown)
+    # @param target_type [string] The target audio file's type
+    # @param target_channels [int] The target audio's channel number
+    #
+    # @return supported [bool] True if the transformation is supported
+    def supports(self, source_type, source_channels, target_type, \
+            target_channels):
+        return True
+
+    ## @brief Performs audio conversion
+    # @param source_name [string] The source audio file's name
+    # @param source_audio [list] Unused, the file is decoded by sox
+    # @param target_type [string] The target audio file's type
+    # @param target_name [string] The target audio file's name
+    # @param target_channels [int] The target audio's channel number
+    # @param target_rate [int] The target audio's sample rate
+    #
+    # @exception Exception Conversion malfunction
+    def convert(self, source_name, source_audio, target_type, target_name, \
+            target_channels, target_rate):
+
+        channels = ''
+        rate = ''
+        if target_type == 'flac':
+            if target_channels != 0:
+                channels = '--channels=' + str( target_channels )
+            if target_rate != 0:
+                rate = '--sample-rate=' + str( target_rate )
+
+            command = 'flac -f ' + channels + ' ' + rate + " " + source_name + \
+                ' -o ' + target_name + " --totally-silent --channel-map=none"
+            flac_status = os.system( command )
+
+
+            if os.path.isfile( target_name ) != True or flac_status != 0 :
+                raise Exception( "Error: flac command malfunctioned. File path was"\
+                        + source_name )
+        else:
+            if target_channels != 0:
+                channels = '-c ' + str( target_channels )
+            if target_rate != 0:
+                rate = '-r ' + str( target_rate )
+            command = "sox " + source_name + " " + channels + " " + rate + \
+                    " " + target_name
+
+            sox_status = os.system( command )
+
+            if os.path.isfile( target_name ) != True or sox_status:
+                raise Exception( "Error: SoX malfunctioned. File path was" + \
+                        source_name )
+
+    ## @brief Decodes an audio file to a 16 bit signal employing SoX
+    #
+    # The samples are read from the sox standard output as raw PCM, thus no
+    # intermediate file is created. Unspecified channels or rate are
+    # acquired via soxi.
+    #
+    # @param source_name [string] The source audio file's name
+    # @param target_channels [int] The target audio's channel number (0 to keep)
+    # @param target_rate [int] The target audio's sample rate (0 to keep)
+    #
+    # @return source_audio [list] The decoded [rate, signal]
+    # @exception Exception Decoding malfunction
+    def decodeSignal(self, source_name, target_channels, target_rate):
+
+        if target_channels == 0:
+            target_channels = self._soxiInfo( source_name, '-c' )
+        if target_rate == 0:
+            target_rate = self._soxiInfo( source_name, '-r' )
+
+        command = [ 'sox', source_name, '-t', 'raw', '-e', 'signed-integer', \
+                '-b', '16', '-L', '-c', str( target_channels ), \
+                '-r', str( target_rate ), '-' ]
+        try:
+            proc = subprocess.Popen( command, stdout = subprocess.PIPE, \
+                    stderr = subprocess.PIPE )
+            ( out, err ) = proc.communicate()
+        except OSError:
+            proc = None
+        if proc is None or proc.returncode != 0:
+            raise Exception( "Error: SoX malfunctioned. File path was" + \
+                    source_name )
+
+        signal = numpy.fromstring( out, dtype = '<i2' ).astype( numpy.int16 )
+        if target_channels > 1:
+            signal = signal.reshape( -1, target_channels )
+        return [ target_rate, signal ]
+
+    ## @brief Acquires an audio file attribute via soxi
+    # @param source_name [string] The audio file's name
+    # @param option [string] The soxi option ('-c' or '-r')
+    #
+    # @return value [int] The attribute value
+    # @exception Exception soxi malfunction
+    def _soxiInfo(self, source_name, option):
+        try:
+            proc = subprocess.Popen( [ 'soxi', option, source_name ], \
+                    stdout = subprocess.PIPE, stderr = subprocess.PIPE )
+            ( out, err ) = proc.communicate()
+            if proc.returncode == 0:
+                return int( float( out ) )
+        except ( OSError, ValueError ):
+            pass
+        raise Exception( "Error: soxi malfunctioned. File path was" + \
+                source_name )
+
+## @class NumpyAudioBackend
+# @brief Performs audio transformations in-process on NumPy buffers
+#
+# Supports wav sources (headset, nao_wav_1_ch, nao_wav_4_ch) and wav targets,
+# as well as flac targets if the optional soundfile module is installed.
+# Channels can be down-mixed to mono (by averaging) or a mono signal can be
+# replicated to any number of channels. Resampling is performed with a
+# polyphase filter for simple rate ratios (e.g. 48kHz to 16kHz) and in the
+# frequency domain otherwise.
+class NumpyAudioBackend:
+
+    ## The backend name used in the latency reports
+    name = 'numpy'
+    ## Maximum up/down factor for which polyphase resampling is employed
+    max_polyphase_factor = 160
+
+    ## @brief Checks if the backend can perform the requested transformation
+    # @param source_type [string] The source audio file's type
+    # @param source_channels [int] The source channel number (0 if unknown)
+    # @param target_type [string] The target audio file's type
+    # @param target_channels [int] The target audio's channel number
+    #
+    # @return supported [bool] True if the transformation is supported
+    def supports(self, source_type, source_channels, target_type, \
+            target_channels):
+
+        if source_type not in ['headset', 'nao_wav_1_ch', 'nao_wav_4_ch']:
+            return False
+        if target_type == 'flac':
+            if soundfile is None:
+                return False
+        elif target_type != 'wav':
+            return False
+        if target_channels not in [0, 1, source_channels] and \
+                source_channels != 1:
+            return False
+        return True
+
+    ## @brief Performs audio conversion
+    # @param source_name [string] The source audio file's name
+    # @param source_audio [list] The already decoded [rate, signal] or None
+    # @param target_type [string] The target audio file's type
+    # @param target_name [string] The target audio file's name
+    # @param target_channels [int] The target audio's channel number
+    # @param target_rate [int] The target audio's sample rate
+    #
+    # @exception Exception Conversion malfunction
+    def convert(self, source_name, source_audio, target_type, target_name, \
+            target_channels, target_rate):
+
+        if source_audio is None:
+            source_audio = wavfile.read( source_name )
+        [ samp_freq, signal ] = source_audio
+
+        signal = self.convertSignal( signal, samp_freq, target_channels, \
+                target_rate )
+        if target_rate != 0:
+            samp_freq = target_rate
+
+        try:
+            if target_type == 'flac':
+                soundfile.write( target_name, signal, samp_freq, \
+                        format = 'FLAC' )
+            else:
+                wavfile.write( target_name, samp_freq, signal )
+        except Exception as e:
+            raise Exception( "Error: In-process conversion malfunctioned (" + \
+                    str(e) + "). File path was" + source_name )
+
+    ## @brief Performs the channel and sample rate conversion of a signal
+    # @param signal [numpy.ndarray] The signal (samples x channels, or samples)
+    # @param samp_freq [int] The signal's sample rate
+    # @param target_channels [int] The target channel number (0 to keep)
+    # @param target_rate [int] The target sample rate (0 to keep)
+    #
+    # @return signal [numpy.ndarray] The converted signal (same dtype)
+    def convertSignal(self, signal, samp_freq, target_channels, target_rate):
+
+        dtype = signal.dtype
+        channels = 1 if len( signal.shape ) == 1 else signal.shape[1]
+
+        if target_channels == 1 and channels > 1:
+            signal = signal.mean( axis = 1 )
+        elif target_channels > 1 and channels == 1:
+            signal = numpy.tile( signal.reshape( -1, 1 ), \
+                    ( 1, target_channels ) )
+
+        if target_rate != 0 and target_rate != samp_freq:
+            divisor = gcd( int( target_rate ), int( samp_freq ) )
+            up = int( target_rate ) / divisor
+            down = int( samp_freq ) / divisor
+            if resample_poly is not None and \
+                    max( up, down ) <= self.max_polyphase_factor:
+                signal = resample_poly( signal, up, down, axis = 0 )
+            else:
+                samples = int( round( signal.shape[0] * 1.0 * target_rate / \
+                        samp_freq ) )
+                signal = resample( signal, samples, axis = 0 )
+
+        if signal.dtype != dtype:
+            if numpy.issubdtype( dtype, numpy.integer ):
+                limits = numpy.iinfo( dtype )
+                signal = numpy.clip( numpy.round( signal ), limits.min, \
+                        limits.max )
+            signal = signal.astype( dtype )
+        return signal
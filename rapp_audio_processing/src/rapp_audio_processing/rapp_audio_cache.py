@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import os
+import shutil
+import hashlib
+import threading
+import cPickle as pickle
+from collections import OrderedDict
+
+## @class AudioCache
+# Content-addressed cache of the audio processing stages' outputs
+#
+# The cache key is the hash of the input audio bytes along with the stage
+# name, its parameters and the version of the user's noise profile. Entries
+# are kept in memory and on disk, both with LRU eviction under a size cap.
+# Entries depending on a user's noise profile are stored per user, in order
+# to be invalidated when a new noise profile is set.
+class AudioCache:
+
+  ## Constructor performing initializations
+  #
+  # @param directory       [string] The disk cache directory
+  # @param max_memory_size [int] The memory cache size cap in bytes
+  # @param max_disk_size   [int] The disk cache size cap in bytes
+  def __init__(self, directory, max_memory_size, max_disk_size):
+    ## The disk cache directory
+    self._directory = directory
+    ## The memory cache size cap in bytes
+    self._max_memory_size = max_memory_size
+    ## The disk cache size cap in bytes
+    self._max_disk_size = max_disk_size
+
+    ## The memory entries: key -> [user, size, [result, data]]
+    self._memory = OrderedDict()
+    ## The memory cache size in bytes
+    self._memory_size = 0
+    ## The disk entries: key -> [user, size]
+    self._disk = OrderedDict()
+    ## The disk cache size in bytes
+    self._disk_size = 0
+
+    ## Cache hits counter
+    self._hits = 0
+    ## Cache misses counter
+    self._misses = 0
+    ## Evictions counter
+    self._evictions = 0
+    ## Protects the cache structures, since services are threaded
+    self._lock = threading.Lock()
+
+    self._loadDiskIndex()
+
+  ## Creates the cache key of a processing stage
+  #
+  # @param audio_file    [string] The input audio file path
+  # @param stage         [string] The processing stage name
+  # @param params        [list] The stage parameters (e.g. scale, audio_type)
+  # @param noise_profile [string] The noise profile path the stage depends on (optional)
+  #
+  # @return key [string] The cache key, None if the audio file does not exist
+  def createKey(self, audio_file, stage, params, noise_profile = None):
+    if not os.path.isfile(audio_file):
+      return None
+
+    digest = hashlib.sha1()
+    with open(audio_file, 'rb') as f:
+      for chunk in iter(lambda: f.read(65536), b''):
+        digest.update(chunk)
+    digest.update(stage)
+    digest.update(repr(params))
+    if noise_profile is not None:
+      digest.update(repr(self._noiseProfileVersion(noise_profile)))
+    return digest.hexdigest()
+
+  ## Returns a cache entry
+  #
+  # @param user [string] The user owning the entry ('' for shared entries)
+  # @param key  [string] The cache key
+  #
+  # @return entry [list] The cached [result, data] or None
+  def get(self, user, key):
+    with self._lock:
+      if key in self._memory:
+        self._memory[key] = self._memory.pop(key)
+        self._hits += 1
+        return self._memory[key][2]
+
+      if key in self._disk:
+        path = self._entryPath(self._disk[key][0], key)
+        try:
+          with open(path, 'rb') as f:
+            entry = pickle.load(f)
+          os.utime(path, None)
+        except Exception:
+          self._removeDiskEntry(key)
+          self._misses += 1
+          return None
+        self._disk[key] = self._disk.pop(key)
+        self._storeInMemory(self._disk[key][0], key, entry)
+        self._hits += 1
+        return entry
+
+      self._misses += 1
+      return None
+
+  ## Stores a cache entry
+  #
+  # @param user   [string] The user owning the entry ('' for shared entries)
+  # @param key    [string] The cache key
+  # @param result [object] The stage result
+  # @param data   [string] The stage output bytes (None if no output exists)
+  def put(self, user, key, result, data):
+    entry = [result, data]
+    with self._lock:
+      self._storeInMemory(user, key, entry)
+      self._storeOnDisk(user, key, entry)
+
+  ## Performs a processing stage employing the cache
+  #
+  # On a hit the cached output is written to the output file and the cached
+  # result is returned. On a miss the stage is performed and, if successful,
+  # its result and output file are cached.
+  #
+  # @param user        [string] The user owning the entry ('' for shared entries)
+  # @param key         [string] The cache key (None to bypass the cache)
+  # @param output_file [string] The stage output file ('' if none)
+  # @param function    [function] Performs the stage, returning its result
+  # @param is_success  [function] Checks whether a stage result is successful
+  #
+  # @return result [object] The stage result
+  def cachedCall(self, user, key, output_file, function, is_success):
+    if key is None:
+      return function()
+
+    entry = self.get(user, key)
+    if entry is not None:
+      [result, data] = entry
+      if data is not None and output_file != '':
+        with open(output_file, 'wb') as f:
+          f.write(data)
+      return result
+
+    result = function()
+    if is_success(result):
+      data = None
+      if output_file != '' and os.path.isfile(output_file):
+        with open(output_file, 'rb') as f:
+          data = f.read()
+      self.put(user, key, result, data)
+    return result
+
+  ## Invalidates all the entries of a user
+  #
+  # Called when a new noise profile is set for the user
+  #
+  # @param user [string] The user
+  def invalidateUser(self, user):
+    with self._lock:
+      for key in [k for k in self._memory if self._memory[k][0] == user]:
+        self._memory_size -= self._memory.pop(key)[1]
+      for key in [k for k in self._disk if self._disk[k][0] == user]:
+        self._disk_size -= self._disk.pop(key)[1]
+      user_directory = self._userDirectory(user)
+      if os.path.isdir(user_directory):
+        shutil.rmtree(user_directory, ignore_errors = True)
+
+  ## Returns the cache statistics
+  #
+  # @return statistics [dictionary] Hits, misses, evictions and cache sizes
+  def getStatistics(self):
+    with self._lock:
+      return {
+          'hits': self._hits,
+          'misses': self._misses,
+          'evictions': self._evictions,
+          'memory_entries': len(self._memory),
+          'memory_size': self._memory_size,
+          'disk_entries': len(self._disk),
+          'disk_size': self._disk_size
+          }
+
+  ## Stores an entry in memory, evicting the least recently used ones
+  #
+  # @param user  [string] The user owning the entry
+  # @param key   [string] The cache key
+  # @param entry [list] The [result, data] entry
+  def _storeInMemory(self, user, key, entry):
+    size = self._entrySize(entry)
+    if size > self._max_memory_size:
+      return
+    if key in self._memory:
+      self._memory_size -= self._memory.pop(key)[1]
+    self._memory[key] = [user, size, entry]
+    self._memory_size += size
+    while self._memory_size > self._max_memory_size:
+      self._memory_size -= self._memory.popitem(last = False)[1][1]
+      self._evictions += 1
+
+  ## Stores an entry on disk, evicting the least recently used ones
+  #
+  # @param user  [string] The user owning the entry
+  # @param key   [string] The cache key
+  # @param entry [list] The [result, data] entry
+  def _storeOnDisk(self, user, key, entry):
+    size = self._entrySize(entry)
+    if size > self._max_disk_size:
+      return
+    user_directory = self._userDirectory(user)
+    try:
+      if not os.path.isdir(user_directory):
+        os.makedirs(user_directory)
+      with open(self._entryPath(user, key), 'wb') as f:
+        pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+      size = os.path.getsize(self._entryPath(user, key))
+    except (IOError, OSError):
+      return
+    if key in self._disk:
+      self._disk_size -= self._disk.pop(key)[1]
+    self._disk[key] = [user, size]
+    self._disk_size += size
+    while self._disk_size > self._max_disk_size:
+      old_key = next(iter(self._disk))
+      self._removeDiskEntry(old_key)
+      self._evictions += 1
+
+  ## Removes a disk entry
+  #
+  # @param key [string] The cache key
+  def _removeDiskEntry(self, key):
+    [user, size] = self._disk.pop(key)
+    self._disk_size -= size
+    try:
+      os.remove(self._entryPath(user, key))
+    except OSError:
+      pass
+
+  ## Loads the disk entries index, ordered by their last access
+  def _loadDiskIndex(self):
+    if not os.path.isdir(self._directory):
+      return
+    entries = []
+    for user_folder in os.listdir(self._directory):
+      user_directory = os.path.join(self._directory, user_folder)
+      if not os.path.isdir(user_directory):
+        continue
+      user = '' if user_folder == '_shared' else user_folder
+      for key in os.listdir(user_directory):
+        stat = os.stat(os.path.join(user_directory, key))
+        entries.append([stat.st_mtime, key, user, stat.st_size])
+    for [mtime, key, user, size] in sorted(entries):
+      self._disk[key] = [user, size]
+      self._disk_size += size
+
+  ## Returns the cache directory of a user
+  #
+  # @param user [string] The user ('' for shared entries)
+  #
+  # @return directory [string] The user's cache directory
+  def _userDirectory(self, user):
+    if user == '':
+      return os.path.join(self._directory, '_shared')
+    return os.path.join(self._directory, user)
+
+  ## Returns the disk path of an entry
+  #
+  # @param user [string] The user owning the entry
+  # @param key  [string] The cache key
+  #
+  # @return path [string] The entry path
+  def _entryPath(self, user, key):
+    return os.path.join(self._userDirectory(user), key)
+
+  ## Returns the approximate size of an entry
+  #
+  # @param entry [list] The [result, data] entry
+  #
+  # @return size [int] The entry size in bytes
+  def _entrySize(self, entry):
+    if entry[1] is None:
+      return len(repr(entry[0]))
+    return len(entry[1]) + len(repr(entry[0]))
+
+  ## Returns the version of a noise profile
+  #
+  # @param noise_profile [string] The noise profile path
+  #
+  # @return version [list] The modification time and size, None if the profile does not exist
+  def _noiseProfileVersion(self, noise_profile):
+    if not os.path.isfile(noise_profile):
+      return None
+    stat = os.stat(noise_profile)
+    return [stat.st_mtime, stat.st_size]
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import os
+from scipy.io import wavfile
+
+from rapp_detect_silence import DetectSilence
+from rapp_energy_denoise import EnergyDenoise
+from rapp_sox_denoise import SoxDenoise
+from rapp_spectral_denoise import SpectralDenoise
+from rapp_trim_silence import TrimSilence
+from rapp_audio_backends import SoxAudioBackend, NumpyAudioBackend
+
+## @class AudioPipeline
+# Performs the speech recognition audio preprocessing in a single pass
+#
+# The audio file is decoded once and the transformation, sox denoising,
+# silence detection, silence trimming and energy denoising stages are applied
+# on the in-memory signal. Only the final signal is written to disk, instead of one
+# intermediate file per stage.
+class AudioPipeline:
+
+  ## Constructor performing initializations
+  #
+  # @param denoise_backend        [string] The denoising backend ('native' or 'sox')
+  # @param noise_profile_registry [NoiseProfileRegistry] The shared noise spectra registry (optional)
+  def __init__(self, denoise_backend = 'sox', noise_profile_registry = None):
+    ## The denoising backend
+    self._denoise_backend = denoise_backend
+    ## Instantiates rapp_detect_silence.DetectSilence
+    self._detect_silence_module = DetectSilence()
+    ## Instantiates rapp_energy_denoise.EnergyDenoise
+    self._energy_denoise_module = EnergyDenoise()
+    ## Instantiates rapp_sox_denoise.SoxDenoise
+    self._sox_denoise_module = SoxDenoise()
+    ## Instantiates rapp_spectral_denoise.SpectralDenoise
+    self._spectral_denoise_module = SpectralDenoise(noise_profile_registry)
+    ## Instantiates rapp_trim_silence.TrimSilence
+    self._trim_silence_module = TrimSilence()
+    ## Instantiates rapp_audio_backends.SoxAudioBackend for decoding
+    self._sox_backend = SoxAudioBackend()
+    ## Instantiates rapp_audio_backends.NumpyAudioBackend for conversions
+    self._numpy_backend = NumpyAudioBackend()
+
+  ## Creates an empty processing profile
+  #
+  # The profile keys are the ones of
+  # rapp_speech_detection_sphinx4.sphinx4_wrapper.Sphinx4Wrapper::_createProcessingProfile
+  #
+  # @return profile [dictionary] The profile with all the stages disabled
+  def createProfile(self):
+    profile = {}
+    profile['sox_transform'] = False
+    profile['sox_channels_and_rate'] = False
+    profile['sox_denoising'] = False
+    profile['sox_denoising_scale'] = 0.0
+    profile['detect_silence'] = False
+    profile['detect_silence_threshold'] = 0.0
+    profile['trim_silence'] = False
+    profile['energy_denoising'] = False
+    profile['energy_denoising_init_scale'] = 0.0
+    return profile
+
+  ## Performs the preprocessing stages defined by a profile
+  #
+  # Handles service callback
+  # rapp_audio_processing.AudioProcessing#pipelineCallback
+  #
+  # If silence is detected the processing stops and no file is written. If
+  # the processed audio file is empty the signal is only analyzed. The
+  # silence trimming boundaries are located before the energy denoising,
+  # since the zeroed samples would distort the noise floor estimation, whereas
+  # the signal is trimmed afterwards in order for the energy denoising
+  # threshold to be unaffected.
+  #
+  # @param user                 [string] The system user, for environmental variable access
+  # @param audio_type           [string] Audio file's type
+  # @param audio_file           [string] Audio file path
+  # @param processed_audio_file [string] Path to write the processed audio file
+  # @param profile              [dictionary] The stages to perform and their parameters
+  #
+  # @return status      [string] "true" or the error description
+  # @return has_silence [bool] Indicates the existence of silence
+  # @return rsd_sq      [float] Noise relative standard deviation (-1 if not evaluated)
+  # @return removed_ms  [float] The trimmed audio duration in milliseconds
+  def processAudio(self, user, audio_type, audio_file, processed_audio_file, \
+      profile):
+    if not os.path.isfile(audio_file):
+      return ["The audio file does not exist", False, -1, 0]
+
+    channels = 0
+    rate = 0
+    if profile['sox_channels_and_rate']:
+      channels = 1
+      rate = 16000
+
+    # Decode the audio file once
+    try:
+      if profile['sox_transform']:
+        [samp_freq, signal] = self._sox_backend.decodeSignal(\
+            audio_file, channels, rate)
+      else:
+        samp_freq, signal = wavfile.read(audio_file)
+        if profile['sox_channels_and_rate']:
+          signal = self._numpy_backend.convertSignal(\
+              signal, samp_freq, channels, rate)
+          samp_freq = rate
+    except Exception as e:
+      return ["Audio decoding error: " + str(e), False, -1, 0]
+
+    if profile['sox_denoising']:
+      [status, signal] = self._denoiseSignal(\
+          user, audio_type, signal, samp_freq, profile['sox_denoising_scale'])
+      if status != "true":
+        return [status, False, -1, 0]
+
+    rsd_sq = -1
+    if profile['detect_silence']:
+      [rsd_sq, has_silence] = self._detect_silence_module.detectSilenceSignal(\
+          signal, profile['detect_silence_threshold'])
+      if has_silence:
+        return ["true", True, rsd_sq, 0]
+
+    [start, end] = [0, signal.shape[0]]
+    if profile['trim_silence']:
+      [start, end] = self._trim_silence_module.speechBoundaries(\
+          signal, samp_freq)
+
+    if profile['energy_denoising']:
+      signal = self._energy_denoise_module.energyDenoiseSignal(\
+          signal, profile['energy_denoising_init_scale'])
+
+    removed_ms = self._trim_silence_module.removedMilliseconds(\
+        signal, samp_freq, start, end)
+    signal = signal[start:end]
+
+    if processed_audio_file != '':
+      try:
+        wavfile.write(processed_audio_file, samp_freq, signal)
+      except Exception as e:
+        return ["Audio writing error: " + str(e), False, rsd_sq, 0]
+
+    return ["true", False, rsd_sq, removed_ms]
+
+  ## Checks if the native denoising is employed for a user and audio type
+  #
+  # The sox denoising is employed if selected, or if no noise spectrum exists
+  # (e.g. for noise profiles set before the native denoising was introduced)
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return native [bool] True if the native denoising is employed
+  def usesNativeDenoise(self, user, audio_type):
+    return self._denoise_backend == 'native' and \
+        self._spectral_denoise_module.hasNoiseSpectrum(user, audio_type)
+
+  ## Denoises a signal employing the selected backend
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  # @param signal     [numpy.ndarray] The mono audio signal
+  # @param samp_freq  [int] The signal's sample rate
+  # @param scale      [float] Denoise scale
+  #
+  # @return status [string] "true" or the error description
+  # @return signal [numpy.ndarray] The denoised signal
+  def _denoiseSignal(self, user, audio_type, signal, samp_freq, scale):
+    if self.usesNativeDenoise(user, audio_type):
+      return self._spectral_denoise_module.spectralDenoiseSignal(\
+          user, audio_type, signal, samp_freq, scale)
+    return self._sox_denoise_module.soxDenoiseSignal(\
+        user, audio_type, signal, samp_freq, scale)
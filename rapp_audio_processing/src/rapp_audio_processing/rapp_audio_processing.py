@@ -22,7 +22,6 @@ import rospy
 import sys
 import time
 import os
-from pylab import *
 from scipy.io import wavfile
 
 from rapp_platform_ros_communications.srv import (
@@ -36,7 +35,22 @@ from rapp_platform_ros_communications.srv import (
   AudioProcessingDetectSilenceSrvResponse,
 
   AudioProcessingTransformAudioSrv,
-  AudioProcessingTransformAudioSrvResponse
+  AudioProcessingTransformAudioSrvResponse,
+
+  AudioProcessingPipelineSrv,
+  AudioProcessingPipelineSrvResponse,
+
+  AudioProcessingNoiseProfilesSrv,
+  AudioProcessingNoiseProfilesSrvResponse,
+
+  AudioProcessingTrimSilenceSrv,
+  AudioProcessingTrimSilenceSrvResponse,
+
+  AudioProcessingBatchDenoiseSrv,
+  AudioProcessingBatchDenoiseSrvResponse,
+
+  AudioProcessingBatchTransformAudioSrv,
+  AudioProcessingBatchTransformAudioSrvResponse
   )
 
 from rapp_platform_ros_communications.srv import (
@@ -55,9 +69,15 @@ from std_msgs.msg import (
 from rapp_detect_silence import DetectSilence
 from rapp_energy_denoise import EnergyDenoise
 from rapp_sox_denoise import SoxDenoise
+from rapp_spectral_denoise import SpectralDenoise
+from rapp_noise_profile_registry import NoiseProfileRegistry
 from rapp_utilities import Utilities
 from rapp_set_noise_profile import SetNoiseProfile
 from rapp_transform_audio import TransformAudio
+from rapp_audio_pipeline import AudioPipeline
+from rapp_audio_cache import AudioCache
+from rapp_trim_silence import TrimSilence
+from rapp_batch_processing import BatchProcessing
 
 ## @class AudioProcessing
 # Provides audio processing utilities
@@ -74,12 +94,52 @@ class AudioProcessing:
     self._energy_denoise_module = EnergyDenoise()
     ## Instantiates rapp_sox_denoise.SoxDenoise
     self._sox_denoise_module = SoxDenoise()
+    ## @brief Instantiates rapp_noise_profile_registry.NoiseProfileRegistry
+    #
+    # Shared by all the modules employing the users' noise spectra
+    self._noise_profile_registry = NoiseProfileRegistry(\
+        max_profiles = rospy.get_param(\
+            "rapp_audio_processing_noise_profiles_max", 0))
+    ## Instantiates rapp_spectral_denoise.SpectralDenoise
+    self._spectral_denoise_module = \
+        SpectralDenoise(self._noise_profile_registry)
+    ## The denoising backend ('native' or 'sox')
+    self._denoise_backend = \
+        rospy.get_param("rapp_audio_processing_denoise_backend", "native")
     ## Instantiates rapp_utilities.Utilities
     self._utilities_module = Utilities()
     ## Instantiates rapp_set_noise_profile.SetNoiseProfile
-    self._set_noise_profile_module = SetNoiseProfile()
+    self._set_noise_profile_module = \
+        SetNoiseProfile(self._noise_profile_registry)
     ## Instantiates rapp_transform_audio.TransformAudio
-    self._transform_audio_module= TransformAudio()
+    self._transform_audio_module= TransformAudio(rospy.get_param(\
+        "rapp_audio_processing_transform_audio_backend", "auto"))
+    ## Instantiates rapp_audio_pipeline.AudioPipeline
+    self._audio_pipeline_module = AudioPipeline(self._denoise_backend, \
+        self._noise_profile_registry)
+    ## Instantiates rapp_trim_silence.TrimSilence
+    self._trim_silence_module = TrimSilence()
+    ## Instantiates rapp_batch_processing.BatchProcessing
+    self._batch_processing_module = BatchProcessing(\
+        rospy.get_param("rapp_audio_processing_batch_workers", 4))
+
+    if rospy.get_param("rapp_audio_processing_noise_profiles_preload", False):
+      loaded = self._noise_profile_registry.warm()
+      rospy.loginfo("Preloaded " + str(loaded) + " noise profiles")
+
+    ## @brief Instantiates rapp_audio_cache.AudioCache
+    #
+    # Caches the processing stages' outputs. None if caching is disabled.
+    self._audio_cache = None
+    if rospy.get_param("rapp_audio_processing_cache_enabled", True):
+      self._audio_cache = AudioCache(\
+          os.path.expanduser(rospy.get_param(\
+              "rapp_audio_processing_cache_directory",\
+              "~/rapp_platform_files/audio_processing_cache")),\
+          rospy.get_param("rapp_audio_processing_cache_memory_size",\
+              32 * 1024 * 1024),\
+          rospy.get_param("rapp_audio_processing_cache_disk_size",\
+              256 * 1024 * 1024))
 
     # Parameters acquisition
     set_noise_profile_topic = \
@@ -92,6 +152,16 @@ class AudioProcessing:
         rospy.get_param("rapp_audio_processing_detect_silence_topic")
     transform_audio_topic = \
         rospy.get_param("rapp_audio_processing_transform_audio_topic")
+    pipeline_topic = \
+        rospy.get_param("rapp_audio_processing_pipeline_topic")
+    noise_profiles_topic = \
+        rospy.get_param("rapp_audio_processing_noise_profiles_topic")
+    trim_silence_topic = \
+        rospy.get_param("rapp_audio_processing_trim_silence_topic")
+    batch_denoise_topic = \
+        rospy.get_param("rapp_audio_processing_batch_denoise_topic")
+    batch_transform_audio_topic = \
+        rospy.get_param("rapp_audio_processing_batch_transform_audio_topic")
 
     if(not set_noise_profile_topic):
       rospy.logerror("Audio processing noise profiling topic param not found")
@@ -103,6 +173,16 @@ class AudioProcessing:
       rospy.logerror("Audio processing detect silence topic param not found")
     if(not transform_audio_topic):
       rospy.logerror("Audio processing noise transform audio topic param not found")
+    if(not pipeline_topic):
+      rospy.logerr("Audio processing pipeline topic param not found")
+    if(not noise_profiles_topic):
+      rospy.logerr("Audio processing noise profiles topic param not found")
+    if(not trim_silence_topic):
+      rospy.logerr("Audio processing trim silence topic param not found")
+    if(not batch_denoise_topic):
+      rospy.logerr("Audio processing batch denoise topic param not found")
+    if(not batch_transform_audio_topic):
+      rospy.logerr("Audio processing batch transform audio topic param not found")
 
     # Check for denoising debug mode. DO NOT make this true when in production
     ## Energy denoising degug flag
@@ -132,6 +212,21 @@ class AudioProcessing:
     # Create transform audio services
     transform_audio = rospy.Service( transform_audio_topic, \
         AudioProcessingTransformAudioSrv, self.transformAudioCallback)
+    # Create audio pipeline services
+    pipeline_service = rospy.Service( pipeline_topic, \
+        AudioProcessingPipelineSrv, self.pipelineCallback)
+    # Create noise profiles registry services
+    noise_profiles_service = rospy.Service( noise_profiles_topic, \
+        AudioProcessingNoiseProfilesSrv, self.noiseProfilesCallback)
+    # Create trim silence services
+    trim_silence_service = rospy.Service( trim_silence_topic, \
+        AudioProcessingTrimSilenceSrv, self.trimSilenceCallback)
+    # Create batch services
+    batch_denoise_service = rospy.Service( batch_denoise_topic, \
+        AudioProcessingBatchDenoiseSrv, self.batchDenoiseCallback)
+    batch_transform_audio_service = rospy.Service( \
+        batch_transform_audio_topic, AudioProcessingBatchTransformAudioSrv, \
+        self.batchTransformAudioCallback)
 
 
   ## Service callback for setting noise profile
@@ -164,6 +259,9 @@ class AudioProcessing:
     if ret == 'true':
         res.success = ret
         res.error = ''
+        # Cached outputs of the previous noise profile are not valid anymore
+        if self._audio_cache is not None:
+          self._audio_cache.invalidateUser(req.user)
     else:
         res.success = 'false'
         res.error = ret
@@ -176,12 +274,31 @@ class AudioProcessing:
   # @return res [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingDenoiseSrvResponse] The denoise response
   def denoiseCallback(self, req):
     res = AudioProcessingDenoiseSrvResponse()
-    res.success = self._sox_denoise_module.soxDenoise(\
-            req.user,\
-            req.audio_type,\
-            req.audio_file,\
-            req.denoised_audio_file,\
-            req.scale)
+    res.success = self._denoise(req.user, req.audio_type, req.audio_file, \
+        req.denoised_audio_file, req.scale)
+    return res
+
+  ## Service callback for denoising a batch of audio files
+  #
+  # The files are denoised concurrently by the batch worker pool
+  #
+  # @param req [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingBatchDenoiseSrv] The batch denoise request
+  #
+  # @return res [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingBatchDenoiseSrvResponse] The batch denoise response
+  def batchDenoiseCallback(self, req):
+    res = AudioProcessingBatchDenoiseSrvResponse()
+    if len(req.audio_files) != len(req.denoised_audio_files):
+      res.succeeded = 0
+      res.error = "The number of audio files and denoised audio files differ"
+      return res
+
+    res.statuses = self._batch_processing_module.process(\
+        lambda files: self._denoise(\
+            req.user, req.audio_type, files[0], files[1], req.scale),\
+        zip(req.audio_files, req.denoised_audio_files),\
+        lambda e: "Denoising error: " + str(e))
+    res.succeeded = len([s for s in res.statuses if s == "true"])
+    res.error = ''
     return res
 
   ## Service callback for Detecting silence
@@ -191,8 +308,15 @@ class AudioProcessing:
   # @return res [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingDetectSilenceSrvResponse] The detect silence response
   def detectSilenceCallback(self, req):
     res = AudioProcessingDetectSilenceSrvResponse()
-    [res.level, res.silence] = self._detect_silence_module.detectSilence(\
-            req.audio_file, req.threshold)
+    if req.streaming:
+      [res.level, res.silence, res.speech_start, res.speech_end] = \
+          self._detect_silence_module.detectSilenceStreaming(\
+              req.audio_file, req.threshold, req.early_exit)
+    else:
+      [res.level, res.silence] = self._detect_silence_module.detectSilence(\
+              req.audio_file, req.threshold)
+      res.speech_start = -1
+      res.speech_end = -1
     if res.silence == True:
         res.silence = "true"
     else:
@@ -206,9 +330,15 @@ class AudioProcessing:
   # @return res [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingDenoiseSrvResponse] The energy denoise response
   def energyDenoiseCallback(self, req):
     res = AudioProcessingDenoiseSrvResponse()
-    output = self._energy_denoise_module.energyDenoise(\
+    energy_denoise = lambda: self._energy_denoise_module.energyDenoise(\
           req.audio_file, req.scale, req.denoised_audio_file,\
           self._energy_denoising_debug)
+    if self._energy_denoising_debug:
+      output = energy_denoise()
+    else:
+      output = self._cachedCall('', req.audio_file, 'energy_denoise',\
+          [req.scale], None, req.denoised_audio_file, energy_denoise,\
+          lambda result: result == True)
     if output == True:
         res.success = "true"
     else:
@@ -230,6 +360,191 @@ class AudioProcessing:
 
       return res
 
+  ## Service callback for transforming a batch of audio files
+  #
+  # The files are transformed concurrently by the batch worker pool
+  #
+  # @param req [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingBatchTransformAudioSrv] The batch transform audio request
+  #
+  # @return res [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingBatchTransformAudioSrvResponse] The batch transform audio response
+  def batchTransformAudioCallback(self, req):
+      res = AudioProcessingBatchTransformAudioSrvResponse()
+      if len( req.source_names ) != len( req.target_names ):
+          res.succeeded = 0
+          res.error = "The number of source and target names differ"
+          return res
+
+      results = self._batch_processing_module.process( \
+          lambda names: self._transform_audio_module.transform_audio( \
+              req.source_type, names[0], req.target_type, names[1], \
+              req.target_channels, req.target_rate ), \
+          zip( req.source_names, req.target_names ), \
+          lambda e: [ "Transformation error: " + str( e ), '' ] )
+
+      res.errors = [ error for [ error, fullpath ] in results ]
+      res.fullpaths = [ fullpath for [ error, fullpath ] in results ]
+      res.succeeded = len( [ e for e in res.errors if e == 'success' ] )
+      res.error = ''
+      return res
+
+  ## Service callback for the single-pass audio preprocessing
+  #
+  # @param req [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingPipelineSrv] The pipeline request
+  #
+  # @return res [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingPipelineSrvResponse] The pipeline response
+  def pipelineCallback(self, req):
+    res = AudioProcessingPipelineSrvResponse()
+    profile = self._audio_pipeline_module.createProfile()
+    profile['sox_transform'] = req.sox_transform
+    profile['sox_channels_and_rate'] = req.sox_channels_and_rate
+    profile['sox_denoising'] = req.sox_denoising
+    profile['sox_denoising_scale'] = req.sox_denoising_scale
+    profile['detect_silence'] = req.detect_silence
+    profile['detect_silence_threshold'] = req.detect_silence_threshold
+    profile['trim_silence'] = req.trim_silence
+    profile['energy_denoising'] = req.energy_denoising
+    profile['energy_denoising_init_scale'] = req.energy_denoising_scale
+
+    # Only the sox denoising stage depends on the user's noise profile
+    user = ''
+    stage = 'pipeline'
+    version = None
+    noise_profile = None
+    if req.sox_denoising:
+      user = req.user
+      [backend, version, noise_profile] = \
+          self._denoiseDependency(req.user, req.audio_type)
+      stage = backend + '_pipeline'
+
+    [status, has_silence, res.level, res.removed_ms] = self._cachedCall(\
+        user, req.audio_file, stage,\
+        [user, req.audio_type, sorted(profile.items()), version],\
+        noise_profile,\
+        req.processed_audio_file,\
+        lambda: self._audio_pipeline_module.processAudio(\
+            req.user,\
+            req.audio_type,\
+            req.audio_file,\
+            req.processed_audio_file,\
+            profile),\
+        lambda result: result[0] == "true")
+    if status == "true":
+      res.success = "true"
+      res.error = ''
+    else:
+      res.success = "false"
+      res.error = status
+    if has_silence == True:
+      res.silence = "true"
+    else:
+      res.silence = "false"
+    return res
+
+  ## Service callback for trimming the silence of an audio file
+  #
+  # @param req [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingTrimSilenceSrv] The trim silence request
+  #
+  # @return res [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingTrimSilenceSrvResponse] The trim silence response
+  def trimSilenceCallback(self, req):
+    res = AudioProcessingTrimSilenceSrvResponse()
+    [status, res.removed_ms] = self._cachedCall('', req.audio_file,\
+        'trim_silence', [], None, req.trimmed_audio_file,\
+        lambda: self._trim_silence_module.trimSilence(\
+            req.audio_file, req.trimmed_audio_file),\
+        lambda result: result[0] == "true")
+    if status == "true":
+      res.success = "true"
+      res.error = ''
+    else:
+      res.success = "false"
+      res.error = status
+    return res
+
+  ## Service callback for listing or warming the loaded noise profiles
+  #
+  # @param req [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingNoiseProfilesSrv] The noise profiles request
+  #
+  # @return res [rapp_platform_ros_comminications::AudioProcessing::AudioProcessingNoiseProfilesSrvResponse] The noise profiles response
+  def noiseProfilesCallback(self, req):
+    res = AudioProcessingNoiseProfilesSrvResponse()
+    if req.warm:
+      self._noise_profile_registry.warm(list(req.users))
+    res.profiles = self._noise_profile_registry.listProfiles()
+    statistics = self._noise_profile_registry.getStatistics()
+    res.hits = statistics['hits']
+    res.misses = statistics['misses']
+    res.evictions = statistics['evictions']
+    res.error = ''
+    return res
+
+  ## Returns the denoising backend employed for a user and its dependency
+  #
+  # The native denoising depends on the in-memory noise spectrum version,
+  # whereas the sox denoising on the noise profile file.
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return backend       [string] The denoising backend ('native' or 'sox')
+  # @return version       [list] The noise spectrum version (None for sox)
+  # @return noise_profile [string] The noise profile path (None for native)
+  def _denoiseDependency(self, user, audio_type):
+    if self._audio_pipeline_module.usesNativeDenoise(user, audio_type):
+      return ['native', \
+          self._noise_profile_registry.getVersion(user, audio_type), None]
+    return ['sox', None, \
+        self._sox_denoise_module.noiseProfilePath(user, audio_type)]
+
+  ## Denoises an audio file employing the backend selected for the user
+  #
+  # @param user                [string] The system user, for environmental variable access
+  # @param audio_type          [string] Audio file's type
+  # @param audio_file          [string] Audio file path
+  # @param denoised_audio_file [string] Path to write denoised audio file
+  # @param scale               [float] Denoise scale
+  #
+  # @return status [string] "true" or the error description
+  def _denoise(self, user, audio_type, audio_file, denoised_audio_file, scale):
+    [backend, version, noise_profile] = \
+        self._denoiseDependency(user, audio_type)
+    if backend == 'native':
+      denoise = self._spectral_denoise_module.spectralDenoise
+    else:
+      denoise = self._sox_denoise_module.soxDenoise
+
+    return self._cachedCall(user, audio_file, backend + '_denoise',\
+        [user, audio_type, scale, version], noise_profile,\
+        denoised_audio_file,\
+        lambda: denoise(\
+            user,\
+            audio_type,\
+            audio_file,\
+            denoised_audio_file,\
+            scale),\
+        lambda result: result == "true")
+
+  ## Performs a processing stage employing the audio cache
+  #
+  # (see also rapp_audio_cache.AudioCache::cachedCall)
+  #
+  # @param user          [string] The user owning the cached output ('' if shared)
+  # @param audio_file    [string] The input audio file path
+  # @param stage         [string] The processing stage name
+  # @param params        [list] The stage parameters
+  # @param noise_profile [string] The noise profile path the stage depends on (or None)
+  # @param output_file   [string] The stage output file ('' if none)
+  # @param function      [function] Performs the stage, returning its result
+  # @param is_success    [function] Checks whether a stage result is successful
+  #
+  # @return result [object] The stage result
+  def _cachedCall(self, user, audio_file, stage, params, noise_profile, \
+      output_file, function, is_success):
+    if self._audio_cache is None:
+      return function()
+    key = self._audio_cache.createKey(audio_file, stage, params, noise_profile)
+    return self._audio_cache.cachedCall(user, key, output_file, function, \
+        is_success)
+
 # Main function
 if __name__ == "__main__":
   rospy.init_node('AudioProcessing')
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import threading
+from multiprocessing.pool import ThreadPool
+
+## @class BatchProcessing
+# Processes batches of audio files over a bounded worker pool
+#
+# The pool is shared by all the batch requests, thus the number of files
+# processed concurrently never exceeds the number of workers. The denoising
+# and transformation stages spend most of their time in SoX processes or
+# numpy routines, hence threads suffice. Each item's result is reported
+# separately, an item failing not affecting the rest.
+class BatchProcessing:
+
+  ## Constructor performing initializations
+  #
+  # @param workers [int] The number of workers
+  def __init__(self, workers = 4):
+    ## The number of workers
+    self._workers = max(1, workers)
+    ## The worker pool, created on the first batch
+    self._pool = None
+    ## Protects the pool creation, since services are threaded
+    self._lock = threading.Lock()
+
+  ## Processes a batch of items
+  #
+  # @param function [function] Processes an item, returning its result
+  # @param items    [list] The items
+  # @param on_error [function] Converts an item's exception to its result
+  #
+  # @return results [list] The items' results, in the items' order
+  def process(self, function, items, on_error):
+    if len(items) == 0:
+      return []
+    with self._lock:
+      if self._pool is None:
+        self._pool = ThreadPool(self._workers)
+
+    def processItem(item):
+      try:
+        return function(item)
+      except Exception as e:
+        return on_error(e)
+
+    return self._pool.map(processItem, items)
+
+  ## Returns the number of workers
+  #
+  # @return workers [int] The number of workers
+  def getWorkers(self):
+    return self._workers
@@ -21,13 +21,42 @@
 import sys
 import time
 import os
-from pylab import *
+import numpy
 from scipy.io import wavfile
 
+from rapp_signal_statistics import SignalStatistics
+
 ## @class DetectSilence
 # Performs silence detection on an audio file
+#
+# Apart from the global relative standard deviation of the signal power, a
+# streaming mode is provided, which reads the file in fixed windows through a
+# memory map, may stop as soon as speech is confidently present and locates
+# the speech segment boundaries. A window is considered as speech if its power
+# is speech_ratio times higher than the noise floor, i.e. a low percentile of
+# the window powers.
 class DetectSilence:
 
+  ## The streaming window duration in milliseconds
+  window_ms = 30
+  ## The number of windows processed at once
+  block_windows = 32
+  ## Power ratio over the noise floor for a window to be considered as speech
+  speech_ratio = 10.0
+  ## Consecutive speech windows under which speech is not confidently present
+  min_speech_windows = 8
+  ## The percentile of the window powers considered as the noise floor
+  noise_floor_percentile = 10
+  ## Windows kept before and after the speech segment
+  margin_windows = 2
+  ## Minimum noise floor, in order to tolerate digital silence
+  min_noise_floor = 1.0
+
+  ## Performs initializations
+  def __init__(self):
+    ## Instantiates rapp_signal_statistics.SignalStatistics
+    self._statistics = SignalStatistics()
+
   ## Detects silence
   #
   # Handles service callback
@@ -42,12 +71,18 @@ class DetectSilence:
     if not os.path.isfile(audio_file):
         return [-1, False]
     samp_freq, signal = wavfile.read(audio_file)
-    sq_signal = signal * 1.0
-    for i in range(0, len(sq_signal)):
-      sq_signal[i] *= sq_signal[i]
-    mean_sq = mean(sq_signal)
-    std_sq = std(sq_signal)
-    rsd_sq = std_sq / mean_sq
+    return self.detectSilenceSignal(signal, threshold)
+
+  ## Detects silence in an in-memory signal
+  #
+  # @param signal    [numpy.ndarray] The audio signal
+  # @param threshold [float] Silence threshold
+  #
+  # @return rsd_sq      [float] Noise relative standard deviation
+  # @return has_silence [bool] Indicates the existence of silence
+  def detectSilenceSignal(self, signal, threshold):
+    sq_signal = self._statistics.squareSignal(signal)
+    rsd_sq = self._statistics.relativeStandardDeviation(sq_signal)
     has_silence = False
     if rsd_sq > threshold:
         has_silence = False
@@ -55,3 +90,116 @@ class DetectSilence:
         has_silence = True
     return [rsd_sq, has_silence]
 
+  ## Detects silence in an audio file in streaming mode
+  #
+  # Handles service callback
+  # rapp_audio_processing.AudioProcessing#detectSilenceCallback
+  #
+  # @param audio_file [string] Audio file path
+  # @param threshold  [float] Silence threshold
+  # @param early_exit [bool] Stop reading once speech is confidently present
+  #
+  # @return rsd_sq       [float] Noise relative standard deviation
+  # @return has_silence  [bool] Indicates the existence of silence
+  # @return speech_start [float] The speech segment start in seconds (-1 if no speech)
+  # @return speech_end   [float] The speech segment end in seconds (-1 if unknown)
+  def detectSilenceStreaming(self, audio_file, threshold, early_exit):
+    if not os.path.isfile(audio_file):
+        return [-1, False, -1, -1]
+    try:
+      samp_freq, signal = wavfile.read(audio_file, mmap = True)
+    except Exception:
+      samp_freq, signal = wavfile.read(audio_file)
+    return self.detectSilenceWindows(signal, samp_freq, threshold, early_exit)
+
+  ## Detects silence in a signal by processing consecutive windows
+  #
+  # The signal is processed in blocks of windows, thus a memory mapped signal
+  # is read incrementally. If the whole signal is processed, the relative
+  # standard deviation equals the one of DetectSilence::detectSilenceSignal.
+  # On early exit the silence is decided by the speech presence and the
+  # speech end is unknown.
+  #
+  # @param signal     [numpy.ndarray] The audio signal (may be memory mapped)
+  # @param samp_freq  [int] The signal's sample rate
+  # @param threshold  [float] Silence threshold
+  # @param early_exit [bool] Stop processing once speech is confidently present
+  #
+  # @return rsd_sq       [float] Noise relative standard deviation
+  # @return has_silence  [bool] Indicates the existence of silence
+  # @return speech_start [float] The speech segment start in seconds (-1 if no speech)
+  # @return speech_end   [float] The speech segment end in seconds (-1 if unknown)
+  def detectSilenceWindows(self, signal, samp_freq, threshold, early_exit):
+    window = max(1, int(samp_freq * self.window_ms / 1000))
+    block = window * self.block_windows
+
+    sum_sq = 0.0
+    sum_sq2 = 0.0
+    count = 0
+    processed = 0
+    powers = numpy.zeros(0)
+    speech_run = 0
+    speech_present = False
+    for start in range(0, signal.shape[0], block):
+      sq_block = self._statistics.squareSignal(signal[start:start + block])
+      sum_sq += sq_block.sum()
+      sum_sq2 += numpy.square(sq_block).sum()
+      count += sq_block.size
+      processed += sq_block.shape[0]
+
+      block_powers = self._statistics.windowPowers(sq_block, window)
+      powers = numpy.append(powers, block_powers)
+      if not early_exit or speech_present:
+        continue
+      # The noise floor estimation gets more accurate as the blocks are read
+      speech = block_powers > self.speech_ratio * self._noiseFloor(powers)
+      for is_speech in speech:
+        speech_run = speech_run + 1 if is_speech else 0
+        if speech_run >= self.min_speech_windows:
+          speech_present = True
+      if speech_present:
+        break
+
+    if count == 0:
+      return [-1, False, -1, -1]
+    mean_sq = sum_sq / count
+    std_sq = numpy.sqrt(max(sum_sq2 / count - mean_sq * mean_sq, 0.0))
+    rsd_sq = std_sq / mean_sq if mean_sq > 0 else 0.0
+
+    [first, last] = self.speechWindows(powers)
+    if first == -1:
+      speech_start = -1
+      speech_end = -1
+    else:
+      speech_start = max(first - self.margin_windows, 0) * window * 1.0 / \
+          samp_freq
+      speech_end = min((last + 1 + self.margin_windows) * window, processed) * \
+          1.0 / samp_freq
+
+    if early_exit and speech_present:
+      return [rsd_sq, False, speech_start, -1]
+    return [rsd_sq, rsd_sq <= threshold, speech_start, speech_end]
+
+  ## Locates the first and last speech windows
+  #
+  # @param powers [numpy.ndarray] The mean power of each window
+  #
+  # @return first [int] The first speech window (-1 if no speech)
+  # @return last  [int] The last speech window (-1 if no speech)
+  def speechWindows(self, powers):
+    if powers.shape[0] == 0:
+      return [-1, -1]
+    speech = numpy.nonzero(\
+        powers > self.speech_ratio * self._noiseFloor(powers))[0]
+    if speech.shape[0] == 0:
+      return [-1, -1]
+    return [int(speech[0]), int(speech[-1])]
+
+  ## Estimates the noise floor of the window powers
+  #
+  # @param powers [numpy.ndarray] The mean power of each window
+  #
+  # @return noise_floor [float] The noise floor power
+  def _noiseFloor(self, powers):
+    return max(numpy.percentile(powers, self.noise_floor_percentile), \
+        self.min_noise_floor)
@@ -21,13 +21,20 @@
 import sys
 import time
 import os
-from pylab import *
+import numpy
 from scipy.io import wavfile
 
+from rapp_signal_statistics import SignalStatistics
+
 ## @class EnergyDenoise
 # Performs energy denoising on an audio file
 class EnergyDenoise:
 
+  ## Performs initializations
+  def __init__(self):
+    ## Instantiates rapp_signal_statistics.SignalStatistics
+    self._statistics = SignalStatistics()
+
   ## Performs energy-based denoising
   #
   # Handles service callback
@@ -40,35 +47,62 @@ class EnergyDenoise:
     if not os.path.isfile(audio_file):
         return False
     samp_freq, signal = wavfile.read(audio_file)
-    samples = signal.shape[0]
-    sq_signal = signal * 1.0
 
     if energy_denoising_debug:
-      timearray = arange(0, samples*1.0, 1)
-      timearray /= samp_freq
-      timearray *= 1000.0
-      subplot(3,1,1)
-      plot(timearray, signal, color = 'k')
+      original_signal = signal.copy()
 
-    for i in range(0, len(sq_signal)):
-      sq_signal[i] *= sq_signal[i]
-    mean_sq = mean(sq_signal)
-
-    for i in range(0, len(sq_signal)):
-      if sq_signal[i] < scale * mean_sq:
-        signal[i] = 0
-
-    if energy_denoising_debug:
-      timearray = arange(0, samples*1.0, 1)
-      timearray /= samp_freq
-      timearray *= 1000.0
-      subplot(3,1,2)
-      plot(timearray, signal, color = 'k')
+    signal = self.energyDenoiseSignal(signal, scale)
 
     if energy_denoising_debug:
-      show()
+      self._plotSignals([original_signal, signal], samp_freq, \
+          denoised_audio_file + ".png")
 
     wavfile.write(denoised_audio_file, samp_freq, signal)
 
     return True
 
+  ## Performs energy-based denoising on an in-memory signal
+  #
+  # The samples whose power is lower than scale times the mean signal power
+  # are zeroed in place (the signal is copied if it is read-only).
+  #
+  # @param signal [numpy.ndarray] The audio signal
+  # @param scale  [float] Energy denoise scale
+  #
+  # @return signal [numpy.ndarray] The denoised signal
+  def energyDenoiseSignal(self, signal, scale):
+    if not signal.flags.writeable:
+      signal = signal.copy()
+    sq_signal = self._statistics.squareSignal(signal)
+    signal[self._statistics.thresholdMask(sq_signal, scale)] = 0
+    return signal
+
+  ## Plots the original and the denoised signals (debug mode only)
+  #
+  # matplotlib is imported lazily, in order not to burden the node's startup
+  # time and memory. If no display is available the Agg backend is employed
+  # and the figure is saved instead of shown.
+  #
+  # @param signals   [list::numpy.ndarray] The signals to be plotted
+  # @param samp_freq [int] The signals' sample rate
+  # @param plot_file [string] The figure path, if no display is available
+  def _plotSignals(self, signals, samp_freq, plot_file):
+    import matplotlib
+    headless = not os.environ.get('DISPLAY')
+    if headless:
+      matplotlib.use('Agg')
+    import matplotlib.pyplot as pyplot
+
+    pyplot.figure()
+    for i in range(0, len(signals)):
+      timearray = numpy.arange(0, signals[i].shape[0] * 1.0, 1)
+      timearray /= samp_freq
+      timearray *= 1000.0
+      pyplot.subplot(3, 1, i + 1)
+      pyplot.plot(timearray, signals[i], color = 'k')
+
+    if headless:
+      pyplot.savefig(plot_file)
+      pyplot.close()
+    else:
+      pyplot.show()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import os
+import threading
+import numpy
+from collections import OrderedDict
+
+## @class NoiseProfileRegistry
+# Keeps the users' noise spectra in memory
+#
+# The noise spectra are stored as float32 arrays, loaded either at startup
+# (preload) or lazily on the first request. The least recently used ones are
+# evicted if the maximum number of profiles is exceeded. Spectra are
+# refreshed when written via rapp_set_noise_profile.SetNoiseProfile, thus
+# denoise requests for loaded profiles do not access the filesystem.
+# Non-existent profiles are remembered as well, until a profile is set.
+class NoiseProfileRegistry:
+
+  ## The prefix of the noise spectra files
+  spectrum_prefix = "noise_spectrum_"
+  ## The extension of the noise spectra files
+  spectrum_extension = ".npy"
+
+  ## Constructor performing initializations
+  #
+  # @param directory    [string] The audio processing files directory
+  # @param max_profiles [int] The maximum number of loaded profiles (0 for unlimited)
+  def __init__(self, \
+      directory = "~/rapp_platform_files/audio_processing/", max_profiles = 0):
+    ## The audio processing files directory
+    self._directory = os.path.expanduser(directory)
+    ## The maximum number of loaded profiles (0 for unlimited)
+    self._max_profiles = max_profiles
+    ## The loaded profiles: (user, audio_type) -> [version, spectrum or None]
+    self._profiles = OrderedDict()
+    ## Incremented on every profile write, in order to version the profiles
+    self._writes = 0
+
+    ## Registry hits counter
+    self._hits = 0
+    ## Registry misses counter (filesystem accesses)
+    self._misses = 0
+    ## Evictions counter
+    self._evictions = 0
+    ## Protects the registry structures, since services are threaded
+    self._lock = threading.Lock()
+
+  ## Returns a user's noise spectrum, loading it if needed
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return noise_spectrum [numpy.ndarray] The noise spectrum or None if it does not exist
+  def getNoiseSpectrum(self, user, audio_type):
+    return self._getProfile(user, audio_type)[1]
+
+  ## Returns the version of a user's noise spectrum
+  #
+  # The version changes whenever the profile is written or reloaded, thus it
+  # can be part of cache keys.
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return version [list] The profile version, None if it does not exist
+  def getVersion(self, user, audio_type):
+    [version, noise_spectrum] = self._getProfile(user, audio_type)
+    if noise_spectrum is None:
+      return None
+    return version
+
+  ## Checks if a noise spectrum exists for a user and audio type
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return exists [bool] True if the noise spectrum exists
+  def hasNoiseSpectrum(self, user, audio_type):
+    return self.getNoiseSpectrum(user, audio_type) is not None
+
+  ## Stores a user's noise spectrum on disk and in memory
+  #
+  # @param user           [string] The system user, for environmental variable access
+  # @param audio_type     [string] Audio file's type
+  # @param noise_spectrum [numpy.ndarray] The noise spectrum
+  def setNoiseSpectrum(self, user, audio_type, noise_spectrum):
+    noise_spectrum = numpy.asarray(noise_spectrum, dtype = numpy.float32)
+    with open(self.noiseSpectrumPath(user, audio_type), 'wb') as f:
+      numpy.save(f, noise_spectrum)
+    with self._lock:
+      self._writes += 1
+      self._store((user, audio_type), \
+          [self._loadVersion(user, audio_type), noise_spectrum])
+
+  ## Loads the noise spectra of users
+  #
+  # @param users [list::string] The users (all the users if empty)
+  #
+  # @return loaded [int] The number of loaded noise spectra
+  def warm(self, users = []):
+    if len(users) == 0 and os.path.isdir(self._directory):
+      users = sorted(os.listdir(self._directory))
+    loaded = 0
+    for user in users:
+      profile_directory = os.path.join(self._directory, user, "noise_profile")
+      if not os.path.isdir(profile_directory):
+        continue
+      for f in sorted(os.listdir(profile_directory)):
+        if not f.startswith(self.spectrum_prefix) or \
+            not f.endswith(self.spectrum_extension):
+          continue
+        audio_type = f[len(self.spectrum_prefix):-len(self.spectrum_extension)]
+        with self._lock:
+          self._profiles.pop((user, audio_type), None)
+        if self._getProfile(user, audio_type)[1] is not None:
+          loaded += 1
+    return loaded
+
+  ## Lists the loaded noise spectra
+  #
+  # @return profiles [list::string] The loaded profiles as user/audio_type
+  def listProfiles(self):
+    with self._lock:
+      return [user + "/" + audio_type \
+          for (user, audio_type) in self._profiles \
+          if self._profiles[(user, audio_type)][1] is not None]
+
+  ## Returns the registry statistics
+  #
+  # @return statistics [dictionary] Hits, misses, evictions and loaded profiles
+  def getStatistics(self):
+    with self._lock:
+      return {
+          'hits': self._hits,
+          'misses': self._misses,
+          'evictions': self._evictions,
+          'profiles': len([k for k in self._profiles \
+              if self._profiles[k][1] is not None])
+          }
+
+  ## Returns the path of a user's noise spectrum
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return noise_spectrum [string] The noise spectrum path
+  def noiseSpectrumPath(self, user, audio_type):
+    return os.path.join(self._directory, user, "noise_profile", \
+        self.spectrum_prefix + audio_type + self.spectrum_extension)
+
+  ## Returns a loaded profile, loading it from disk if needed
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return profile [list] The [version, noise spectrum or None]
+  def _getProfile(self, user, audio_type):
+    key = (user, audio_type)
+    with self._lock:
+      if key in self._profiles:
+        self._profiles[key] = self._profiles.pop(key)
+        self._hits += 1
+        return self._profiles[key]
+      self._misses += 1
+
+    noise_spectrum = None
+    try:
+      noise_spectrum = numpy.load(self.noiseSpectrumPath(user, audio_type))\
+          .astype(numpy.float32)
+    except Exception:
+      pass
+    profile = [self._loadVersion(user, audio_type), noise_spectrum]
+
+    with self._lock:
+      # A concurrent write takes precedence over the loaded profile
+      if key not in self._profiles:
+        self._store(key, profile)
+      return self._profiles[key]
+
+  ## Stores a profile, evicting the least recently used ones
+  #
+  # @param key     [tuple] The (user, audio_type) key
+  # @param profile [list] The [version, noise spectrum or None]
+  def _store(self, key, profile):
+    self._profiles.pop(key, None)
+    self._profiles[key] = profile
+    while self._max_profiles > 0 and \
+        len(self._profiles) > self._max_profiles:
+      self._profiles.popitem(last = False)
+      self._evictions += 1
+
+  ## Creates the version of a profile being loaded or written
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return version [list] The profile version
+  def _loadVersion(self, user, audio_type):
+    path = self.noiseSpectrumPath(user, audio_type)
+    try:
+      mtime = os.path.getmtime(path)
+    except OSError:
+      mtime = 0
+    return [mtime, self._writes]
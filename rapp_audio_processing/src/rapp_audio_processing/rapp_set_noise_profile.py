@@ -25,14 +25,18 @@ import os
 from scipy.io import wavfile
 
 from rapp_utilities import Utilities
+from rapp_spectral_denoise import SpectralDenoise
 
 ## @class SetNoiseProfile
 # Evaluates the noise profile for an audio file
 class SetNoiseProfile:
 
   ## Performs initializations
-  def __init__(self):
+  #
+  # @param noise_profile_registry [NoiseProfileRegistry] The shared noise spectra registry (optional)
+  def __init__(self, noise_profile_registry = None):
     self.utilities = Utilities()
+    self.spectral_denoise = SpectralDenoise(noise_profile_registry)
 
   ## Evaluates the audio profile
   #
@@ -116,6 +120,17 @@ class SetNoiseProfile:
     if com_res != 0:
       return "Error: Server chmod malfunctioned"
 
+    # Extract the noise spectrum for the native denoising (same trim as sox)
+    # and refresh the in-memory one
+    try:
+      samp_freq, signal = wavfile.read(new_audio)
+      noise_spectrum = self.spectral_denoise.computeNoiseSpectrum(\
+          signal[int(0.5 * samp_freq):int(3.0 * samp_freq)])
+      self.spectral_denoise.getRegistry().setNoiseSpectrum(\
+          user, audio_file_type, noise_spectrum)
+    except Exception:
+      return "Error: Noise spectrum extraction malfunctioned"
+
     status = self.utilities.cleanup(cleanup)
     if status != True:
       return status
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import numpy
+
+## @class SignalStatistics
+# Provides vectorized power statistics of audio signals
+#
+# Shared by rapp_detect_silence.DetectSilence and
+# rapp_energy_denoise.EnergyDenoise. All computations are performed on whole
+# NumPy buffers, thus no per-sample Python iteration takes place.
+class SignalStatistics:
+
+  ## Computes the power (square) of each signal sample
+  #
+  # The signal is copied once to a float64 buffer, which is then squared in
+  # place.
+  #
+  # @param signal [numpy.ndarray] The audio signal
+  #
+  # @return sq_signal [numpy.ndarray] The squared signal (float64)
+  def squareSignal(self, signal):
+    sq_signal = numpy.array(signal, dtype = numpy.float64)
+    numpy.square(sq_signal, out = sq_signal)
+    return sq_signal
+
+  ## Computes the mean and the standard deviation of the signal power
+  #
+  # @param sq_signal [numpy.ndarray] The squared signal
+  #
+  # @return mean_sq [float] The mean signal power
+  # @return std_sq  [float] The standard deviation of the signal power
+  def powerStatistics(self, sq_signal):
+    mean_sq = sq_signal.mean()
+    std_sq = sq_signal.std()
+    return [mean_sq, std_sq]
+
+  ## Computes the relative standard deviation (RSD) of the signal power
+  #
+  # @param sq_signal [numpy.ndarray] The squared signal
+  #
+  # @return rsd_sq [float] The relative standard deviation of the signal power
+  def relativeStandardDeviation(self, sq_signal):
+    [mean_sq, std_sq] = self.powerStatistics(sq_signal)
+    return std_sq / mean_sq
+
+  ## Computes the mask of the samples whose power is lower than a threshold
+  #
+  # The threshold is defined as scale * mean_sq. If the mean power is not
+  # provided it is computed from the squared signal.
+  #
+  # @param sq_signal [numpy.ndarray] The squared signal
+  # @param scale     [float] The threshold scale with regard to the mean power
+  # @param mean_sq   [float] The mean signal power (optional)
+  #
+  # @return mask [numpy.ndarray] Boolean mask, True for samples under the threshold
+  def thresholdMask(self, sq_signal, scale, mean_sq = None):
+    if mean_sq is None:
+      mean_sq = sq_signal.mean()
+    mask = numpy.empty(sq_signal.shape, dtype = numpy.bool_)
+    numpy.less(sq_signal, scale * mean_sq, out = mask)
+    return mask
+
+  ## Computes the mean power of consecutive fixed-size windows
+  #
+  # The last window may be shorter. For multichannel signals the power is
+  # averaged over the channels.
+  #
+  # @param sq_signal   [numpy.ndarray] The squared signal
+  # @param window_size [int] The window size in samples
+  #
+  # @return powers [numpy.ndarray] The mean power of each window
+  def windowPowers(self, sq_signal, window_size):
+    if len(sq_signal.shape) != 1:
+      sq_signal = sq_signal.mean(axis = 1)
+    full = sq_signal.shape[0] // window_size
+    powers = sq_signal[:full * window_size].reshape(full, window_size)\
+        .mean(axis = 1)
+    if sq_signal.shape[0] > full * window_size:
+      powers = numpy.append(powers, sq_signal[full * window_size:].mean())
+    return powers
@@ -21,7 +21,8 @@
 import sys
 import time
 import os
-from pylab import *
+import subprocess
+import numpy
 from scipy.io import wavfile
 
 ## @class SoxDenoise
@@ -52,8 +53,7 @@ class SoxDenoise :
         return "The file for denoising has not 1 channel"
 
 
-    directory = os.path.expanduser("~/rapp_platform_files/audio_processing/") + user
-    noise_profile = directory + "/noise_profile/noise_profile_" + audio_type
+    noise_profile = self.noiseProfilePath(user, audio_type)
 
     if not os.path.isfile(noise_profile):
         return "No noise profile for the " + audio_type + " type exists"
@@ -67,3 +67,57 @@ class SoxDenoise :
     else:
         return "true"
 
+  ## Performs denoising of an in-memory signal employing Sox application
+  #
+  # The signal is piped to the sox noisered effect as raw 16 bit little-endian
+  # PCM and the denoised samples are read back from its output, thus no
+  # intermediate files are created.
+  # (see also rapp_audio_pipeline.AudioPipeline)
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  # @param signal     [numpy.ndarray] The mono 16 bit audio signal
+  # @param samp_freq  [int] The signal's sample rate
+  # @param scale      [float] Energy denoise scale
+  #
+  # @return status [string] "true" or the error description
+  # @return signal [numpy.ndarray] The denoised signal
+  def soxDenoiseSignal(self, user, audio_type, signal, samp_freq, scale):
+    if scale < 0 or scale > 1:
+        return ["Invalid scale. Scale must be between [0,1]", signal]
+
+    if len(signal.shape) != 1:
+        return ["The file for denoising has not 1 channel", signal]
+    if signal.dtype != numpy.int16:
+        return ["The file for denoising is not 16 bit", signal]
+
+    noise_profile = self.noiseProfilePath(user, audio_type)
+
+    if not os.path.isfile(noise_profile):
+        return ["No noise profile for the " + audio_type + " type exists", \
+            signal]
+
+    raw_format = ["-t", "raw", "-e", "signed-integer", "-b", "16", "-L", \
+        "-c", "1", "-r", str(samp_freq)]
+    command = ["sox"] + raw_format + ["-"] + raw_format + ["-", \
+        "noisered", noise_profile, str(scale)]
+    try:
+      proc = subprocess.Popen(command, stdin = subprocess.PIPE, \
+          stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+      (out, err) = proc.communicate(signal.astype('<i2').tostring())
+    except OSError:
+      return ["System sox malfunctioned", signal]
+
+    if proc.returncode != 0:
+        return ["System sox malfunctioned", signal]
+    return ["true", numpy.fromstring(out, dtype = '<i2').astype(numpy.int16)]
+
+  ## Returns the path of a user's noise profile
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return noise_profile [string] The noise profile path
+  def noiseProfilePath(self, user, audio_type):
+    directory = os.path.expanduser("~/rapp_platform_files/audio_processing/") + user
+    return directory + "/noise_profile/noise_profile_" + audio_type
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import os
+import numpy
+from numpy.lib.stride_tricks import as_strided
+from scipy.io import wavfile
+
+from rapp_noise_profile_registry import NoiseProfileRegistry
+
+## @class SpectralDenoise
+# Performs STFT spectral subtraction denoising in-process
+#
+# Follows the approach of the sox noisered effect (2048 samples Hann
+# windows), employing a noise power spectrum that is computed once per
+# user and audio type by rapp_set_noise_profile.SetNoiseProfile and kept in
+# memory by rapp_noise_profile_registry.NoiseProfileRegistry. The scale keeps the sox semantics: 0 leaves the signal intact,
+# whereas 1 fully removes the frequency bins dominated by noise.
+class SpectralDenoise:
+
+  ## The STFT window size (same as sox noisered)
+  window_size = 2048
+  ## The STFT hop size
+  hop_size = 512
+  ## Noise power multiplier under which a bin is considered as noise
+  sensitivity = 2.0
+
+  ## Constructor performing initializations
+  #
+  # @param noise_profile_registry [NoiseProfileRegistry] The shared noise spectra registry (optional)
+  def __init__(self, noise_profile_registry = None):
+    ## The analysis/synthesis window
+    self._window = numpy.hanning(self.window_size).astype(numpy.float32)
+    ## The noise spectra registry
+    self._registry = noise_profile_registry
+    if self._registry is None:
+      self._registry = NoiseProfileRegistry()
+
+  ## Performs spectral subtraction denoising on an audio file
+  #
+  # Handles service callback
+  # rapp_audio_processing.AudioProcessing#denoiseCallback
+  #
+  # @param user                [string] The system user, for environmental variable access
+  # @param audio_type          [string] Audio file's type
+  # @param audio_file          [string] Audio file path
+  # @param denoised_audio_file [string] Path to write denoised audio file
+  # @param scale               [float] Denoise scale
+  #
+  # @return status [string] "true" or the error description
+  def spectralDenoise(self, user, audio_type, audio_file, denoised_audio_file,\
+      scale):
+    if not os.path.isfile(audio_file):
+        return "The audio file does not exist"
+    if ".wav" not in audio_file:
+        return "The file for denoising is not wav"
+    samp_freq, signal = wavfile.read(audio_file)
+
+    [status, signal] = self.spectralDenoiseSignal(\
+        user, audio_type, signal, samp_freq, scale)
+    if status != "true":
+      return status
+    wavfile.write(denoised_audio_file, samp_freq, signal)
+    return "true"
+
+  ## Performs spectral subtraction denoising on an in-memory signal
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  # @param signal     [numpy.ndarray] The mono audio signal
+  # @param samp_freq  [int] The signal's sample rate
+  # @param scale      [float] Denoise scale
+  #
+  # @return status [string] "true" or the error description
+  # @return signal [numpy.ndarray] The denoised signal (same dtype)
+  def spectralDenoiseSignal(self, user, audio_type, signal, samp_freq, scale):
+    if scale < 0 or scale > 1:
+        return ["Invalid scale. Scale must be between [0,1]", signal]
+    if len(signal.shape) != 1:
+        return ["The file for denoising has not 1 channel", signal]
+
+    noise_spectrum = self.getNoiseSpectrum(user, audio_type)
+    if noise_spectrum is None:
+        return ["No noise spectrum for the " + audio_type + " type exists", \
+            signal]
+
+    return ["true", self.subtractNoise(signal, noise_spectrum, scale)]
+
+  ## Subtracts a noise power spectrum from a signal
+  #
+  # Each bin's power is reduced by the scaled noise power, whereas the gain
+  # is bounded by (1 - scale), i.e. the sox noisered maximum attenuation. The
+  # gains are smoothed over neighbouring frames to reduce musical noise.
+  #
+  # @param signal         [numpy.ndarray] The mono audio signal
+  # @param noise_spectrum [numpy.ndarray] The noise power spectrum
+  # @param scale          [float] Denoise scale
+  #
+  # @return signal [numpy.ndarray] The denoised signal (same dtype)
+  def subtractNoise(self, signal, noise_spectrum, scale):
+    dtype = signal.dtype
+    samples = signal.shape[0]
+    if samples == 0 or scale == 0:
+      return signal.copy()
+
+    spectrum = self._stft(signal)
+    power = numpy.square(numpy.abs(spectrum))
+
+    # Power spectral subtraction gain, floored at the maximum attenuation
+    gain = 1.0 - scale * self.sensitivity * noise_spectrum / \
+        numpy.maximum(power, 1e-10)
+    numpy.maximum(gain, (1.0 - scale) ** 2, out = gain)
+    numpy.sqrt(gain, out = gain)
+
+    # Temporal smoothing of the gains
+    padded = numpy.concatenate((gain[:1], gain, gain[-1:]))
+    gain = 0.25 * padded[:-2] + 0.5 * padded[1:-1] + 0.25 * padded[2:]
+
+    denoised = self._istft(spectrum * gain, samples)
+
+    if numpy.issubdtype(dtype, numpy.integer):
+      limits = numpy.iinfo(dtype)
+      denoised = numpy.clip(numpy.round(denoised), limits.min, limits.max)
+    return denoised.astype(dtype)
+
+  ## Computes the noise power spectrum of a noise signal
+  #
+  # @param signal [numpy.ndarray] The noise signal (multiple channels are averaged)
+  #
+  # @return noise_spectrum [numpy.ndarray] The mean power per frequency bin (float32)
+  def computeNoiseSpectrum(self, signal):
+    if len(signal.shape) != 1:
+      signal = signal.mean(axis = 1)
+    power = numpy.square(numpy.abs(self._stft(signal, pad = False)))
+    return power.mean(axis = 0).astype(numpy.float32)
+
+  ## Returns a user's noise spectrum
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return noise_spectrum [numpy.ndarray] The noise spectrum or None if it does not exist
+  def getNoiseSpectrum(self, user, audio_type):
+    return self._registry.getNoiseSpectrum(user, audio_type)
+
+  ## Checks if a noise spectrum exists for a user and audio type
+  #
+  # @param user       [string] The system user, for environmental variable access
+  # @param audio_type [string] Audio file's type
+  #
+  # @return exists [bool] True if the noise spectrum exists
+  def hasNoiseSpectrum(self, user, audio_type):
+    return self._registry.hasNoiseSpectrum(user, audio_type)
+
+  ## Returns the noise spectra registry
+  #
+  # @return registry [NoiseProfileRegistry] The noise spectra registry
+  def getRegistry(self):
+    return self._registry
+
+  ## Computes the short-time Fourier transform of a signal
+  #
+  # If requested, the signal is padded by a window at both ends, so that
+  # every sample is covered by the same number of frames.
+  #
+  # @param signal [numpy.ndarray] The mono signal
+  # @param pad    [bool] Pads the signal for reconstruction
+  #
+  # @return spectrum [numpy.ndarray] The spectrum (frames x bins)
+  def _stft(self, signal, pad = True):
+    if pad:
+      padded = self._pad(signal)
+    else:
+      padded = numpy.zeros(max(signal.shape[0], self.window_size), \
+          dtype = numpy.float32)
+      padded[:signal.shape[0]] = signal
+    frames = (padded.shape[0] - self.window_size) // self.hop_size + 1
+    stride = padded.strides[0]
+    framed = as_strided(padded, shape = (frames, self.window_size), \
+        strides = (stride * self.hop_size, stride))
+    return numpy.fft.rfft(framed * self._window, axis = 1)
+
+  ## Computes the inverse short-time Fourier transform (weighted overlap-add)
+  #
+  # @param spectrum [numpy.ndarray] The spectrum (frames x bins)
+  # @param samples  [int] The original signal length
+  #
+  # @return signal [numpy.ndarray] The reconstructed signal (float32)
+  def _istft(self, spectrum, samples):
+    frames = numpy.fft.irfft(spectrum, n = self.window_size, axis = 1) * \
+        self._window
+    length = (frames.shape[0] - 1) * self.hop_size + self.window_size
+    signal = numpy.zeros(length, dtype = numpy.float64)
+    weights = numpy.zeros(length, dtype = numpy.float64)
+    sq_window = numpy.square(self._window)
+    for i in range(frames.shape[0]):
+      start = i * self.hop_size
+      signal[start:start + self.window_size] += frames[i]
+      weights[start:start + self.window_size] += sq_window
+    signal /= numpy.maximum(weights, 1e-10)
+    return signal[self.window_size:self.window_size + samples]
+
+  ## Pads a signal by a window at the start and up to a whole hop at the end
+  #
+  # @param signal [numpy.ndarray] The mono signal
+  #
+  # @return padded [numpy.ndarray] The padded signal (float32, contiguous)
+  def _pad(self, signal):
+    samples = signal.shape[0]
+    tail = self.window_size + (-samples) % self.hop_size
+    padded = numpy.zeros(self.window_size + samples + tail, \
+        dtype = numpy.float32)
+    padded[self.window_size:self.window_size + samples] = signal
+    return padded
@@ -19,8 +19,12 @@
 # contact: aris.thallas@{iti.gr, gmail.com}
 
 import os
+import time
+import threading
 from scipy.io import wavfile
 
+from rapp_audio_backends import SoxAudioBackend, NumpyAudioBackend
+
 ## @class TransformAudio
 # @brief Provides audio type tranformation functionalities
 #
@@ -29,8 +33,27 @@ from scipy.io import wavfile
 # rate, the audio channel number, the audio format and the audio name.
 # Handles transform audio service callback
 # (rapp_audio_processing.rapp_audio_processing.AudioProcessing::transform_audio)
+#
+# The transformation is delegated to an audio backend
+# (see rapp_audio_backends). The in-process backend is preferred and SoX is
+# employed for the transformations it does not support (e.g. nao_ogg sources).
 class TransformAudio:
 
+    ## @brief Performs initializations
+    # @param backend [string] 'auto' for in-process transformation with SoX
+    # fallback, or 'sox' to always employ SoX
+    def __init__(self, backend = 'auto'):
+        ## The audio backends, in order of preference
+        self._backends = []
+        if backend != 'sox':
+            self._backends.append( NumpyAudioBackend() )
+        self._backends.append( SoxAudioBackend() )
+
+        ## Per backend latency statistics
+        self._latencies = {}
+        ## Lock protecting the latency statistics
+        self._latency_lock = threading.Lock()
+
     ## @brief Performs the audio transformation
     # @param source_type [string] The source audio file's type
     # @param source_name [string] The source audio file's name
@@ -51,13 +74,13 @@ class TransformAudio:
             return [ str(e), '' ]
 
         try:
-            self._validateSourceType( source_type, source_name )
+            source_audio = self._validateSourceType( source_type, source_name )
         except Exception as e:
             return [ str(e), '' ]
 
         try:
-            self._convertType( source_type, source_name, target_type, \
-                    target_name, target_channels, target_rate )
+            self._convertType( source_type, source_name, source_audio, \
+                    target_type, target_name, target_channels, target_rate )
         except Exception as e:
             return [ str(e), '' ]
 
@@ -89,52 +112,76 @@ class TransformAudio:
             raise Exception( "Error: target_channels can not be greater than 8" )
 
     ## @brief Performs audio conversion
+    #
+    # Selects the first backend supporting the transformation and keeps its
+    # latency.
+    #
     # @param source_type [string] The source audio file's type
     # @param source_name [string] The source audio file's name
+    # @param source_audio [list] The decoded [rate, signal] of wav sources or None
     # @param target_type [string] The target audio file's type
     # @param target_name [string] The target audio file's name
     # @param target_channels [string] The target audio's channel number
     # @param target_rate [string] The target audio's sample rate
     #
     # @exception Exception Conversion malfunction
-    def _convertType(self, source_type, source_name, target_type, target_name, \
-            target_channels, target_rate ):
-
-        channels = ''
-        rate = ''
-        if target_type == 'flac':
-            if target_channels != 0:
-                channels = '--channels=' + str( target_channels )
-            if target_rate != 0:
-                rate = '--sample-rate=' + str( target_rate )
-
-            command = 'flac -f ' + channels + ' ' + rate + " " + source_name + \
-                ' -o ' + target_name + " --totally-silent --channel-map=none"
-            flac_status = os.system( command )
-
-
-            if os.path.isfile( target_name ) != True or flac_status != 0 :
-                raise Exception( "Error: flac command malfunctioned. File path was"\
-                        + source_name )
-        else:
-            if target_channels != 0:
-                channels = '-c ' + str( target_channels )
-            if target_rate != 0:
-                rate = '-r ' + str( target_rate )
-            command = "sox " + source_name + " " + channels + " " + rate + \
-                    " " + target_name
-
-            sox_status = os.system( command )
+    def _convertType(self, source_type, source_name, source_audio, \
+            target_type, target_name, target_channels, target_rate ):
 
-            if os.path.isfile( target_name ) != True or sox_status:
-                raise Exception( "Error: SoX malfunctioned. File path was" + \
-                        source_name )
+        source_channels = 0
+        if source_audio is not None:
+            signal = source_audio[1]
+            source_channels = 1 if len( signal.shape ) == 1 else signal.shape[1]
+
+        for backend in self._backends:
+            if not backend.supports( source_type, source_channels, \
+                    target_type, target_channels ):
+                continue
+            start = time.time()
+            backend.convert( source_name, source_audio, target_type, \
+                    target_name, target_channels, target_rate )
+            self._recordLatency( backend.name, time.time() - start )
+            return
+
+        raise Exception( "Error: No audio backend supports the transformation" )
+
+    ## @brief Keeps the latency of a conversion
+    # @param backend_name [string] The backend that performed the conversion
+    # @param latency [float] The conversion duration in seconds
+    def _recordLatency(self, backend_name, latency):
+        with self._latency_lock:
+            if backend_name not in self._latencies:
+                self._latencies[ backend_name ] = \
+                    { 'calls': 0, 'total': 0.0, 'min': latency, 'max': latency }
+            stats = self._latencies[ backend_name ]
+            stats['calls'] += 1
+            stats['total'] += latency
+            stats['min'] = min( stats['min'], latency )
+            stats['max'] = max( stats['max'], latency )
+
+    ## @brief Returns the per-backend conversion latencies
+    #
+    # @return report [dictionary] backend name -> { calls, mean_ms, min_ms, max_ms }
+    def getLatencyReport(self):
+        report = {}
+        with self._latency_lock:
+            for name in self._latencies:
+                stats = self._latencies[ name ]
+                report[ name ] = { \
+                    'calls': stats['calls'], \
+                    'mean_ms': stats['total'] * 1000.0 / stats['calls'], \
+                    'min_ms': stats['min'] * 1000.0, \
+                    'max_ms': stats['max'] * 1000.0 \
+                    }
+        return report
 
 
     ## @brief Validates that the provided audio type match the file extension
     # @param source_type [string] The source audio file's type
     # @param name [string] The source audio file's name
     #
+    # @return source_audio [list] The decoded [rate, signal] for wav sources, None otherwise
+    #
     # @exception Exception Audio type/file type mismatch
     def _validateSourceType( self, source_type, name ):
 
@@ -153,6 +200,7 @@ class TransformAudio:
                 error = ("Error: wav 1 ch declared but the audio file has " +\
                 str(signal.shape[1]) + ' channels')
                 raise Exception( error )
+            return [ samp_freq, signal ]
 
         elif source_type == "nao_wav_4_ch":
             if source_extention != ".wav":
@@ -161,6 +209,9 @@ class TransformAudio:
             samp_freq, signal = wavfile.read( name )
             if len(signal.shape) != 2 or signal.shape[1] != 4:
                 raise Exception( "Error: wav 4 ch declared but the audio file has not 4 channels" )
+            return [ samp_freq, signal ]
 
         else:
             raise Exception( "Non valid noise audio type" )
+
+        return None
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import os
+from scipy.io import wavfile
+
+from rapp_detect_silence import DetectSilence
+
+## @class TrimSilence
+# Trims the leading and trailing non-speech regions of an audio file
+#
+# The speech segment is located by the windowed energy of
+# rapp_detect_silence.DetectSilence::detectSilenceWindows. Since the Sphinx4
+# decoding time scales with the audio length, trimming the silence reduces
+# the recognition latency.
+class TrimSilence:
+
+  ## Performs initializations
+  def __init__(self):
+    ## Instantiates rapp_detect_silence.DetectSilence
+    self._detect_silence_module = DetectSilence()
+
+  ## Trims the silence of an audio file
+  #
+  # Handles service callback
+  # rapp_audio_processing.AudioProcessing#trimSilenceCallback
+  #
+  # @param audio_file         [string] Audio file path
+  # @param trimmed_audio_file [string] Path to write the trimmed audio file
+  #
+  # @return status     [string] "true" or the error description
+  # @return removed_ms [float] The removed audio duration in milliseconds
+  def trimSilence(self, audio_file, trimmed_audio_file):
+    if not os.path.isfile(audio_file):
+        return ["The audio file does not exist", 0]
+    samp_freq, signal = wavfile.read(audio_file)
+
+    [start, end] = self.speechBoundaries(signal, samp_freq)
+    wavfile.write(trimmed_audio_file, samp_freq, signal[start:end])
+    return ["true", self.removedMilliseconds(signal, samp_freq, start, end)]
+
+  ## Locates the speech segment of a signal
+  #
+  # If no speech is detected the whole signal is kept.
+  #
+  # @param signal    [numpy.ndarray] The audio signal
+  # @param samp_freq [int] The signal's sample rate
+  #
+  # @return start [int] The speech segment start sample
+  # @return end   [int] The speech segment end sample (exclusive)
+  def speechBoundaries(self, signal, samp_freq):
+    [rsd_sq, has_silence, speech_start, speech_end] = \
+        self._detect_silence_module.detectSilenceWindows(\
+            signal, samp_freq, 0, False)
+    if speech_start < 0 or speech_end < 0:
+      return [0, signal.shape[0]]
+    return [int(round(speech_start * samp_freq)), \
+        min(int(round(speech_end * samp_freq)), signal.shape[0])]
+
+  ## Computes the duration of the trimmed audio
+  #
+  # @param signal    [numpy.ndarray] The audio signal
+  # @param samp_freq [int] The signal's sample rate
+  # @param start     [int] The speech segment start sample
+  # @param end       [int] The speech segment end sample (exclusive)
+  #
+  # @return removed_ms [float] The removed audio duration in milliseconds
+  def removedMilliseconds(self, signal, samp_freq, start, end):
+    return (signal.shape[0] - (end - start)) * 1000.0 / samp_freq
@@ -0,0 +1,117 @@
+#! /usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import roslib
+import rospkg
+
+roslib.load_manifest("rapp_audio_processing")
+
+from rapp_audio_processing import AudioCache
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        rospack = rospkg.RosPack()
+        self.auxiliary_files_url = rospack.get_path("rapp_testing_tools") +\
+                '/test_data'
+        self.cache_directory = tempfile.mkdtemp()
+        self.audio_cache = AudioCache(self.cache_directory, 1024 * 1024,\
+                1024 * 1024)
+        self.audio_file = self.auxiliary_files_url + "/nai_sample.wav"
+        self.output_file = os.path.join(self.cache_directory, "output.wav")
+        self.calls = 0
+
+    def tearDown(self):
+        self.audio_cache = None
+        shutil.rmtree(self.cache_directory)
+
+    def stage(self):
+        self.calls += 1
+        with open(self.output_file, 'wb') as f:
+            f.write('processed')
+        return "true"
+
+    def cachedCall(self, audio_cache, user, params, noise_profile = None):
+        key = audio_cache.createKey(self.audio_file, 'stage', [user] + params,\
+                noise_profile)
+        return audio_cache.cachedCall(user, key, self.output_file,\
+                self.stage, lambda result: result == "true")
+
+    def test_hitAndMiss(self):
+        self.assertEqual(self.cachedCall(self.audio_cache, 'rapp', [0.2]), "true")
+        os.remove(self.output_file)
+        self.assertEqual(self.cachedCall(self.audio_cache, 'rapp', [0.2]), "true")
+        self.assertEqual(self.calls, 1)
+        with open(self.output_file, 'rb') as f:
+            self.assertEqual(f.read(), 'processed')
+        statistics = self.audio_cache.getStatistics()
+        self.assertEqual(statistics['hits'], 1)
+        self.assertEqual(statistics['misses'], 1)
+
+    def test_differentParameters(self):
+        self.cachedCall(self.audio_cache, 'rapp', [0.2])
+        self.cachedCall(self.audio_cache, 'rapp', [0.3])
+        self.assertEqual(self.calls, 2)
+
+    def test_diskPersistence(self):
+        self.cachedCall(self.audio_cache, 'rapp', [0.2])
+        audio_cache = AudioCache(self.cache_directory, 1024 * 1024,\
+                1024 * 1024)
+        self.cachedCall(audio_cache, 'rapp', [0.2])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(audio_cache.getStatistics()['hits'], 1)
+
+    def test_userInvalidation(self):
+        self.cachedCall(self.audio_cache, 'rapp', [0.2])
+        self.cachedCall(self.audio_cache, '', [0.2])
+        self.audio_cache.invalidateUser('rapp')
+        self.cachedCall(self.audio_cache, 'rapp', [0.2])
+        self.cachedCall(self.audio_cache, '', [0.2])
+        self.assertEqual(self.calls, 3)
+
+    def test_noiseProfileVersion(self):
+        noise_profile = os.path.join(self.cache_directory, "noise_profile")
+        with open(noise_profile, 'w') as f:
+            f.write('profile')
+        self.cachedCall(self.audio_cache, 'rapp', [0.2], noise_profile)
+        with open(noise_profile, 'w') as f:
+            f.write('new profile')
+        self.cachedCall(self.audio_cache, 'rapp', [0.2], noise_profile)
+        self.assertEqual(self.calls, 2)
+
+    def test_lruEviction(self):
+        audio_cache = AudioCache(self.cache_directory, 40, 1024 * 1024)
+        self.cachedCall(audio_cache, '', [0.1])
+        self.cachedCall(audio_cache, '', [0.2])
+        self.cachedCall(audio_cache, '', [0.3])
+        statistics = audio_cache.getStatistics()
+        self.assertEqual(statistics['memory_entries'], 2)
+        self.assertEqual(statistics['evictions'], 1)
+        self.assertTrue(statistics['memory_size'] <= 40)
+
+    def test_notExistentFile(self):
+        self.audio_file = self.auxiliary_files_url + "/not_existent_file.wav"
+        self.cachedCall(self.audio_cache, 'rapp', [0.2])
+        self.cachedCall(self.audio_cache, 'rapp', [0.2])
+        self.assertEqual(self.calls, 2)
@@ -0,0 +1,135 @@
+#! /usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import sys
+import os
+import unittest
+import roslib
+import rospkg
+from scipy.io import wavfile
+
+roslib.load_manifest("rapp_audio_processing")
+
+from rapp_audio_processing import AudioPipeline
+from rapp_audio_processing import EnergyDenoise
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        rospack = rospkg.RosPack()
+        self.auxiliary_files_url = rospack.get_path("rapp_testing_tools") +\
+                '/test_data'
+        self.audio_pipeline_module = AudioPipeline()
+
+    def tearDown(self):
+        self.audio_pipeline_module = None
+        self.rospack = None
+
+    def test_silence(self):
+        profile = self.audio_pipeline_module.createProfile()
+        profile['detect_silence'] = True
+        profile['detect_silence_threshold'] = 2.5
+        [status, silence, level, removed] = self.audio_pipeline_module.processAudio(\
+                'rapp', 'nao_wav_1_ch',\
+                self.auxiliary_files_url + "/silence_sample.wav", '', profile)
+        self.assertEqual(status, "true")
+        self.assertEqual(silence, True)
+        self.assertNotEqual(level, -1)
+
+    def test_fourChannelsEnergyDenoise(self):
+        original_file = self.auxiliary_files_url + "/nao_wav_d05_a1.wav"
+        processed_file = self.auxiliary_files_url + "/nao_wav_d05_a1_processed.wav"
+        profile = self.audio_pipeline_module.createProfile()
+        profile['sox_channels_and_rate'] = True
+        profile['energy_denoising'] = True
+        profile['energy_denoising_init_scale'] = 0.125
+        [status, silence, level, removed] = self.audio_pipeline_module.processAudio(\
+                'rapp', 'nao_wav_4_ch', original_file, processed_file, profile)
+        self.assertEqual(status, "true")
+        self.assertEqual(silence, False)
+        samp_freq, signal = wavfile.read(processed_file)
+        self.assertEqual(samp_freq, 16000)
+        self.assertEqual(len(signal.shape), 1)
+        os.remove(processed_file)
+
+    def test_sameAsEnergyDenoise(self):
+        original_file = self.auxiliary_files_url + "/nai_sample.wav"
+        processed_file = self.auxiliary_files_url + "/nai_sample_processed.wav"
+        denoised_file = self.auxiliary_files_url + "/nai_sample_energy_denoised.wav"
+        profile = self.audio_pipeline_module.createProfile()
+        profile['energy_denoising'] = True
+        profile['energy_denoising_init_scale'] = 0.2
+        [status, silence, level, removed] = self.audio_pipeline_module.processAudio(\
+                'rapp', 'nao_wav_1_ch', original_file, processed_file, profile)
+        self.assertEqual(status, "true")
+        EnergyDenoise().energyDenoise(original_file, 0.2, denoised_file, False)
+        samp_freq, signal_processed = wavfile.read(processed_file)
+        samp_freq, signal_denoised = wavfile.read(denoised_file)
+        self.assertEqual(signal_processed.tolist(), signal_denoised.tolist())
+        os.remove(processed_file)
+        os.remove(denoised_file)
+
+    def test_soxDenoise(self):
+        original_file = self.auxiliary_files_url + "/nai_sample.wav"
+        processed_file = self.auxiliary_files_url + "/nai_sample_processed.wav"
+        profile = self.audio_pipeline_module.createProfile()
+        profile['sox_denoising'] = True
+        profile['sox_denoising_scale'] = 0.2
+        profile['detect_silence'] = True
+        profile['detect_silence_threshold'] = 2.5
+        [status, silence, level, removed] = self.audio_pipeline_module.processAudio(\
+                'rapp', 'nao_wav_1_ch', original_file, processed_file, profile)
+        self.assertEqual(status, "true")
+        self.assertEqual(silence, False)
+        # Check if denoised energy is lower than the initial one
+        samp_freq, signal_orig = wavfile.read(original_file)
+        samp_freq, signal_processed = wavfile.read(processed_file)
+        energy_orig = (signal_orig * 1.0) ** 2
+        energy_processed = (signal_processed * 1.0) ** 2
+        self.assertGreater(energy_orig.sum(), energy_processed.sum())
+        os.remove(processed_file)
+
+    def test_trimSilence(self):
+        original_file = self.auxiliary_files_url + "/nai_sample.wav"
+        processed_file = self.auxiliary_files_url + "/nai_sample_processed.wav"
+        profile = self.audio_pipeline_module.createProfile()
+        profile['trim_silence'] = True
+        profile['energy_denoising'] = True
+        profile['energy_denoising_init_scale'] = 0.2
+        [status, silence, level, removed] = \
+                self.audio_pipeline_module.processAudio(\
+                'rapp', 'nao_wav_1_ch', original_file, processed_file, profile)
+        self.assertEqual(status, "true")
+        self.assertGreater(removed, 0)
+        samp_freq, signal_orig = wavfile.read(original_file)
+        samp_freq, signal_processed = wavfile.read(processed_file)
+        self.assertAlmostEqual(removed, \
+                (len(signal_orig) - len(signal_processed)) * 1000.0 / samp_freq)
+        os.remove(processed_file)
+
+    def test_notExistentFile(self):
+        profile = self.audio_pipeline_module.createProfile()
+        [status, silence, level, removed] = self.audio_pipeline_module.processAudio(\
+                'rapp', 'nao_wav_1_ch',\
+                self.auxiliary_files_url + "/not_existent_file_sample.wav",\
+                '', profile)
+        self.assertEqual(status, "The audio file does not exist")
+        self.assertEqual(silence, False)
+        self.assertEqual(level, -1)
+        self.assertEqual(removed, 0)
@@ -0,0 +1,93 @@
+#! /usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import sys
+import os
+import time
+import threading
+import unittest
+import roslib
+import rospkg
+
+roslib.load_manifest("rapp_audio_processing")
+
+from rapp_audio_processing import BatchProcessing
+from rapp_audio_processing import EnergyDenoise
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        rospack = rospkg.RosPack()
+        self.auxiliary_files_url = rospack.get_path("rapp_testing_tools") +\
+                '/test_data'
+        self.batch_processing_module = BatchProcessing(2)
+
+    def tearDown(self):
+        self.batch_processing_module = None
+        self.rospack = None
+
+    def test_order(self):
+        results = self.batch_processing_module.process(\
+                lambda x: x * x, range(0, 20), lambda e: -1)
+        self.assertEqual(results, [x * x for x in range(0, 20)])
+
+    def test_emptyBatch(self):
+        results = self.batch_processing_module.process(\
+                lambda x: x, [], lambda e: -1)
+        self.assertEqual(results, [])
+
+    def test_itemErrors(self):
+        def invert(x):
+            return 1.0 / x
+        results = self.batch_processing_module.process(\
+                invert, [1, 0, 2], lambda e: "Error: " + str(e))
+        self.assertEqual(results[0], 1.0)
+        self.assertTrue(results[1].startswith("Error: "))
+        self.assertEqual(results[2], 0.5)
+
+    def test_boundedWorkers(self):
+        lock = threading.Lock()
+        counters = {'running': 0, 'max_running': 0}
+        def work(x):
+            with lock:
+                counters['running'] += 1
+                counters['max_running'] = \
+                        max(counters['max_running'], counters['running'])
+            time.sleep(0.01)
+            with lock:
+                counters['running'] -= 1
+            return x
+        self.batch_processing_module.process(work, range(0, 10), \
+                lambda e: -1)
+        self.assertLessEqual(counters['max_running'], \
+                self.batch_processing_module.getWorkers())
+
+    def test_energyDenoiseBatch(self):
+        files = ["nai_sample.wav", "silence_sample.wav", \
+                "not_existent_file_sample.wav"]
+        items = [[self.auxiliary_files_url + "/" + f, \
+                self.auxiliary_files_url + "/" + f + "_batch_denoised.wav"] \
+                for f in files]
+        energy_denoise_module = EnergyDenoise()
+        results = self.batch_processing_module.process(\
+                lambda item: energy_denoise_module.energyDenoise(\
+                    item[0], 0.2, item[1], False), items, lambda e: False)
+        self.assertEqual(results, [True, True, False])
+        os.remove(items[0][1])
+        os.remove(items[1][1])
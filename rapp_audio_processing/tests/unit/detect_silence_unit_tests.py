@@ -55,3 +55,44 @@ class TestAudioProcessing(unittest.TestCase):
         self.assertEqual(result, False)
         self.assertEqual(sq, -1)
 
+
+    def test_streamingSilence(self):
+        [sq, result, start, end] = \
+                self.detect_silence_module.detectSilenceStreaming(\
+                self.auxiliary_files_url + "/silence_sample.wav", 2.5, False)
+        self.assertEqual(result, True)
+
+    def test_streamingNoSilence(self):
+        [sq, result, start, end] = \
+                self.detect_silence_module.detectSilenceStreaming(\
+                self.auxiliary_files_url + "/nai_sample.wav", 2.5, False)
+        self.assertEqual(result, False)
+        self.assertGreaterEqual(start, 0)
+        self.assertGreater(end, start)
+
+    def test_streamingSameLevel(self):
+        [sq, result] = self.detect_silence_module.detectSilence(\
+                self.auxiliary_files_url + "/nai_sample.wav", 2.5)
+        [stream_sq, stream_result, start, end] = \
+                self.detect_silence_module.detectSilenceStreaming(\
+                self.auxiliary_files_url + "/nai_sample.wav", 2.5, False)
+        self.assertAlmostEqual(sq, stream_sq, places = 4)
+        self.assertEqual(result, stream_result)
+
+    def test_streamingEarlyExit(self):
+        [sq, result, start, end] = \
+                self.detect_silence_module.detectSilenceStreaming(\
+                self.auxiliary_files_url + "/nai_sample.wav", 2.5, True)
+        self.assertEqual(result, False)
+        self.assertGreaterEqual(start, 0)
+        self.assertEqual(end, -1)
+
+    def test_streamingNotExistentFile(self):
+        [sq, result, start, end] = \
+                self.detect_silence_module.detectSilenceStreaming(\
+                self.auxiliary_files_url + "/not_existent_file_sample.wav",\
+                2.5, True)
+        self.assertEqual(result, False)
+        self.assertEqual(sq, -1)
+        self.assertEqual(start, -1)
+        self.assertEqual(end, -1)
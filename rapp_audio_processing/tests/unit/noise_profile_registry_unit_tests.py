@@ -0,0 +1,97 @@
+#! /usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import roslib
+import numpy
+
+roslib.load_manifest("rapp_audio_processing")
+
+from rapp_audio_processing import NoiseProfileRegistry
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for user in ['rapp', 'nao']:
+            os.makedirs(os.path.join(self.directory, user, 'noise_profile'))
+        self.registry = NoiseProfileRegistry(self.directory)
+        self.spectrum = numpy.arange(1025, dtype = numpy.float64)
+
+    def tearDown(self):
+        self.registry = None
+        shutil.rmtree(self.directory)
+
+    def test_setAndGet(self):
+        self.registry.setNoiseSpectrum('rapp', 'nao_wav_1_ch', self.spectrum)
+        noise_spectrum = self.registry.getNoiseSpectrum('rapp', 'nao_wav_1_ch')
+        self.assertEqual(noise_spectrum.dtype, numpy.float32)
+        self.assertTrue(numpy.array_equal(noise_spectrum, self.spectrum))
+        self.assertTrue(os.path.isfile(\
+                self.registry.noiseSpectrumPath('rapp', 'nao_wav_1_ch')))
+        self.assertEqual(self.registry.getStatistics()['misses'], 0)
+
+    def test_lazyLoading(self):
+        self.registry.setNoiseSpectrum('rapp', 'nao_wav_1_ch', self.spectrum)
+        registry = NoiseProfileRegistry(self.directory)
+        self.assertEqual(registry.listProfiles(), [])
+        self.assertTrue(registry.hasNoiseSpectrum('rapp', 'nao_wav_1_ch'))
+        self.assertTrue(registry.hasNoiseSpectrum('rapp', 'nao_wav_1_ch'))
+        statistics = registry.getStatistics()
+        self.assertEqual(statistics['misses'], 1)
+        self.assertEqual(statistics['hits'], 1)
+
+    def test_notExistentProfile(self):
+        self.assertEqual(self.registry.getNoiseSpectrum('rapp', 'nao_ogg'), None)
+        self.assertEqual(self.registry.getVersion('rapp', 'nao_ogg'), None)
+        self.registry.setNoiseSpectrum('rapp', 'nao_ogg', self.spectrum)
+        self.assertTrue(self.registry.hasNoiseSpectrum('rapp', 'nao_ogg'))
+
+    def test_refreshOnWrite(self):
+        self.registry.setNoiseSpectrum('rapp', 'nao_wav_1_ch', self.spectrum)
+        version = self.registry.getVersion('rapp', 'nao_wav_1_ch')
+        self.registry.setNoiseSpectrum('rapp', 'nao_wav_1_ch', self.spectrum * 2)
+        self.assertNotEqual(self.registry.getVersion('rapp', 'nao_wav_1_ch'),\
+                version)
+        self.assertTrue(numpy.array_equal(\
+                self.registry.getNoiseSpectrum('rapp', 'nao_wav_1_ch'),\
+                self.spectrum * 2))
+
+    def test_warm(self):
+        self.registry.setNoiseSpectrum('rapp', 'nao_wav_1_ch', self.spectrum)
+        self.registry.setNoiseSpectrum('nao', 'nao_ogg', self.spectrum)
+        registry = NoiseProfileRegistry(self.directory)
+        self.assertEqual(registry.warm(['rapp']), 1)
+        self.assertEqual(registry.listProfiles(), ['rapp/nao_wav_1_ch'])
+        self.assertEqual(registry.warm(), 2)
+        self.assertEqual(sorted(registry.listProfiles()),\
+                ['nao/nao_ogg', 'rapp/nao_wav_1_ch'])
+
+    def test_lruEviction(self):
+        registry = NoiseProfileRegistry(self.directory, 1)
+        registry.setNoiseSpectrum('rapp', 'nao_wav_1_ch', self.spectrum)
+        registry.setNoiseSpectrum('nao', 'nao_ogg', self.spectrum)
+        self.assertEqual(registry.listProfiles(), ['nao/nao_ogg'])
+        self.assertEqual(registry.getStatistics()['evictions'], 1)
+        # Evicted profiles are loaded again from disk
+        self.assertTrue(registry.hasNoiseSpectrum('rapp', 'nao_wav_1_ch'))
@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import sys
+import unittest
+import roslib
+import rospkg
+import numpy
+from scipy.io import wavfile
+
+roslib.load_manifest("rapp_audio_processing")
+
+from rapp_audio_processing import SignalStatistics
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        rospack = rospkg.RosPack()
+        self.auxiliary_files_url = rospack.get_path("rapp_testing_tools") +\
+                '/test_data'
+        self.statistics_module = SignalStatistics()
+
+    def tearDown(self):
+        self.statistics_module = None
+        self.rospack = None
+
+    def test_squareSignal(self):
+        samp_freq, signal = wavfile.read(\
+                self.auxiliary_files_url + "/nai_sample.wav")
+        sq_signal = self.statistics_module.squareSignal(signal)
+        # The original signal must be left untouched
+        self.assertEqual(sq_signal.dtype, numpy.float64)
+        self.assertNotEqual(signal.dtype, numpy.float64)
+        for i in range(0, len(signal), 997):
+            self.assertEqual(sq_signal[i], signal[i] * 1.0 * signal[i])
+
+    def test_powerStatistics(self):
+        sq_signal = self.statistics_module.squareSignal(\
+                numpy.array([1, -1, 3, -3], dtype = numpy.int16))
+        [mean_sq, std_sq] = self.statistics_module.powerStatistics(sq_signal)
+        self.assertAlmostEqual(mean_sq, 5.0)
+        self.assertAlmostEqual(std_sq, 4.0)
+        rsd_sq = self.statistics_module.relativeStandardDeviation(sq_signal)
+        self.assertAlmostEqual(rsd_sq, 0.8)
+
+    def test_thresholdMask(self):
+        sq_signal = self.statistics_module.squareSignal(\
+                numpy.array([1, -1, 3, -3], dtype = numpy.int16))
+        mask = self.statistics_module.thresholdMask(sq_signal, 1.0)
+        self.assertEqual(list(mask), [True, True, False, False])
+        mask = self.statistics_module.thresholdMask(sq_signal, 1.0, 0.5)
+        self.assertEqual(list(mask), [False, False, False, False])
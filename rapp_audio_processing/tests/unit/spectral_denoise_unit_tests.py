@@ -0,0 +1,99 @@
+#! /usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import sys
+import unittest
+import roslib
+import rospkg
+import numpy
+from scipy.io import wavfile
+
+roslib.load_manifest("rapp_audio_processing")
+
+from rapp_audio_processing import SpectralDenoise
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        rospack = rospkg.RosPack()
+        self.auxiliary_files_url = rospack.get_path("rapp_testing_tools") +\
+                '/test_data'
+        self.spectral_denoise_module = SpectralDenoise()
+        samp_freq, noise = wavfile.read(\
+                self.auxiliary_files_url + "/silence_sample.wav")
+        self.noise = noise
+        self.noise_spectrum = \
+                self.spectral_denoise_module.computeNoiseSpectrum(noise)
+        samp_freq, self.signal = wavfile.read(\
+                self.auxiliary_files_url + "/nai_sample.wav")
+
+    def tearDown(self):
+        self.spectral_denoise_module = None
+        self.rospack = None
+
+    def energy(self, signal):
+        return numpy.sum(numpy.square(signal.astype(numpy.float64)))
+
+    def test_noiseSpectrum(self):
+        self.assertEqual(self.noise_spectrum.shape[0], \
+                SpectralDenoise.window_size / 2 + 1)
+        self.assertEqual(self.noise_spectrum.dtype, numpy.float32)
+
+    def test_zeroScale(self):
+        denoised = self.spectral_denoise_module.subtractNoise(\
+                self.signal, self.noise_spectrum, 0.0)
+        self.assertTrue(numpy.array_equal(denoised, self.signal))
+
+    def test_reconstruction(self):
+        denoised = self.spectral_denoise_module.subtractNoise(\
+                self.signal, self.noise_spectrum * 0.0, 0.5)
+        self.assertEqual(denoised.dtype, self.signal.dtype)
+        self.assertEqual(denoised.shape, self.signal.shape)
+        self.assertTrue(numpy.abs(denoised.astype(numpy.float64) - \
+                self.signal).max() <= 1)
+
+    def test_noiseReduction(self):
+        denoised_noise = self.spectral_denoise_module.subtractNoise(\
+                self.noise, self.noise_spectrum, 0.5)
+        denoised_signal = self.spectral_denoise_module.subtractNoise(\
+                self.signal, self.noise_spectrum, 0.5)
+        noise_ratio = self.energy(denoised_noise) / self.energy(self.noise)
+        signal_ratio = self.energy(denoised_signal) / self.energy(self.signal)
+        # The noise is reduced much more than the speech
+        self.assertLess(noise_ratio, 0.75)
+        self.assertGreater(signal_ratio, noise_ratio)
+
+    def test_invalidScale(self):
+        [status, signal] = self.spectral_denoise_module.spectralDenoiseSignal(\
+                'rapp', 'nao_wav_1_ch', self.signal, 16000, 1.5)
+        self.assertEqual(status, "Invalid scale. Scale must be between [0,1]")
+
+    def test_notExistentSpectrum(self):
+        [status, signal] = self.spectral_denoise_module.spectralDenoiseSignal(\
+                'not_existent_user', 'nao_wav_1_ch', self.signal, 16000, 0.2)
+        self.assertEqual(status, \
+                "No noise spectrum for the nao_wav_1_ch type exists")
+
+    def test_notExistentAudioFile(self):
+        result = self.spectral_denoise_module.spectralDenoise(\
+                'rapp', 'nao_wav_1_ch',\
+                self.auxiliary_files_url + "/not_existent_sample.wav",\
+                self.auxiliary_files_url + "/not_existent_sample_denoised.wav",\
+                0.2)
+        self.assertEqual(result, "The audio file does not exist")
@@ -24,6 +24,7 @@ import os
 import string
 import random
 import subprocess
+from scipy.io import wavfile
 
 import unittest
 import roslib
@@ -276,6 +277,46 @@ class TestAudioProcessing(unittest.TestCase):
                     self.assertEqual( result, "Error: target_rate can not be negative" )
                     self.assertEqual( final_name, '' )
 
+    def test_inProcessMono16k(self):
+        source_name = os.path.join( self.auxiliary_files_url, \
+                'nao_wav_d05_a1.wav' )
+        target_name = os.path.join( self.auxiliary_files_url, \
+                'nao_wav_d05_a1_mono16k.wav' )
+
+        result, final_name = self.transform_audio_module.transform_audio( \
+                'nao_wav_4_ch', source_name, 'wav', target_name, 1, 16000 )
+
+        self.assertEqual( result, 'success' )
+        samp_freq, signal = wavfile.read( target_name )
+        self.assertEqual( samp_freq, 16000 )
+        self.assertEqual( len( signal.shape ), 1 )
+        samp_freq, source_signal = wavfile.read( source_name )
+        self.assertEqual( signal.dtype, source_signal.dtype )
+        self.assertAlmostEqual( signal.shape[0], source_signal.shape[0] / 3, \
+                delta = 1 )
+        os.remove( target_name )
+
+        report = self.transform_audio_module.getLatencyReport()
+        self.assertEqual( report['numpy']['calls'], 1 )
+        self.assertTrue( 'sox' not in report )
+
+    def test_soxFallbackOgg(self):
+        source_name = os.path.join( self.auxiliary_files_url, \
+                'nao_ogg_d05_a1.ogg' )
+        target_name = os.path.join( self.auxiliary_files_url, \
+                'nao_ogg_d05_a1_fallback.wav' )
+
+        result, final_name = self.transform_audio_module.transform_audio( \
+                'nao_ogg', source_name, 'wav', target_name, 1, 16000 )
+
+        self.assertEqual( result, 'success' )
+        self.assertTrue( os.path.isfile( target_name ) )
+        os.remove( target_name )
+
+        report = self.transform_audio_module.getLatencyReport()
+        self.assertEqual( report['sox']['calls'], 1 )
+        self.assertTrue( 'numpy' not in report )
+
 
     def id_generator( self, size = 15, chars = string.ascii_lowercase + '_' ):
         return ''.join( random.choice( chars ) for _ in range( size ) )
@@ -0,0 +1,90 @@
+#! /usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Manos Tsardoulias
+# contact: etsardou@iti.gr
+
+import sys
+import os
+import unittest
+import roslib
+import rospkg
+import numpy
+from scipy.io import wavfile
+
+roslib.load_manifest("rapp_audio_processing")
+
+from rapp_audio_processing import TrimSilence
+from rapp_audio_processing import DetectSilence
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        rospack = rospkg.RosPack()
+        self.auxiliary_files_url = rospack.get_path("rapp_testing_tools") +\
+                '/test_data'
+        self.trim_silence_module = TrimSilence()
+
+    def tearDown(self):
+        self.trim_silence_module = None
+        self.rospack = None
+
+    def test_trimSpeech(self):
+        original_file = self.auxiliary_files_url + "/nai_sample.wav"
+        trimmed_file = self.auxiliary_files_url + "/nai_sample_trimmed.wav"
+        [status, removed] = self.trim_silence_module.trimSilence(\
+                original_file, trimmed_file)
+        self.assertEqual(status, "true")
+        self.assertGreater(removed, 0)
+        samp_freq, signal_orig = wavfile.read(original_file)
+        samp_freq, signal_trimmed = wavfile.read(trimmed_file)
+        self.assertLess(len(signal_trimmed), len(signal_orig))
+        self.assertAlmostEqual(removed, \
+                (len(signal_orig) - len(signal_trimmed)) * 1000.0 / samp_freq)
+        os.remove(trimmed_file)
+
+    def test_trimPaddedSpeech(self):
+        samp_freq, signal = wavfile.read(\
+                self.auxiliary_files_url + "/nai_sample.wav")
+        # The speech segment is extended by the margin windows, whereas the
+        # boundaries are aligned to the windows
+        margin = (DetectSilence.margin_windows + 1) * \
+                DetectSilence.window_ms * samp_freq / 1000
+        # Padding with one second of digital silence at each end
+        padding = numpy.zeros(samp_freq, dtype = signal.dtype)
+        padded = numpy.concatenate((padding, signal, padding))
+        [padded_start, padded_end] = \
+                self.trim_silence_module.speechBoundaries(padded, samp_freq)
+        self.assertGreaterEqual(padded_start, samp_freq - margin)
+        self.assertLessEqual(padded_end, samp_freq + len(signal) + margin)
+        self.assertLess(padded_start, padded_end)
+
+    def test_fourChannels(self):
+        original_file = self.auxiliary_files_url + "/nao_wav_d05_a1.wav"
+        trimmed_file = self.auxiliary_files_url + "/nao_wav_d05_a1_trimmed.wav"
+        [status, removed] = self.trim_silence_module.trimSilence(\
+                original_file, trimmed_file)
+        self.assertEqual(status, "true")
+        samp_freq, signal = wavfile.read(trimmed_file)
+        self.assertEqual(signal.shape[1], 4)
+        os.remove(trimmed_file)
+
+    def test_notExistentFile(self):
+        [status, removed] = self.trim_silence_module.trimSilence(\
+                self.auxiliary_files_url + "/not_existent_file_sample.wav",\
+                self.auxiliary_files_url + "/not_existent_file_trimmed.wav")
+        self.assertEqual(status, "The audio file does not exist")
+        self.assertEqual(removed, 0)
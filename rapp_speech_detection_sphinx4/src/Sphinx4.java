@@ -24,13 +24,19 @@ import edu.cmu.sphinx.api.StreamSpeechRecognizer;
 import edu.cmu.sphinx.linguist.flat.FlatLinguist;
 import edu.cmu.sphinx.recognizer.Recognizer;
 import edu.cmu.sphinx.util.props.ConfigurationManager;
-import java.io.BufferedReader;
+import java.io.BufferedInputStream;
 import java.io.BufferedWriter;
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.DataInputStream;
 import java.io.OutputStreamWriter;
 import java.io.File;
+import java.io.FileDescriptor;
 import java.io.FileInputStream;
+import java.io.FileOutputStream;
 import java.io.IOException;
-import java.io.InputStreamReader;
+import java.io.InputStream;
+import java.io.PrintStream;
 import java.io.PrintWriter;
 import java.net.URL;
 import java.net.URLClassLoader;
@@ -43,7 +49,7 @@ import java.util.Map;
  * @brief Performs speech recognition employing Sphinx
  *
  * Communicates with rapp_speech_detection_sphinx4.sphinx4_wrapper.Sphinx4Wrapper
- * via socket to configure Sphinx and perform the speech recognition and
+ * via a socket or the standard input/output to configure Sphinx and perform the speech recognition and
  * returns the result.
  */
 public class Sphinx4 {
@@ -69,7 +75,7 @@ public class Sphinx4 {
   public static ConfigurationManager cm;
   public static StreamSpeechRecognizer recognizer;
 
-  public static BufferedReader bufferRead;
+  public static DataInputStream bufferRead;
   public static PrintWriter bufferWrite;
 
   public static boolean grammar_enabled = false;
@@ -125,24 +131,73 @@ public class Sphinx4 {
     }
   }
 
+  /*! @brief Reads a newline terminated command
+   *
+   * The commands are read from the raw input stream, since audio data may
+   * follow them.
+   *
+   * @return The command without the line terminator, null at the end of stream
+   */
+  public static String readCommand() throws IOException {
+    ByteArrayOutputStream line = new ByteArrayOutputStream();
+    int c;
+    while ((c = bufferRead.read()) != '\n') {
+      if (c == -1) {
+        if (line.size() == 0) {
+          return null;
+        }
+        break;
+      }
+      if (c != '\r') {
+        line.write(c);
+      }
+    }
+    return line.toString("UTF-8");
+  }
+
+  //! Recognizes the speech of an audio stream, streaming the results
+  public static void recognize(InputStream audio) throws IOException {
+    recognizer.startRecognition(audio);
+    SpeechResult result;
+    while ((result = recognizer.getResult()) != null) {
+      bufferWrite.println("#" + result.getHypothesis());
+    }
+    recognizer.stopRecognition();
+  }
+
   /*! @brief The main function
    *
    * Creates the Sphinx process and awaits commands from
    * rapp_speech_detection_sphinx4.sphinx4_wrapper.Sphinx4Wrapper
    * to update the cconfiguration or perform the recognition.
+   *
+   * The single argument is either the socket port or "pipe", where the
+   * commands are read from the standard input and the replies written to the
+   * standard output.
    */
   public static void main(String[] args) throws IOException {
 
     int socketPort;
     Socket sphinxSocket;
 
-    if (args.length == 1)
+    if (args.length == 1 && args[0].equals("pipe"))
+    {
+      System.err.println("Pipe IPC");
+      bufferRead = new DataInputStream(new BufferedInputStream(System.in));
+      bufferWrite = new PrintWriter(new BufferedWriter(new OutputStreamWriter(new FileOutputStream(FileDescriptor.out))), true);
+      // The standard output carries the IPC, thus any other output is
+      // redirected to the standard error
+      System.setOut(new PrintStream(new FileOutputStream(FileDescriptor.err), true));
+    }
+    else if (args.length == 1)
     {
       socketPort = Integer.parseInt(args[0]);
       System.err.println("Socket port: " + socketPort);
       sphinxSocket = new Socket( "127.0.0.1", socketPort );
+      // Each line is sent as soon as it is produced
+      sphinxSocket.setTcpNoDelay(true);
 
-      bufferRead = new BufferedReader(new InputStreamReader(sphinxSocket.getInputStream()));
+      bufferRead = new DataInputStream(new BufferedInputStream(sphinxSocket.getInputStream()));
       bufferWrite = new PrintWriter(new BufferedWriter(new OutputStreamWriter(sphinxSocket.getOutputStream())), true);
     }
     else
@@ -158,7 +213,11 @@ public class Sphinx4 {
     while (true) {
       try {
         configuration.setUseGrammar(false);
-        String s = bufferRead.readLine();
+        String s = readCommand();
+        // The Python node closed the connection
+        if (s == null) {
+          System.exit(0);
+        }
         tmp = s.split("#");
         // Dictionary file setup
         if(tmp[0].contains("dictionary")){
@@ -226,28 +285,34 @@ public class Sphinx4 {
           grammar_enabled = false;
           bufferWrite.println("Grammar disabled");
         }
-        // Perform audio recognition
+        // Health check, answered by a responsive process
+        else if(tmp[0].contains("healthCheck")){
+          bufferWrite.println("Healthy");
+        }
+        // Perform audio recognition. The results are streamed one per line
+        // and terminated by a single stopPython line, without
+        // acknowledgements
         else if (tmp[0].contains("audioInput")) {
           updateConfiguration();
           test_file = new File(tmp[1]);
-          String temp;
           if(!test_file.exists())
           {
             bufferWrite.println("Fatal error, audio file does not exist");
-            temp = bufferRead.readLine();
           }
           else
           {
-            recognizer.startRecognition(new FileInputStream(tmp[1]));
-            SpeechResult result;
-            while ((result = recognizer.getResult()) != null) {
-              bufferWrite.println("#" + result.getHypothesis());
-              temp = bufferRead.readLine();
-            }
-            recognizer.stopRecognition();
-            bufferWrite.println("stopPython");
-            temp = bufferRead.readLine();
+            recognize(new FileInputStream(tmp[1]));
           }
+          bufferWrite.println("stopPython");
+        }
+        // Perform recognition of the audio samples following the command
+        // (16 bit PCM, of the given size in bytes), decoded from memory
+        else if (tmp[0].contains("audioData")) {
+          byte[] audio = new byte[Integer.parseInt(tmp[1])];
+          bufferRead.readFully(audio);
+          updateConfiguration();
+          recognize(new ByteArrayInputStream(audio));
+          bufferWrite.println("stopPython");
         }
       }
       catch (IOException | RuntimeException e) {
@@ -20,3 +20,16 @@ from limited_vocabulary_creator import LimitedVocabularyCreator
 from rapp_exceptions import RappError
 from sphinx4_configuration_params import SphinxConfigurationParams
 from speech_recognition_sphinx4 import SpeechRecognitionSphinx4
+from language_model_cache import LanguageModelCache
+from language_model_builder import LanguageModelBuilder
+from configuration_scheduler import ConfigurationScheduler
+from worker_pool import WorkerPool
+from sphinx4_ipc import IpcChannel, IpcError, IpcTimeoutError
+from sphinx4_ipc import createTcpChannel, createPipeChannel
+from recognition_jobs import RecognitionJobs
+from dictionary_index import DictionaryIndex
+from shared_resources import SharedResources
+from grapheme_transducer import GraphemeTransducer
+from pronunciation_cache import PronunciationCache
+from language_packs import LanguagePacks
+from sphinx4_wrapper import Sphinx4Wrapper
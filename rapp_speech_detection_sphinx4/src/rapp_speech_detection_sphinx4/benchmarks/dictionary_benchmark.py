@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+import os
+import sys
+import mmap
+import time
+import random
+import shutil
+import tempfile
+
+from rapp_speech_detection_sphinx4 import DictionaryIndex
+from rapp_speech_detection_sphinx4 import EnglishSupport
+
+## @class DictionaryBenchmark
+# Measures the English dictionary word lookup latency, scanning the memory
+# mapped dictionary (the previous english_support.EnglishSupport lookup)
+# compared to the sorted offset index (dictionary_index.DictionaryIndex), as
+# well as the index build and load times. The words are sampled uniformly
+# from the dictionary.
+class DictionaryBenchmark:
+
+  ## Performs the benchmark
+  #
+  # @param lookups [int] Number of word lookups per method
+  def __init__(self, lookups):
+    dictionary = EnglishSupport()._generic_sphinx_configuration['dictionary']
+    with open(dictionary, 'r') as f:
+      words = [line.split(' ', 1)[0] for line in f if '(' not in line]
+    random.seed(0)
+    sample = [random.choice(words) for i in range(0, lookups)]
+
+    directory = tempfile.mkdtemp()
+    index_file = os.path.join(directory, 'dictionary.idx')
+    start = time.time()
+    DictionaryIndex(dictionary, index_file).close()
+    print "Index build: " + str(round((time.time() - start) * 1000.0, 1)) + \
+        " ms"
+    start = time.time()
+    index = DictionaryIndex(dictionary, index_file)
+    print "Index load: " + str(round((time.time() - start) * 1000.0, 3)) + \
+        " ms"
+    print "-------------------------------------------------"
+
+    dictionary_file = open(dictionary, 'r')
+    mapping = mmap.mmap(dictionary_file.fileno(), 0, access = mmap.ACCESS_READ)
+
+    start = time.time()
+    for word in sample:
+      position = mapping.find("\n" + word + " ")
+      if position != -1:
+        dictionary_file.seek(position + 1)
+        dictionary_file.readline()[:-1].split(" ")[1:]
+    scan = (time.time() - start) / lookups
+    print "Scan (mmap find): " + str(round(scan * 1000000.0, 1)) + \
+        " us per word"
+
+    start = time.time()
+    for word in sample:
+      index.lookup(word)
+    indexed = (time.time() - start) / lookups
+    print "Sorted offset index: " + str(round(indexed * 1000000.0, 1)) + \
+        " us per word"
+    print "Speedup: x" + str(round(scan / indexed, 1))
+
+    index.close()
+    mapping.close()
+    dictionary_file.close()
+    shutil.rmtree(directory)
+
+# Main function
+if __name__ == "__main__":
+  lookups = 1000
+  if len(sys.argv) == 2:
+    lookups = int(sys.argv[1])
+  DictionaryBenchmark(lookups)
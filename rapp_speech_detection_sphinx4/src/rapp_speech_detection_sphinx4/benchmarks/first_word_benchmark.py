@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+import sys
+import time
+import threading
+import rospy
+
+from rapp_platform_ros_communications.srv import (
+  SpeechRecognitionSphinx4SubmitSrv,
+  SpeechRecognitionSphinx4SubmitSrvRequest,
+  SpeechRecognitionSphinx4JobSrv
+  )
+
+from rapp_platform_ros_communications.msg import (
+  SpeechRecognitionSphinx4PartialMsg
+  )
+
+from vocabularies import vocabularies
+
+## @class FirstWordBenchmark
+# Measures the time to first word of the Sphinx4 node, i.e. the time from the
+# submission of a recognition job until the first recognized utterance is
+# published on the partial results topic, compared to the time until the
+# final words are available (polling the job status). The audio file must be
+# accessible by the node and contain speech of the given vocabulary.
+class FirstWordBenchmark:
+
+  ## The job status polling period (seconds)
+  poll_period = 0.01
+
+  ## Performs the benchmark
+  #
+  # @param audio_file   [string] The audio file path
+  # @param audio_source [string] The audio source type (e.g. headset)
+  # @param vocabulary   [string] The benchmark vocabulary (see vocabularies.py)
+  # @param repetitions  [int] Number of recognitions
+  def __init__(self, audio_file, audio_source, vocabulary, repetitions):
+    ## The first partial result time per job ID
+    self._first_word = {}
+    ## Protects the first partial result times
+    self._lock = threading.Lock()
+
+    rospy.Subscriber( \
+        rospy.get_param("rapp_speech_detection_sphinx4_partial_topic"), \
+        SpeechRecognitionSphinx4PartialMsg, self._partialCallback )
+    submit_service = rospy.ServiceProxy( \
+        rospy.get_param("rapp_speech_detection_sphinx4_submit_topic"), \
+        SpeechRecognitionSphinx4SubmitSrv )
+    job_service = rospy.ServiceProxy( \
+        rospy.get_param("rapp_speech_detection_sphinx4_job_topic"), \
+        SpeechRecognitionSphinx4JobSrv )
+
+    req = SpeechRecognitionSphinx4SubmitSrvRequest()
+    req.language = 'el'
+    [req.words, req.sentences, req.grammar] = [[], [], []]
+    for [name, words, sentences, grammar] in vocabularies:
+      if name == vocabulary:
+        [req.words, req.sentences, req.grammar] = [words, sentences, grammar]
+    req.path = audio_file
+    req.audio_source = audio_source
+    req.user = 'rapp'
+
+    first_word_times = []
+    final_times = []
+    for i in range(0, repetitions):
+      start = time.time()
+      job_id = submit_service( req ).job_id
+      while True:
+        res = job_service( job_id )
+        if res.status in ['done', 'failed', 'unknown']:
+          break
+        time.sleep(self.poll_period)
+      final = time.time() - start
+      # The final words may be polled before the last partial is delivered
+      time.sleep(0.1)
+      with self._lock:
+        first_word = self._first_word.pop(job_id, None)
+      if first_word is None or res.status != 'done':
+        print "Recognition " + str(i) + ": no words (" + res.error + ")"
+        continue
+      first_word_times.append(first_word - start)
+      final_times.append(final)
+      print "Recognition " + str(i) + ": first word " + \
+          str(round((first_word - start) * 1000.0, 1)) + " ms, final " + \
+          str(round(final * 1000.0, 1)) + " ms, words: " + \
+          " ".join(res.words)
+
+    print "-------------------------------------------------"
+    if len(final_times) == 0:
+      return
+    mean_first_word = sum(first_word_times) / len(first_word_times)
+    mean_final = sum(final_times) / len(final_times)
+    print "Mean time to first word: " + \
+        str(round(mean_first_word * 1000.0, 1)) + " ms"
+    print "Mean time to final words: " + \
+        str(round(mean_final * 1000.0, 1)) + " ms"
+    print "Earlier by: " + \
+        str(round((mean_final - mean_first_word) * 1000.0, 1)) + " ms"
+
+  ## Records the first partial result of each job
+  #
+  # @param msg [rapp_platform_ros_communications::SpeechRecognitionSphinx4PartialMsg] The partial result
+  def _partialCallback(self, msg):
+    now = time.time()
+    with self._lock:
+      if msg.job_id not in self._first_word:
+        self._first_word[msg.job_id] = now
+
+# Main function
+if __name__ == "__main__":
+  if len(sys.argv) < 3:
+    print "Usage: first_word_benchmark.py AUDIO_FILE AUDIO_SOURCE " + \
+        "[VOCABULARY] [REPETITIONS]"
+    sys.exit(1)
+  vocabulary = 'fifty_words'
+  repetitions = 10
+  if len(sys.argv) > 3:
+    vocabulary = sys.argv[3]
+  if len(sys.argv) > 4:
+    repetitions = int(sys.argv[4])
+  rospy.init_node('SpeechRecognitionSphinx4FirstWordBenchmark')
+  FirstWordBenchmark(sys.argv[1], sys.argv[2], vocabulary, repetitions)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+import sys
+import time
+
+from rapp_speech_detection_sphinx4 import GreekSupport
+
+from vocabularies import vocabularies
+
+## @class G2pBenchmark
+# Measures the Greek word to phonemes transformation latency for the 50 words
+# vocabulary, applying the letter tables sequentially via str.replace (the
+# previous greek_support.GreekSupport transformation) compared to the
+# compiled transducer (grapheme_transducer.GraphemeTransducer), without and
+# with its word results cache.
+class G2pBenchmark:
+
+  ## Performs the benchmark
+  #
+  # @param repetitions [int] Number of transformations of the vocabulary per method
+  def __init__(self, repetitions):
+    greek = GreekSupport()
+    words = [v[1] for v in vocabularies if v[0] == 'fifty_words'][0]
+    transducer = greek._phonemes_transducer
+    tables = [greek._phonemes, greek._all_special_two_digit_letters, \
+        greek._two_digit_letters, greek._s_specific_rules, greek._letters]
+
+    start = time.time()
+    for i in range(0, repetitions):
+      for word in words:
+        self._replaceTables(word, greek._capital_letters, tables)
+    replaced = (time.time() - start) / (repetitions * len(words))
+    print "Sequential replacements: " + \
+        str(round(replaced * 1000000.0, 1)) + " us per word"
+
+    start = time.time()
+    for i in range(0, repetitions):
+      greek._capital_letters_transducer._cache = {}
+      transducer._cache = {}
+      for word in words:
+        transducer.transduce( \
+            greek._capital_letters_transducer.transduce(word))
+    compiled = (time.time() - start) / (repetitions * len(words))
+    print "Compiled transducer: " + str(round(compiled * 1000000.0, 1)) + \
+        " us per word (x" + str(round(replaced / compiled, 1)) + ")"
+
+    start = time.time()
+    for i in range(0, repetitions):
+      for word in words:
+        transducer.transduce( \
+            greek._capital_letters_transducer.transduce(word))
+    cached = (time.time() - start) / (repetitions * len(words))
+    print "Compiled transducer, cached: " + \
+        str(round(cached * 1000000.0, 1)) + " us per word (x" + \
+        str(round(replaced / cached, 1)) + ")"
+
+  ## Transforms a word applying each table's replacements in turn
+  #
+  # @param word            [string] The Greek word
+  # @param capital_letters [dictionary] The uppercase to lowercase table
+  # @param tables          [list::dictionary] The letters->phonemes tables
+  #
+  # @return phonemes [string] The word phonemes
+  def _replaceTables(self, word, capital_letters, tables):
+    for letter in capital_letters:
+      word = word.replace(letter, capital_letters[letter])
+    for table in tables:
+      for letters in table:
+        word = word.replace(letters, table[letters])
+    return word
+
+# Main function
+if __name__ == "__main__":
+  repetitions = 100
+  if len(sys.argv) == 2:
+    repetitions = int(sys.argv[1])
+  G2pBenchmark(repetitions)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import os
+import sys
+import time
+import socket
+import threading
+
+from rapp_speech_detection_sphinx4 import createTcpChannel, createPipeChannel
+
+## @class IpcBenchmark
+# Measures the throughput of the Sphinx4Wrapper <-> Sphinx4.java IPC channel
+# when streaming recognition results. A thread plays the Sphinx4.java role
+# over a localhost socket, as the real process does. The previous protocol
+# read chunks of 1024 bytes and acknowledged each one ('Read line'), Sphinx
+# waiting for the acknowledgement before sending the next result. The current
+# protocol reads newline terminated lines via a buffered reader, without
+# acknowledgements, until a single 'stopPython' line, over sockets with
+# Nagle's algorithm disabled (TCP_NODELAY), since each line is flushed as
+# soon as it is produced. The current protocol is also measured over the
+# sphinx4_ipc channels, on both transports (TCP socket and stdin/stdout pipes).
+class IpcBenchmark:
+
+  ## The result line streamed by the Sphinx role
+  result_line = "#nai oxi isws de kserw\n"
+
+  ## Performs the benchmark
+  #
+  # @param lines       [int] Number of result lines per recognition
+  # @param repetitions [int] Number of recognitions per protocol
+  def __init__(self, lines, repetitions):
+    protocols = [ \
+        ['before (chunks, per line ack)', self._sphinxAcknowledged, \
+          self._readAcknowledged, False], \
+        ['before, TCP_NODELAY', self._sphinxAcknowledged, \
+          self._readAcknowledged, True], \
+        ['after (buffered lines, no ack)', self._sphinxStreamed, \
+          self._readStreamed, True] \
+        ]
+    results = []
+    for [name, sphinx, reader, no_delay] in protocols:
+      elapsed = self._measure(sphinx, reader, no_delay, lines, repetitions)
+      results.append(elapsed)
+      print name + ": " + str(round(elapsed / repetitions * 1000.0, 3)) + \
+          " ms per recognition, " + \
+          str(int(lines * repetitions / elapsed)) + " lines/s"
+
+    print "-------------------------------------------------"
+    print "Throughput speedup: x" + str(round(results[0] / results[2], 1)) + \
+        " (x" + str(round(results[1] / results[2], 1)) + " over TCP_NODELAY only)"
+
+    print "-------------------------------------------------"
+    transports = []
+    for transport in ['tcp', 'pipe']:
+      elapsed = self._measureChannel(transport, lines, repetitions)
+      transports.append(elapsed)
+      print "channel, " + transport + ": " + \
+          str(round(elapsed / repetitions * 1000.0, 3)) + \
+          " ms per recognition, " + \
+          str(int(lines * repetitions / elapsed)) + " lines/s"
+    print "Pipe speedup over TCP: x" + \
+        str(round(transports[0] / transports[1], 2))
+
+  ## Measures the time to receive the results of a number of recognitions
+  #
+  # @param sphinx      [function] The Sphinx role (connection, lines, repetitions)
+  # @param reader      [function] Receives a recognition's results (connection, reader), returning the words
+  # @param no_delay    [bool] True to disable Nagle's algorithm
+  # @param lines       [int] Number of result lines per recognition
+  # @param repetitions [int] Number of recognitions
+  #
+  # @return elapsed [float] The total time in seconds
+  def _measure(self, sphinx, reader, no_delay, lines, repetitions):
+    server = socket.socket( socket.AF_INET, socket.SOCK_STREAM )
+    server.bind( ('127.0.0.1', 0) )
+    server.listen( 1 )
+    client = socket.create_connection( server.getsockname() )
+    connection, addr = server.accept()
+    if no_delay:
+      for s in [client, connection]:
+        s.setsockopt( socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 )
+    thread = threading.Thread( target = sphinx, \
+        args = (client, lines, repetitions) )
+    thread.start()
+
+    buffered_reader = connection.makefile('rb')
+    start = time.time()
+    for i in range(0, repetitions):
+      connection.sendall("audioInput#/tmp/audio.wav\r\n")
+      words = reader(connection, buffered_reader)
+      if len(words) != lines * (len(self.result_line.split()) ):
+        print "Unexpected number of words: " + str(len(words))
+    elapsed = time.time() - start
+
+    thread.join()
+    buffered_reader.close()
+    for s in [connection, client, server]:
+      s.close()
+    return elapsed
+
+  ## Measures the time to receive the results of a number of recognitions
+  # over a sphinx4_ipc channel
+  #
+  # @param transport   [string] The transport, 'tcp' or 'pipe'
+  # @param lines       [int] Number of result lines per recognition
+  # @param repetitions [int] Number of recognitions
+  #
+  # @return elapsed [float] The total time in seconds
+  def _measureChannel(self, transport, lines, repetitions):
+    if transport == 'pipe':
+      [command_read, command_write] = os.pipe()
+      [result_read, result_write] = os.pipe()
+      sphinx_reader = os.fdopen(command_read, 'rb')
+      sphinx_writer = os.fdopen(result_write, 'wb')
+      channel = createPipeChannel( os.fdopen(command_write, 'wb'), \
+          os.fdopen(result_read, 'rb') )
+    else:
+      server = socket.socket( socket.AF_INET, socket.SOCK_STREAM )
+      server.bind( ('127.0.0.1', 0) )
+      server.listen( 1 )
+      client = socket.create_connection( server.getsockname() )
+      client.setsockopt( socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 )
+      connection, addr = server.accept()
+      sphinx_reader = client.makefile('rb')
+      sphinx_writer = client.makefile('wb')
+      channel = createTcpChannel( connection, server )
+    thread = threading.Thread( target = self._sphinxChannel, \
+        args = (sphinx_reader, sphinx_writer, lines, repetitions) )
+    thread.start()
+
+    start = time.time()
+    for i in range(0, repetitions):
+      channel.send("audioInput#/tmp/audio.wav\r\n")
+      words = []
+      while True:
+        line = channel.readLine()
+        if line[0] == "#":
+          words.extend(line[1:].rstrip('\r\n').split(" "))
+        elif line.startswith("stopPython"):
+          break
+      if len(words) != lines * (len(self.result_line.split()) ):
+        print "Unexpected number of words: " + str(len(words))
+    elapsed = time.time() - start
+
+    thread.join()
+    sphinx_reader.close()
+    sphinx_writer.close()
+    channel.close()
+    if transport != 'pipe':
+      client.close()
+    return elapsed
+
+  ## The Sphinx role of the current protocol over files (stdin/stdout or
+  # socket files)
+  #
+  # @param reader      [file] The commands reader
+  # @param writer      [file] The results writer
+  # @param lines       [int] Number of result lines per recognition
+  # @param repetitions [int] Number of recognitions
+  def _sphinxChannel(self, reader, writer, lines, repetitions):
+    # PrintWriter with auto flush, i.e. a write per line
+    for i in range(0, repetitions):
+      reader.readline()
+      for j in range(0, lines):
+        writer.write(self.result_line)
+        writer.flush()
+      writer.write("stopPython\n")
+      writer.flush()
+
+  ## The Sphinx role of the previous protocol
+  #
+  # @param connection  [socket] The connection
+  # @param lines       [int] Number of result lines per recognition
+  # @param repetitions [int] Number of recognitions
+  def _sphinxAcknowledged(self, connection, lines, repetitions):
+    reader = connection.makefile('rb')
+    for i in range(0, repetitions):
+      reader.readline()
+      for j in range(0, lines):
+        connection.sendall(self.result_line)
+        reader.readline()
+      connection.sendall("stopPython\n")
+      reader.readline()
+    reader.close()
+
+  ## Receives a recognition's results via the previous protocol
+  #
+  # @param connection [socket] The connection
+  # @param reader     [file] The buffered connection reader (unused)
+  #
+  # @return words [list::string] The words
+  def _readAcknowledged(self, connection, reader):
+    words = []
+    while True:
+      line = connection.recv(1024)
+      connection.sendall('Read line\r\n')
+      if line[0] == "#":
+        words.extend(line[1:-1].split(" "))
+      if "stopPython\n" in line:
+        return words
+
+  ## The Sphinx role of the current protocol
+  #
+  # @param connection  [socket] The connection
+  # @param lines       [int] Number of result lines per recognition
+  # @param repetitions [int] Number of recognitions
+  def _sphinxStreamed(self, connection, lines, repetitions):
+    reader = connection.makefile('rb')
+    # PrintWriter with auto flush, i.e. a write per line
+    for i in range(0, repetitions):
+      reader.readline()
+      for j in range(0, lines):
+        connection.sendall(self.result_line)
+      connection.sendall("stopPython\n")
+    reader.close()
+
+  ## Receives a recognition's results via the current protocol
+  #
+  # @param connection [socket] The connection (unused)
+  # @param reader     [file] The buffered connection reader
+  #
+  # @return words [list::string] The words
+  def _readStreamed(self, connection, reader):
+    words = []
+    while True:
+      line = reader.readline()
+      if line[0] == "#":
+        words.extend(line[1:].rstrip('\r\n').split(" "))
+      elif line.startswith("stopPython"):
+        return words
+
+# Main function
+if __name__ == "__main__":
+  lines = 20
+  repetitions = 200
+  if len(sys.argv) == 3:
+    lines = int(sys.argv[1])
+    repetitions = int(sys.argv[2])
+  IpcBenchmark(lines, repetitions)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import sys
+import time
+
+from rapp_speech_detection_sphinx4 import GreekSupport
+
+from vocabularies import vocabularies
+
+## @class LanguageModelBenchmark
+# Measures the limited vocabulary configuration latency for the 2, 6 and 50
+# words vocabularies, building the language model in-process
+# (language_model_builder.LanguageModelBuilder) or via the CMU-Cambridge
+# toolkit. The language model cache is disabled.
+class LanguageModelBenchmark:
+
+  ## Performs the benchmark
+  #
+  # @param repetitions [int] Number of configurations per setup
+  def __init__(self, repetitions):
+    greek = GreekSupport()
+    vocabulary = greek._vocabulary
+    vocabulary._language_model_cache = None
+    in_process_max_words = vocabulary._language_model_builder_max_words
+    setups = [ \
+        ['toolkit', 0], \
+        ['in-process', in_process_max_words] \
+        ]
+
+    for [name, words, sentences, grammar] in vocabularies:
+      results = []
+      for [setup, max_words] in setups:
+        vocabulary._language_model_builder_max_words = max_words
+        start = time.time()
+        for i in range(0, repetitions):
+          greek.getLimitedVocebularyConfiguration(words, grammar, sentences)
+        latency = (time.time() - start) / repetitions
+        results.append(latency)
+        print name + " (" + str(len(set(words))) + " words), " + setup + \
+            ": " + str(round(latency * 1000.0, 1)) + " ms"
+      print "Speedup: x" + str(round(results[0] / results[1], 1))
+      print "-------------------------------------------------"
+
+    vocabulary._language_model_builder_max_words = in_process_max_words
+
+# Main function
+if __name__ == "__main__":
+  repetitions = 5
+  if len(sys.argv) == 2:
+    repetitions = int(sys.argv[1])
+  LanguageModelBenchmark(repetitions)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+## The 2, 6 and 50 words vocabularies of benchmark.py, as
+# [name, words, sentences, grammar] lists of UTF-8 strings (as the service
+# requests carry them)
+#
+# In order to pass the limited_vocabulary_creator validation, the grammars
+# are given without parentheses, the 50 words duplicate 'είναι' is replaced by
+# the missing 'ο' and 'δεν' is appended.
+vocabularies = [ \
+  [ \
+    'two_words', \
+    ['όχι', 'ναι'], \
+    ['όχι', 'ναι'], \
+    ['όχι', 'ναι'] \
+  ], \
+  [ \
+    'six_words', \
+    ['όχι', 'ναι', 'μπορεί', 'ίσως', 'δε', 'ξέρω'], \
+    ['όχι', 'ναι', 'μπορεί', 'ίσως', 'δε', 'ξέρω', 'όχι δε ξέρω', \
+      'ναι μπορεί', 'ίσως δε ξέρω', 'δε ξέρω', 'ναι ίσως', \
+      'μπορεί δε ξέρω', 'ίσως όχι'], \
+    ['όχι', 'ναι', 'μπορεί', 'μπορεί δε ξέρω', 'δε ξέρω', 'ίσως όχι', \
+      'ίσως ναι', 'ναι ίσως'] \
+  ], \
+  [ \
+    'fifty_words', \
+    ['όχι', 'ναι', 'ίσως', 'δε', 'θυμάμαι', 'αρκετά', 'κοντά', \
+      'έλα', 'φύγε', 'σήκω', 'κάτσε', 'είμαι', 'είσαι', 'σε', \
+      'λένε', 'πώς', 'που', 'ποτήρι', 'φούρνος', 'ώρα', 'είναι', \
+      'τι', 'γιατί', 'ρομπότ', 'σκάιπ', 'ιμέηλ', 'κόρη', 'γιός', \
+      'στείλε', 'μη', 'στείλεις', 'θέλω', 'βοήθεια', 'γιατρός', \
+      'χάπια', 'χάπι', 'το', 'τα', 'του', 'ξέρω', 'ξέρεις', \
+      'ποδόσφαιρο', 'ποιός', 'τώρα', 'μετά', 'πριν', 'χτές', \
+      'αύριο', 'ο', 'δεν'], \
+    ['όχι δε θυμάμαι', 'ναι στείλε ιμέηλ', 'ίσως δε θυμάμαι', \
+      'τι ώρα είναι', 'πώς σε λένε', 'που είναι το ποτήρι', \
+      'θέλω βοήθεια', 'που είναι ο γιατρός', 'τι ώρα είναι τώρα', \
+      'που είναι τα χάπια', 'το ξέρω', 'έλα αρκετά κοντά', \
+      'που είναι το χάπι', 'ναι έλα', 'στείλε ιμέηλ τώρα', \
+      'στείλε ιμέηλ αύριο', 'είσαι ρομπότ', 'που είναι ο φούρνος', \
+      'δε θυμάμαι ποιός είσαι', 'δε θυμάμαι', 'ποιός είσαι', \
+      'θέλω τα χάπια'], \
+    ['όχι', 'δε θυμάμαι', 'όχι δε θυμάμαι', 'στείλε ιμέηλ', \
+      'τι ώρα είναι', 'τι είναι', 'που είναι', 'που είναι το ποτήρι', \
+      'τι είσαι', 'ποιός είσαι', 'δε θυμάμαι ποιός είσαι', \
+      'που είναι ο φούρνος', 'θέλω', 'θέλω τα χάπια', 'θέλω το χάπι', \
+      'πώς σε λένε', 'σε λένε', 'ίσως', 'έλα κοντά', 'αρκετά κοντά', \
+      'ξέρεις ποδόσφαιρο', 'θέλω βοήθεια', 'γιατί', 'μη στείλεις', \
+      'στείλε αύριο', 'είναι αύριο', 'είναι τώρα', 'το ξέρεις', \
+      'δεν το ξέρεις'] \
+  ] \
+]
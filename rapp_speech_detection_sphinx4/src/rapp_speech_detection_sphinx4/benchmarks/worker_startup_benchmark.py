@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+import os
+import sys
+import time
+
+from rapp_speech_detection_sphinx4 import EnglishSupport
+from rapp_speech_detection_sphinx4 import GreekSupport
+from rapp_speech_detection_sphinx4 import SharedResources
+
+## @class WorkerStartupBenchmark
+# Measures the construction time and resident memory of the language support
+# of a worker (english_support.EnglishSupport and greek_support.GreekSupport),
+# per worker, with the read-only resources shared by the workers
+# (shared_resources.SharedResources) compared to created by each worker.
+class WorkerStartupBenchmark:
+
+  ## Performs the benchmark
+  #
+  # @param workers [int] Number of workers
+  def __init__(self, workers):
+    # The dictionary index is built once, beforehand
+    EnglishSupport()
+    for shared in [False, True]:
+      SharedResources.clear()
+      supports = []
+      memory = self._residentMemory()
+      start = time.time()
+      for i in range(0, workers):
+        if not shared:
+          SharedResources.clear()
+        english_support = EnglishSupport()
+        supports.append(GreekSupport(english_support))
+      duration = (time.time() - start) / workers
+      memory = (self._residentMemory() - memory) / workers
+      if shared:
+        print "Shared resources:"
+      else:
+        print "Resources per worker:"
+      print "  " + str(round(duration * 1000.0, 2)) + " ms, " + \
+          str(round(memory / 1024.0, 1)) + " KB per worker"
+
+  ## Returns the resident memory of the process
+  #
+  # @return memory [int] The resident memory in bytes
+  def _residentMemory(self):
+    with open('/proc/self/statm', 'r') as f:
+      return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+# Main function
+if __name__ == "__main__":
+  workers = 8
+  if len(sys.argv) == 2:
+    workers = int(sys.argv[1])
+  WorkerStartupBenchmark(workers)
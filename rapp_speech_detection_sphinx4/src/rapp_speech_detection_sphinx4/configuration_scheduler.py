@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Aris Thallas
+# contact: aris.thallas@{iti.gr, gmail.com}
+
+import time
+import threading
+
+## @class ConfigurationScheduler
+# @brief Assigns speech recognition requests to the Sphinx processes
+#
+# Requests are identified by their configuration hash and each Sphinx process
+# keeps the configuration it was last employed with. A request is served by
+# an idle process of the same configuration if one exists. Otherwise it either
+# waits in its configuration's queue for a busy process of the same
+# configuration, if that is expected to be faster than reconfiguring, or it
+# reconfigures the idle process whose configuration was least recently used.
+#
+# The reconfiguration cost and the recognition time are estimated from the
+# served requests' durations. Processes may be added and removed at runtime
+# (see worker_pool.WorkerPool).
+class ConfigurationScheduler:
+
+  ## The smoothing factor of the duration estimates
+  smoothing = 0.2
+
+  ## Constructor performing initializations
+  #
+  # @param processes            [int] The number of Sphinx processes
+  # @param reconfiguration_cost [float] The initial reconfiguration cost estimate (seconds)
+  # @param recognition_time     [float] The initial recognition time estimate (seconds)
+  def __init__(self, processes, reconfiguration_cost, recognition_time):
+    ## The processes' configuration, status and usage, by process index
+    self._processes = {}
+    ## The index of the next added process
+    self._next_index = 0
+    for i in range(processes):
+      self._addProcess(None)
+
+    ## The waiting requests' tickets per configuration, in arrival order
+    self._queues = {}
+    ## Thread conditional variable used for the scheduling
+    self._condition = threading.Condition()
+
+    ## Estimated duration of a request not requiring reconfiguration
+    self._recognition_time = recognition_time
+    ## Estimated duration of a request requiring reconfiguration
+    self._reconfigured_time = recognition_time + reconfiguration_cost
+
+    ## Served requests counter
+    self._requests = 0
+    ## Reconfigurations counter
+    self._reconfigurations = 0
+    ## Counter of the requests that waited for a process of their
+    # configuration, although an idle process could be reconfigured
+    self._reconfigurations_avoided = 0
+    ## Total time the requests waited for a process (seconds)
+    self._queue_wait_time = 0.0
+
+  ## Assigns a process to a request, blocking until one is available
+  #
+  # @param configuration [string] The request's configuration hash
+  #
+  # @return index       [int] The index of the assigned process
+  # @return reconfigure [bool] True if the process must be reconfigured
+  def acquire(self, configuration):
+    ticket = object()
+    arrival = time.time()
+    deferred = False
+
+    with self._condition:
+      queue = self._queues.setdefault(configuration, [])
+      queue.append(ticket)
+      try:
+        while True:
+          # Only the oldest request of each configuration is assigned
+          if queue[0] is ticket:
+            index = self._findIdle(configuration)
+            if index is not None:
+              if deferred:
+                self._reconfigurations_avoided += 1
+              return self._assign(index, configuration, arrival, False)
+
+            index = self._findLeastRecentlyUsedIdle()
+            if index is not None:
+              # Waiting is worth it up to the reconfiguration cost
+              wait = self._estimateWait(configuration)
+              budget = self._reconfigurationCost() - (time.time() - arrival)
+              if wait is None or wait >= budget:
+                return self._assign(index, configuration, arrival, True)
+              deferred = True
+              self._condition.wait(budget)
+              continue
+
+          self._condition.wait()
+      finally:
+        queue.remove(ticket)
+        if len(queue) == 0:
+          del self._queues[configuration]
+        self._condition.notify_all()
+
+  ## Releases a process, updating the duration estimates
+  #
+  # @param index       [int] The index of the process
+  # @param duration    [float] The request's duration (seconds)
+  # @param reconfigure [bool] True if the process was reconfigured
+  def release(self, index, duration, reconfigure):
+    with self._condition:
+      if reconfigure:
+        self._reconfigured_time += \
+            self.smoothing * (duration - self._reconfigured_time)
+      else:
+        self._recognition_time += \
+            self.smoothing * (duration - self._recognition_time)
+      process = self._processes[index]
+      process['running'] = False
+      process['last_used'] = time.time()
+      self._condition.notify_all()
+
+  ## Adds a process
+  #
+  # @param configuration [string] The process' configuration hash, None if not configured
+  #
+  # @return index [int] The index of the process
+  def addProcess(self, configuration = None):
+    with self._condition:
+      index = self._addProcess(configuration)
+      self._condition.notify_all()
+      return index
+
+  ## Removes an idle process
+  #
+  # @param index [int] The index of the process
+  #
+  # @return removed [bool] False if the process is running (not removed)
+  def removeIdleProcess(self, index):
+    with self._condition:
+      if index not in self._processes or self._processes[index]['running']:
+        return False
+      del self._processes[index]
+      return True
+
+  ## Returns the idle processes and for how long they are idle
+  #
+  # @return idle [dictionary] The idle time (seconds) by process index
+  def getIdleTimes(self):
+    now = time.time()
+    with self._condition:
+      return dict([[index, now - process['last_used']] \
+          for [index, process] in self._processes.items() \
+          if not process['running']])
+
+  ## Returns the processes' configurations
+  #
+  # @param idle [bool] If True only the idle processes are considered
+  #
+  # @return configurations [list::string] The configuration hashes
+  def getConfigurations(self, idle = False):
+    with self._condition:
+      return [process['configuration'] \
+          for process in self._processes.values() \
+          if not (idle and process['running'])]
+
+  ## Returns the number of processes
+  #
+  # @return processes [int] The number of processes
+  def getProcesses(self):
+    with self._condition:
+      return len(self._processes)
+
+  ## Returns the number of requests waiting for a process
+  #
+  # @return backlog [int] The number of waiting requests
+  def getBacklog(self):
+    with self._condition:
+      return sum([len(queue) for queue in self._queues.values()])
+
+  ## Returns the scheduling statistics
+  #
+  # @return statistics [dictionary] The counters and the duration estimates
+  def getStatistics(self):
+    with self._condition:
+      mean_queue_wait_time = 0.0
+      if self._requests > 0:
+        mean_queue_wait_time = self._queue_wait_time / self._requests
+      return {
+          'requests': self._requests,
+          'reconfigurations': self._reconfigurations,
+          'reconfigurations_avoided': self._reconfigurations_avoided,
+          'queue_wait_time': self._queue_wait_time,
+          'mean_queue_wait_time': mean_queue_wait_time,
+          'reconfiguration_cost': self._reconfigurationCost(),
+          'recognition_time': self._recognition_time
+          }
+
+  ## Adds a process (the condition must be held)
+  #
+  # @param configuration [string] The process' configuration hash
+  #
+  # @return index [int] The index of the process
+  def _addProcess(self, configuration):
+    index = self._next_index
+    self._next_index += 1
+    self._processes[index] = { \
+      'configuration': configuration, \
+      'running': False, \
+      'last_used': time.time(), \
+      'started': 0.0, \
+      'expected_duration': 0.0 \
+      }
+    return index
+
+  ## Marks a process as running for a request
+  #
+  # @param index         [int] The index of the process
+  # @param configuration [string] The request's configuration hash
+  # @param arrival       [float] The request's arrival time
+  # @param reconfigure   [bool] True if the process must be reconfigured
+  #
+  # @return index       [int] The index of the assigned process
+  # @return reconfigure [bool] True if the process must be reconfigured
+  def _assign(self, index, configuration, arrival, reconfigure):
+    now = time.time()
+    process = self._processes[index]
+    process['configuration'] = configuration
+    process['running'] = True
+    process['started'] = now
+    if reconfigure:
+      process['expected_duration'] = self._reconfigured_time
+      self._reconfigurations += 1
+    else:
+      process['expected_duration'] = self._recognition_time
+    self._requests += 1
+    self._queue_wait_time += now - arrival
+    return [index, reconfigure]
+
+  ## Finds an idle process of a configuration
+  #
+  # @param configuration [string] The configuration hash
+  #
+  # @return index [int] The index of the process, None if not found
+  def _findIdle(self, configuration):
+    for [index, process] in sorted(self._processes.items()):
+      if not process['running'] and process['configuration'] == configuration:
+        return index
+    return None
+
+  ## Finds the idle process whose configuration was least recently used
+  #
+  # @return index [int] The index of the process, None if all are running
+  def _findLeastRecentlyUsedIdle(self):
+    selected = None
+    fallback = None
+    for [index, process] in sorted(self._processes.items()):
+      if process['running']:
+        continue
+      if fallback is None:
+        fallback = index
+      # Configurations awaited by other requests are kept
+      if process['configuration'] in self._queues:
+        continue
+      # Unconfigured processes are employed first
+      if selected is None or \
+          self._evictionOrder(process) < \
+          self._evictionOrder(self._processes[selected]):
+        selected = index
+    if selected is None:
+      return fallback
+    return selected
+
+  ## Returns the eviction order of a process' configuration
+  #
+  # @param process [dictionary] The process
+  #
+  # @return order [list] Orders the unconfigured processes first, then the least recently used
+  def _evictionOrder(self, process):
+    return [process['configuration'] is not None, process['last_used']]
+
+  ## Estimates the time until a running process of a configuration finishes
+  #
+  # @param configuration [string] The configuration hash
+  #
+  # @return wait [float] The estimated wait (seconds), None if no running process has the configuration
+  def _estimateWait(self, configuration):
+    now = time.time()
+    wait = None
+    for process in self._processes.values():
+      if process['running'] and process['configuration'] == configuration:
+        remaining = max(0.0, process['started'] + \
+            process['expected_duration'] - now)
+        if wait is None or remaining < wait:
+          wait = remaining
+    return wait
+
+  ## Returns the estimated reconfiguration cost
+  #
+  # @return cost [float] The reconfiguration cost (seconds)
+  def _reconfigurationCost(self):
+    return max(0.0, self._reconfigured_time - self._recognition_time)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import os
+import mmap
+import struct
+import tempfile
+
+from rapp_exceptions import RappError
+
+## @class DictionaryIndex
+# @brief On-disk sorted offset index of a Sphinx pronunciation dictionary
+#
+# The dictionary (e.g. the CMU dictionary, a "word PH1 PH2 ..." line per
+# pronunciation, alternative pronunciations named "word(2)", "word(3)" etc.)
+# and its index are memory mapped. The index holds the line offsets sorted by
+# word (alternative pronunciations in order), thus a lookup is a binary
+# search, with no shared file position, hence thread safe.
+#
+# The index is built on first use and stored in a file, rebuilt if the
+# dictionary size or modification time change, or if it is incomplete (e.g.
+# empty after an interrupted build).
+class DictionaryIndex:
+
+  ## The index file magic string
+  magic = 'RAPPDIX1'
+  ## The index file header: magic, dictionary size, modification time, entries
+  header = struct.Struct('<8sQdI')
+  ## The index entry, a line offset
+  entry = struct.Struct('<I')
+
+  ## Constructor performing initializations
+  #
+  # @param dictionary_file [string] The dictionary path
+  # @param index_file      [string] The index path (created if missing or stale)
+  #
+  # @exception RappError The dictionary is empty
+  def __init__(self, dictionary_file, index_file):
+    # An empty file cannot be memory mapped
+    if os.path.getsize(dictionary_file) == 0:
+      raise RappError("ERROR: Dictionary " + dictionary_file + " is empty")
+
+    ## The dictionary file
+    self._dictionary_file = open(dictionary_file, 'rb')
+    ## The dictionary memory map
+    self._dictionary = mmap.mmap(self._dictionary_file.fileno(), 0, \
+        access = mmap.ACCESS_READ)
+
+    stat = os.fstat(self._dictionary_file.fileno())
+    if not self._isValid(index_file, stat):
+      self._build(index_file, stat)
+
+    ## The index file
+    self._index_file = open(index_file, 'rb')
+    ## The index memory map
+    self._index = mmap.mmap(self._index_file.fileno(), 0, \
+        access = mmap.ACCESS_READ)
+    ## The number of index entries
+    self._size = self.header.unpack_from(self._index, 0)[3]
+
+  ## Returns the pronunciations of a word
+  #
+  # @param word [string] The word
+  #
+  # @return pronunciations [list::list::string] The phonemes of each pronunciation (the "word(2)" etc. alternatives following the main one), empty if the word does not exist
+  def lookup(self, word):
+    # Leftmost entry not less than the word
+    low = 0
+    high = self._size
+    while low < high:
+      middle = (low + high) // 2
+      if self._entryWord(middle)[0] < word:
+        low = middle + 1
+      else:
+        high = middle
+
+    pronunciations = []
+    while low < self._size:
+      offset = self._entryOffset(low)
+      [entry_word, variant] = self._entryWord(low)
+      if entry_word != word:
+        break
+      end = self._dictionary.find('\n', offset)
+      if end == -1:
+        end = len(self._dictionary)
+      pronunciations.append(self._dictionary[offset:end].split()[1:])
+      low += 1
+    return pronunciations
+
+  ## Closes the memory maps
+  def close(self):
+    self._index.close()
+    self._index_file.close()
+    self._dictionary.close()
+    self._dictionary_file.close()
+
+  ## Returns the line offset of an index entry
+  #
+  # @param position [int] The entry position
+  #
+  # @return offset [int] The dictionary line offset
+  def _entryOffset(self, position):
+    return self.entry.unpack_from(self._index, \
+        self.header.size + position * self.entry.size)[0]
+
+  ## Returns the word of an index entry
+  #
+  # @param position [int] The entry position
+  #
+  # @return word    [string] The word, without the alternative number
+  # @return variant [int] The alternative pronunciation number (1 for the main one)
+  def _entryWord(self, position):
+    offset = self._entryOffset(position)
+    end = self._dictionary.find(' ', offset)
+    return self._splitWord(self._dictionary[offset:end])
+
+  ## Splits a dictionary entry name to the word and the alternative number
+  #
+  # @param name [string] The entry name, e.g. "word" or "word(2)"
+  #
+  # @return word    [string] The word
+  # @return variant [int] The alternative pronunciation number (1 for the main one)
+  def _splitWord(self, name):
+    if name.endswith(')') and '(' in name:
+      [word, variant] = name[:-1].rsplit('(', 1)
+      if variant.isdigit():
+        return [word, int(variant)]
+    return [name, 1]
+
+  ## Checks that an index file matches the dictionary
+  #
+  # @param index_file [string] The index path
+  # @param stat       [os.stat_result] The dictionary file status
+  #
+  # @return valid [bool] True if the index is up to date
+  def _isValid(self, index_file, stat):
+    try:
+      # Also excludes an empty index, which cannot be memory mapped
+      if os.path.getsize(index_file) < self.header.size:
+        return False
+      with open(index_file, 'rb') as f:
+        data = f.read(self.header.size)
+      [magic, size, mtime, entries] = self.header.unpack(data)
+    except (IOError, OSError, struct.error):
+      return False
+    return magic == self.magic and size == stat.st_size and \
+        mtime == stat.st_mtime and \
+        os.path.getsize(index_file) == \
+          self.header.size + entries * self.entry.size
+
+  ## Builds the index file
+  #
+  # The index is written to a temporary file and renamed, thus concurrent
+  # builders never expose a partial index.
+  #
+  # @param index_file [string] The index path
+  # @param stat       [os.stat_result] The dictionary file status
+  def _build(self, index_file, stat):
+    entries = []
+    offset = 0
+    for line in iter(self._dictionary.readline, ''):
+      name = line.split(' ', 1)[0].rstrip('\r\n')
+      if len(name) != 0:
+        [word, variant] = self._splitWord(name)
+        entries.append((word, variant, offset))
+      offset += len(line)
+    self._dictionary.seek(0)
+    entries.sort()
+
+    directory = os.path.dirname(index_file)
+    if directory != '' and not os.path.isdir(directory):
+      os.makedirs(directory)
+    [fd, tmp_file] = tempfile.mkstemp(dir = directory or '.', \
+        prefix = os.path.basename(index_file) + '.')
+    with os.fdopen(fd, 'wb') as f:
+      f.write(self.header.pack(self.magic, stat.st_size, stat.st_mtime, \
+          len(entries)))
+      f.write(''.join([self.entry.pack(entry[2]) for entry in entries]))
+    os.rename(tmp_file, index_file)
@@ -20,10 +20,14 @@
 
 import rospy
 import sys
-import mmap
+import os
+import hashlib
 
 from global_parameters import GlobalParams
 from rapp_exceptions import RappError
+from dictionary_index import DictionaryIndex
+from shared_resources import SharedResources
+from pronunciation_cache import PronunciationCache
 from limited_vocabulary_creator import *
 from rapp_tools import *
 
@@ -65,64 +69,97 @@ class EnglishSupport(GlobalParams):
       'grammar_disabled' : True
       }
 
-    ## The English dictionary file
+    ## The English dictionary index, shared by all the instances
     #
-    # Located in path global_parameters.GlobalParams#_language_models_url +
+    # Indexes the dictionary located in path
+    # global_parameters.GlobalParams#_language_models_url +
     # "/englishPack/cmudict-en-us.dict"
-    self._english_dict_file = None
-    ## The mmap of the English dictionary file contents
-    self._english_dict_mapping = None
-
-    # Open the generic english dictionary file
+    # (see dictionary_index.DictionaryIndex and
+    # shared_resources.SharedResources)
+    self._english_dictionary = None
     try:
-      self._english_dict_file = open(english_dictionary, 'r')
-    except IOError:
+      self._english_dictionary = SharedResources.get( \
+          ('dictionary_index', english_dictionary), \
+          lambda: DictionaryIndex( english_dictionary, os.path.join( \
+            self._dictionary_index_url, 'cmudict-en-us.idx' ) ) )
+    except (IOError, OSError, RappError):
       rapp_print("English dictionary could not be opened!")
-    # Create a mapping of the file
-    self._english_dict_mapping = mmap.mmap(self._english_dict_file.fileno(), 0, \
-        access = mmap.ACCESS_READ)
+
+    ## The persistent English word->phonemes cache, shared by all the
+    # instances (None if unavailable)
+    #
+    # Its version stamp is the dictionary hash, thus a change of the dictionary
+    # invalidates it.
+    # (see pronunciation_cache.PronunciationCache)
+    self._pronunciation_cache = None
+    ## The version stamp of the produced phonemes (None if unavailable)
+    self._pronunciation_version = None
+    try:
+      self._pronunciation_version = SharedResources.get( \
+          ('pronunciation_version', english_dictionary), \
+          lambda: self._hashDictionary(english_dictionary) )
+      self._pronunciation_cache = SharedResources.get( \
+          ('pronunciation_cache', english_dictionary), \
+          lambda: PronunciationCache( os.path.join( \
+            self._pronunciation_cache_url, 'english.cache' ), \
+            self._pronunciation_version, \
+            self._pronunciation_cache_max_words ) )
+    except (IOError, OSError):
+      rapp_print("English pronunciation cache could not be opened!")
+
+  ## Computes the version stamp of the dictionary's phonemes
+  #
+  # The content hash, rather than the modification time, thus the stamp is
+  # the same in every checkout of the dictionary.
+  #
+  # @param dictionary [string] The dictionary file
+  #
+  # @return version [string] The version stamp
+  def _hashDictionary(self, dictionary):
+    dictionary_hash = hashlib.sha1()
+    with open(dictionary, 'rb') as f:
+      for chunk in iter(lambda: f.read(1024 * 1024), ''):
+        dictionary_hash.update(chunk)
+    return 'cmudict-en-us ' + dictionary_hash.hexdigest()
 
   ## Compute the English word phonemes
   #
+  # Conjoined words ("word1-word2") get the concatenated phonemes of their
+  # parts. The main pronunciation of each word is employed. The phonemes are
+  # looked up in the pronunciation cache first.
+  #
   # @param words [list::string] The set of English words
   # @return enhanced_words  [dictionary] The English word->phonemes mapping
   def getWordPhonemes(self, words):
     enhanced_words = {}
     for word in words:
-      inner_words = []
-      inner_phonemes = []
-      if "-" not in word: # Check for conjoined english words
-        index = self._english_dict_mapping.find("\n" + word + " ")
-        if index == -1:
-           raise RappError("ERROR: Word " + word +\
-                    " does not exist in the English Dictionary")
-        else:
-          self._english_dict_file.seek(index + 1)
-          line = self._english_dict_file.readline()
-          line = line[:-1]
-          split_line = line.split(" ")
-          inner_phonemes = split_line[1:]
-
-      else:
-        inner_words = word.split("-")
-        for in_w in inner_words:
-          index = self._english_dict_mapping.find("\n" + in_w + " ")
-          if  index == -1:
-            raise RappError("ERROR: Word " + in_w +\
-                    " does not exist in the English Dictionary")
-          else:
-            self._english_dict_file.seek(index + 1) # +1 because of the extra \n
-            line = self._english_dict_file.readline()
-            line = line[:-1] # to erase the \n
-            split_line = line.split(" ")
-
-            #enhanced_words[split_line[0]] = []
-            for i in range(1, len(split_line)):
-              inner_phonemes.append(split_line[i])
+      inner_phonemes = None
+      if self._pronunciation_cache is not None:
+        inner_phonemes = self._pronunciation_cache.get(word)
+      if inner_phonemes is None:
+        inner_phonemes = []
+        for in_w in word.split("-"): # Check for conjoined english words
+          inner_phonemes.extend(self.getWordPronunciations(in_w)[0])
+        if self._pronunciation_cache is not None:
+          self._pronunciation_cache.put(word, inner_phonemes)
       enhanced_words[word] = inner_phonemes
 
     return enhanced_words
 
+  ## Returns all the pronunciations of an English word
+  #
+  # @param word [string] The English word
+  # @return pronunciations [list::list::string] The phonemes of the main and the alternative ("word(2)" etc.) pronunciations
+  # @exception RappError The word does not exist in the dictionary
+  def getWordPronunciations(self, word):
+    pronunciations = []
+    if self._english_dictionary is not None:
+      pronunciations = self._english_dictionary.lookup(word)
+    if len(pronunciations) == 0:
+      raise RappError("ERROR: Word " + word +\
+          " does not exist in the English Dictionary")
+    return pronunciations
+
   ## Computes the Limited English Configuration
   #
   # @param words      [list::string] The set of words to be identified
@@ -137,7 +174,8 @@ class EnglishSupport(GlobalParams):
 
     try:
         limited_sphinx_configuration= \
-            self._vocabulary.createConfigurationFiles(enhanced_words, grammar, sentences)
+            self._vocabulary.createConfigurationFiles(enhanced_words, grammar, \
+                sentences, 'en')
     except RappError as e:
         raise RappError(e.value)
 
@@ -148,3 +186,11 @@ class EnglishSupport(GlobalParams):
   # @return #_generic_sphinx_configuration [dictionary] The Generic English configuration
   def getGenericConfiguration(self):
     return self._generic_sphinx_configuration
+
+  ## Returns the version stamp of the produced phonemes
+  #
+  # The stamp of the pronunciation cache, i.e. the dictionary hash.
+  #
+  # @return #_pronunciation_version [string] The version stamp, None if the dictionary is unavailable
+  def getPronunciationVersion(self):
+    return self._pronunciation_version
@@ -17,29 +17,83 @@
 import os
 import rospkg
 
+from shared_resources import SharedResources
+
 ## @class GlobalParams
 # @brief Contains global Sphinx parameters
 class GlobalParams:
   def __init__(self):
-    self.rospack = rospkg.RosPack()
+    ## The ROS package finder, shared by all the instances, thus the packages
+    # are crawled once per process (see shared_resources.SharedResources)
+    self.rospack = SharedResources.get('rospack', rospkg.RosPack)
 
     ## Java libraries path
-    self._sphinx_jar_files_url = self.rospack.get_path("rapp_sphinx4_java_libraries")
+    self._sphinx_jar_files_url = self._getPackagePath("rapp_sphinx4_java_libraries")
     ## Sphinx package path
-    self._sphinx_package_url = self.rospack.get_path("rapp_speech_detection_sphinx4")
+    self._sphinx_package_url = self._getPackagePath("rapp_speech_detection_sphinx4")
     ## Language models path
-    self._language_models_url = self.rospack.get_path("rapp_sphinx4_language_models")
+    self._language_models_url = self._getPackagePath("rapp_sphinx4_language_models")
+    ## Pre-built language packs path
+    #
+    # (see language_packs.LanguagePacks)
+    self._language_packs_url = os.path.join( \
+        self._language_models_url, 'prebuiltPacks' )
     ## Temporary language models path
     self._tmp_language_models_url = os.path.join( os.environ['HOME'], \
         'rapp_platform_files/rapp_speech_recognition_sphinx4/' )
+    ## Language model cache path
+    #
+    # (see language_model_cache.LanguageModelCache)
+    self._language_model_cache_url = os.path.join( \
+        self._tmp_language_models_url, 'language_model_cache' )
+    ## Pronunciation dictionary indexes path
+    #
+    # (see dictionary_index.DictionaryIndex)
+    self._dictionary_index_url = os.path.join( \
+        self._tmp_language_models_url, 'dictionary_index' )
+    ## Pronunciation caches path
+    #
+    # (see pronunciation_cache.PronunciationCache)
+    self._pronunciation_cache_url = os.path.join( \
+        self._tmp_language_models_url, 'pronunciation_cache' )
+    ## Pronunciation cache cap of the loaded words (0 disables the cap)
+    self._pronunciation_cache_max_words = 100000
+    ## Language model cache size cap in bytes (0 disables the cache)
+    self._language_model_cache_size = 64 * 1024 * 1024
+    ## Vocabularies up to this number of words get their language model built
+    # in-process (see language_model_builder.LanguageModelBuilder), larger
+    # ones via the CMU-Cambridge toolkit (0 always employs the toolkit)
+    self._language_model_builder_max_words = 100
     ## Noise profiles path
-    self._noise_profiles_url = self.rospack.get_path("rapp_sphinx4_noise_profiles")
+    self._noise_profiles_url = self._getPackagePath("rapp_sphinx4_noise_profiles")
     ## Acoustic models path
-    self._acoustic_models_url = self.rospack.get_path("rapp_sphinx4_acoustic_models")
+    self._acoustic_models_url = self._getPackagePath("rapp_sphinx4_acoustic_models")
     self._acoustic_models_url += "/english_acoustic_model"
     ## Sphinx jar file path
     self._sphinx_jar_file = 'sphinx4-core-1.0-20150630.174404-9.jar'
     ## True if Sphinx is allowed output on STDIN, STDERR
     self._allow_sphinx_output = False
+    ## True if a standby Sphinx subprocess is kept ready to replace a crashed one
+    self._sphinx_warm_standby = True
+    ## Timeout of the Sphinx subprocess health check (seconds)
+    self._health_check_timeout = 1.0
+    ## Sphinx subprocesses not finishing a recognition within this time
+    # (seconds) are respawned
+    self._recognition_timeout = 10.0
+    ## The Sphinx subprocess IPC transport: 'tcp' (socket) or 'pipe'
+    # (the subprocess' stdin/stdout)
+    self._sphinx_ipc_transport = 'pipe'
+    ## The audio transfer to the Sphinx subprocess: 'stream' (the PCM samples
+    # are sent over the IPC) or 'path' (Sphinx opens the audio file)
+    self._sphinx_audio_transfer = 'stream'
     ## IPC socket HOST parameter
     self._socket_host = '127.0.0.1'
+
+  ## Returns the path of a ROS package, resolved once per process
+  #
+  # @param package [string] The package name
+  #
+  # @return path [string] The package path
+  def _getPackagePath(self, package):
+    return SharedResources.get( ('package_path', package), \
+        lambda: self.rospack.get_path(package) )
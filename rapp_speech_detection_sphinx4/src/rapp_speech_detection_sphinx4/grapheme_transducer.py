@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+## @class GraphemeTransducer
+# @brief Rewrites words by longest match rules in a single left to right scan
+#
+# The rules are compiled into a trie. At each position of a word the longest
+# rule matching there is applied and the scan continues after the rule's
+# consumed letters, whereas the letters matching no rule are kept as they are.
+# A rule may require a context following its letters (e.g. the Greek 'αυ'
+# before a voiceless consonant), which is matched but not consumed. Equal
+# length rules are resolved in favour of the one added first.
+#
+# The results are memoized per word. The rules are never modified after the
+# construction, thus the instances may be shared by threads.
+class GraphemeTransducer:
+
+  ## Performs initializations
+  #
+  # @param max_cached_words [int] The word results cache size cap (the cache is emptied when reached)
+  def __init__(self, max_cached_words = 10000):
+    ## The rules trie: letter -> [trie, rule], rule being [output, consumed] or None
+    self._trie = {}
+    ## The word->result cache
+    self._cache = {}
+    ## The word results cache size cap
+    self._max_cached_words = max_cached_words
+
+  ## Adds rules, unless a rule of the same letters and context exists
+  #
+  # @param rules   [dictionary] The letters->output mapping
+  # @param context [string] The letters which must follow the rules' letters (not consumed)
+  def addRules(self, rules, context = ''):
+    for letters in rules:
+      node = [self._trie, None]
+      for letter in letters + context:
+        node = node[0].setdefault(letter, [{}, None])
+      if node[1] is None:
+        node[1] = [rules[letters], len(letters)]
+    self._cache = {}
+
+  ## Adds a table of rules with contexts
+  #
+  # Each rule's letters end with its context, which is the same in its output
+  # (e.g. 'αυτ' -> 'αφτ'), thus only the output's preceding letters are
+  # emitted, transformed by the existing rules.
+  #
+  # @param rules          [dictionary] The letters+context->output+context mapping
+  # @param context_length [int] The context length (in the rules' string units)
+  def addContextRules(self, rules, context_length):
+    for letters in rules:
+      context = letters[-context_length:]
+      self.addRules( { letters[:-context_length] : \
+          self.transduce( rules[letters][:-context_length] ) }, context )
+
+  ## Transforms a word
+  #
+  # @param word [string] The word
+  #
+  # @return result [string] The transformed word
+  def transduce(self, word):
+    result = self._cache.get(word)
+    if result is not None:
+      return result
+
+    output = []
+    position = 0
+    while position < len(word):
+      node = [self._trie, None]
+      rule = None
+      index = position
+      while index < len(word) and word[index] in node[0]:
+        node = node[0][word[index]]
+        index += 1
+        if node[1] is not None:
+          rule = node[1]
+      if rule is None:
+        output.append(word[position])
+        position += 1
+      else:
+        output.append(rule[0])
+        position += rule[1]
+    result = ''.join(output)
+
+    if len(self._cache) >= self._max_cached_words:
+      self._cache = {}
+    self._cache[word] = result
+    return result
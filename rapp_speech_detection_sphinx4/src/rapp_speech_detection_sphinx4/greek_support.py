@@ -22,12 +22,17 @@
 import rospy
 import sys
 import re
+import os
 import mmap
+import hashlib
 
 from global_parameters import GlobalParams
 from rapp_exceptions import RappError
 from english_support import *
 from limited_vocabulary_creator import *
+from shared_resources import SharedResources
+from grapheme_transducer import GraphemeTransducer
+from pronunciation_cache import PronunciationCache
 from rapp_tools import *
 
 ## @class GreekSupport
@@ -37,8 +42,17 @@ from rapp_tools import *
 # english_support.EnglishSupport
 class GreekSupport(GlobalParams):
 
+  ## The version of the word transformation algorithm
+  #
+  # (see grapheme_transducer.GraphemeTransducer and _transformWords)
+  # Part of the pronunciation version stamp, thus it must be increased on any
+  # change of the algorithm producing other phonemes.
+  transformation_version = 1
+
   ## Performs initializations
-  def __init__(self):
+  #
+  # @param english_support [english_support.EnglishSupport] The English support to employ for the English words, created if not given
+  def __init__(self, english_support = None):
     GlobalParams.__init__(self)
 
     ## The limited vocabulary creator
@@ -72,8 +86,11 @@ class GreekSupport(GlobalParams):
 
     ## Allows the creation of configuration files for English words
     #
-    # Instantiates english_support.EnglishSupport to identify english words
-    self._english_support = EnglishSupport()
+    # Instantiates english_support.EnglishSupport to identify english words,
+    # unless one is given
+    self._english_support = english_support
+    if self._english_support is None:
+      self._english_support = EnglishSupport()
     # Open the generic english dictionary file
     # NOTE: Fix this according to the Greek generic dictionary
     #try:
@@ -100,10 +117,75 @@ class GreekSupport(GlobalParams):
     self._letters = {}
     ## Greek letters->English letters mapping
     self._literal_letters = {}
-
-    self._configureLetters()
+    ## Greek uppercase to lowercase transducer
+    #
+    # (see grapheme_transducer.GraphemeTransducer)
+    self._capital_letters_transducer = None
+    ## Greek letters->English letters transducer
+    self._literal_letters_transducer = None
+    ## Greek letters->English phonemes transducer
+    self._phonemes_transducer = None
+    ## The persistent Greek word->phonemes cache (None if unavailable)
+    #
+    # (see pronunciation_cache.PronunciationCache)
+    self._pronunciation_cache = None
+    ## The version stamp of the produced phonemes
+    self._pronunciation_version = None
+
+    # The tables are read-only, thus they are created once and shared by all
+    # the instances (see shared_resources.SharedResources)
+    tables = SharedResources.get('greek_letters', self._compileLetters)
+    for name in tables:
+      setattr(self, name, tables[name])
+
+  ## Creates the Greek letter tables and compiles them into transducers
+  #
+  # The phonemes transducer applies the longest rule of the phonemes,
+  # two digit letters, specific rules and letters tables, in this order of
+  # precedence among rules of equal length. The special two digit letters
+  # are rules of the following letter context.
+  #
+  # The persistent pronunciation cache is created as well, its version stamp
+  # being the transformation algorithm version and the hash of the tables,
+  # thus a change of either invalidates it.
+  #
+  # @return tables [dictionary] The attribute name->table mapping of the created tables, transducers, pronunciation version stamp and cache
+  def _compileLetters(self):
+    tables = self._configureLetters()
+
+    tables['_pronunciation_version'] = 'greek ' + \
+        str(self.transformation_version) + ' ' + hashlib.sha1( repr( \
+        [ [name, sorted( tables[name].items() ) \
+        if isinstance(tables[name], dict) else tables[name]] \
+        for name in sorted(tables) ] ) ).hexdigest()
+    tables['_pronunciation_cache'] = None
+    try:
+      tables['_pronunciation_cache'] = PronunciationCache( os.path.join( \
+          self._pronunciation_cache_url, 'greek.cache' ), \
+          tables['_pronunciation_version'], \
+          self._pronunciation_cache_max_words )
+    except (IOError, OSError):
+      rapp_print("Greek pronunciation cache could not be opened!")
+
+    tables['_capital_letters_transducer'] = GraphemeTransducer()
+    tables['_capital_letters_transducer'].addRules(self._capital_letters)
+    tables['_literal_letters_transducer'] = GraphemeTransducer()
+    tables['_literal_letters_transducer'].addRules(self._literal_letters)
+
+    phonemes_transducer = GraphemeTransducer()
+    phonemes_transducer.addRules(self._phonemes)
+    phonemes_transducer.addRules(self._two_digit_letters)
+    phonemes_transducer.addRules(self._s_specific_rules)
+    phonemes_transducer.addRules(self._letters)
+    # The context is a single (UTF-8 encoded) Greek letter
+    phonemes_transducer.addContextRules(self._all_special_two_digit_letters, \
+        len((u'π').encode('utf-8')))
+    tables['_phonemes_transducer'] = phonemes_transducer
+    return tables
 
   ## Creates the basic Greek letter to English configuration
+  #
+  # @return tables [dictionary] The attribute name->table mapping of the created tables
   def _configureLetters(self):
 
     f_base_pre = [u'π', u'τ', u'κ', u'θ', u'χ', u'σ', u'ξ', u'ψ']
@@ -169,6 +251,8 @@ class GreekSupport(GlobalParams):
     self._phonemes[(u'ππ').encode('utf-8')] = 'P '
     self._phonemes[(u'ρρ').encode('utf-8')] = 'R '
     self._phonemes[(u'ττ').encode('utf-8')] = 'T '
+    # Precedes 'ντ' (e.g. 'πρίντσιπ')
+    self._phonemes[(u'ντσ').encode('utf-8')] = 'N CH '
 
     self._two_digit_letters[(u'αι').encode('utf-8')] = 'EH '
     self._two_digit_letters[(u'αί').encode('utf-8')] = 'EH '
@@ -287,6 +371,16 @@ class GreekSupport(GlobalParams):
     self._literal_letters[(u'ω').encode('utf-8')] = 'w'
     self._literal_letters[(u'ώ').encode('utf-8')] = 'w\''
 
+    return { \
+      '_capital_letters' : self._capital_letters, \
+      '_phonemes' : self._phonemes, \
+      '_two_digit_letters' : self._two_digit_letters, \
+      '_special_two_digit_letters' : self._special_two_digit_letters, \
+      '_all_special_two_digit_letters' : self._all_special_two_digit_letters, \
+      '_s_specific_rules' : self._s_specific_rules, \
+      '_letters' : self._letters, \
+      '_literal_letters' : self._literal_letters \
+      }
 
   ## Transforms the Greek words into phonemes for the Sphinx configuration
   #
@@ -298,44 +392,27 @@ class GreekSupport(GlobalParams):
     enhanced_words = {}
     englified_words = {}
     for word in words:
-      initial_word = word
-      rapp_print ("Initial word: " + initial_word)
+      rapp_print ("Initial word: " + word)
       # transform capital _letters
-      for cap in self._capital_letters:
-        initial_word = initial_word.replace(cap, self._capital_letters[cap])
+      initial_word = self._capital_letters_transducer.transduce(word)
       rapp_print ("Caps to small: " + initial_word)
       # fix english version of _letters
-      eng_w = initial_word
-      for lit in self._literal_letters:
-        eng_w = eng_w.replace(lit, self._literal_letters[lit])
+      eng_w = self._literal_letters_transducer.transduce(initial_word)
       englified_words[eng_w] = word
       rapp_print ("Englified: " + eng_w)
-      # check _phonemes
-      for ph in self._phonemes:
-        initial_word = initial_word.replace(ph, self._phonemes[ph])
-      rapp_print ("Phonemes: " + initial_word)
-      # check special two digit letters
-      for stdl in self._all_special_two_digit_letters:
-        initial_word = initial_word.replace(stdl, \
-            self._all_special_two_digit_letters[stdl])
-      rapp_print ("Special 2 digit letters: " + initial_word)
-      # check two-digit letters
-      for let in self._two_digit_letters:
-        initial_word = initial_word.replace(let, self._two_digit_letters[let])
-      rapp_print ("2 digit letters: " + initial_word)
-      # check specific rules
-      for sr in self._s_specific_rules:
-        initial_word = initial_word.replace(sr, self._s_specific_rules[sr])
-      rapp_print ("specific rules: " + initial_word)
-      # check the rest of the letters
-      for l in self._letters:
-        initial_word = initial_word.replace(l, self._letters[l])
-      rapp_print ("rest of letters: " + initial_word)
-
-      enhanced_words[eng_w] = []
-      temp = initial_word.split(' ')
-      if len(temp) > 0:
-        temp = temp[:-1]
+      # transform the letters to phonemes, unless cached
+      temp = None
+      if self._pronunciation_cache is not None:
+        temp = self._pronunciation_cache.get(initial_word)
+      if temp is None:
+        phonemes = self._phonemes_transducer.transduce(initial_word)
+        rapp_print ("Phonemes: " + phonemes)
+        temp = phonemes.split(' ')
+        if len(temp) > 0:
+          temp = temp[:-1]
+        if self._pronunciation_cache is not None:
+          self._pronunciation_cache.put(initial_word, temp)
+
       enhanced_words[eng_w] = temp
 
     return [enhanced_words, englified_words]
@@ -346,12 +423,9 @@ class GreekSupport(GlobalParams):
   def _englify_words(self, words):
     englified_words = []
     for word in words:
-      eng_w = word
       # First transform the Capitals
-      for cap in self._capital_letters:
-        eng_w = eng_w.replace(cap, self._capital_letters[cap])
-      for lit in self._literal_letters:
-        eng_w = eng_w.replace(lit, self._literal_letters[lit])
+      eng_w = self._capital_letters_transducer.transduce(word)
+      eng_w = self._literal_letters_transducer.transduce(eng_w)
       englified_words.append(eng_w)
     return englified_words
 
@@ -446,7 +520,7 @@ class GreekSupport(GlobalParams):
     try:
         limited_sphinx_configuration = \
             self._vocabulary.createConfigurationFiles( \
-              final_phoneme_dict, final_grammar, final_sentences
+              final_phoneme_dict, final_grammar, final_sentences, 'el'
             )
     except RappError as e:
         raise RappError(e.value)
@@ -458,3 +532,15 @@ class GreekSupport(GlobalParams):
   # @return #_generic_sphinx_configuration [dictionary] The Generic Greek configuration
   def getGenericConfiguration(self):
     return self._generic_sphinx_configuration
+
+  ## Returns the version stamp of the produced phonemes
+  #
+  # The stamp of the pronunciation cache, combined with the English one, since
+  # the English words are transformed by english_support.EnglishSupport.
+  #
+  # @return version [string] The version stamp, None if the English one is unavailable
+  def getPronunciationVersion(self):
+    english_version = self._english_support.getPronunciationVersion()
+    if english_version is None:
+      return None
+    return self._pronunciation_version + '; ' + english_version
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import math
+
+## @class LanguageModelBuilder
+# @brief Builds bigram ARPA language models in-process
+#
+# Intended for the limited vocabularies, where launching the CMU-Cambridge
+# toolkit and sphinx_lm_convert processes costs far more than the model
+# estimation itself. The bigram probabilities are estimated by absolute
+# discounting, backing off to the unigram probabilities. The ARPA model is
+# written with the '.lm' extension, which Sphinx4 loads directly (simple
+# n-gram model), thus no binary conversion is needed.
+class LanguageModelBuilder:
+
+  ## The absolute discount of the bigram counts. It is kept small, since the
+  # sentences of a limited vocabulary are nearly all the expected utterances
+  # and their bigrams are mostly singletons.
+  discount = 0.1
+  ## The log10 probability denoting zero (ARPA convention)
+  log_zero = -99.0
+
+  ## Reads the sentences of a sentences file
+  #
+  # Each line is of the form "<s> word1 word2 ... </s>"
+  #
+  # @param sentences_file [string] The sentences file path
+  #
+  # @return sentences [list::list::string] The sentences' tokens
+  def readSentences(self, sentences_file):
+    sentences = []
+    with open(sentences_file, 'r') as f:
+      for line in f:
+        tokens = line.split()
+        if len(tokens) == 0:
+          continue
+        if tokens[0] != '<s>':
+          tokens.insert(0, '<s>')
+        if tokens[-1] != '</s>':
+          tokens.append('</s>')
+        sentences.append(tokens)
+    return sentences
+
+  ## Builds an ARPA language model from a sentences file
+  #
+  # @param sentences_file      [string] The sentences file path
+  # @param language_model_file [string] The ARPA language model path
+  def buildLanguageModel(self, sentences_file, language_model_file):
+    [unigrams, bigrams] = self.estimate(self.readSentences(sentences_file))
+    self.writeArpa(unigrams, bigrams, language_model_file)
+
+  ## Estimates the bigram model of a set of sentences
+  #
+  # @param sentences [list::list::string] The sentences' tokens
+  #
+  # @return unigrams [dictionary] word -> [log10 probability, log10 back-off weight]
+  # @return bigrams  [dictionary] (word1, word2) -> log10 probability
+  def estimate(self, sentences):
+    unigram_counts = {}
+    bigram_counts = {}
+    for tokens in sentences:
+      for token in tokens:
+        unigram_counts[token] = unigram_counts.get(token, 0) + 1
+      for i in range(1, len(tokens)):
+        bigram = (tokens[i - 1], tokens[i])
+        bigram_counts[bigram] = bigram_counts.get(bigram, 0) + 1
+
+    # The sentence start is never predicted
+    total = sum([unigram_counts[w] for w in unigram_counts if w != '<s>'])
+    unigram_probabilities = {}
+    for word in unigram_counts:
+      if word != '<s>':
+        unigram_probabilities[word] = unigram_counts[word] * 1.0 / total
+
+    # The bigrams grouped by their history
+    followers = {}
+    for (history, word) in bigram_counts:
+      followers.setdefault(history, []).append(word)
+
+    unigrams = {}
+    bigrams = {}
+    for word in unigram_counts:
+      unigrams[word] = [self._log(unigram_probabilities.get(word, 0)), 0.0]
+
+    for history in followers:
+      history_count = sum([bigram_counts[(history, w)] \
+          for w in followers[history]])
+      unseen_mass = 1.0 - sum([unigram_probabilities[w] \
+          for w in followers[history]])
+      # If every word follows the history there is no mass to back off to
+      discount = self.discount
+      if unseen_mass <= 1e-9:
+        discount = 0.0
+      for word in followers[history]:
+        bigrams[(history, word)] = self._log( \
+            (bigram_counts[(history, word)] - discount) / history_count)
+      if discount > 0:
+        left_mass = discount * len(followers[history]) / history_count
+        unigrams[history][1] = self._log(left_mass / unseen_mass)
+
+    return [unigrams, bigrams]
+
+  ## Writes a model in the ARPA format
+  #
+  # @param unigrams            [dictionary] word -> [log10 probability, log10 back-off weight]
+  # @param bigrams             [dictionary] (word1, word2) -> log10 probability
+  # @param language_model_file [string] The ARPA language model path
+  def writeArpa(self, unigrams, bigrams, language_model_file):
+    with open(language_model_file, 'w') as f:
+      f.write('\\data\\\n')
+      f.write('ngram 1=' + str(len(unigrams)) + '\n')
+      f.write('ngram 2=' + str(len(bigrams)) + '\n')
+      f.write('\n\\1-grams:\n')
+      for word in sorted(unigrams):
+        [probability, backoff] = unigrams[word]
+        f.write('%.4f %s %.4f\n' % (probability, word, backoff))
+      f.write('\n\\2-grams:\n')
+      for bigram in sorted(bigrams):
+        f.write('%.4f %s %s\n' % (bigrams[bigram], bigram[0], bigram[1]))
+      f.write('\n\\end\\\n')
+
+  ## Computes the log10 of a probability
+  #
+  # @param probability [float] The probability
+  #
+  # @return log_probability [float] The log10 probability (#log_zero for 0)
+  def _log(self, probability):
+    if probability <= 0:
+      return self.log_zero
+    return math.log10(probability)
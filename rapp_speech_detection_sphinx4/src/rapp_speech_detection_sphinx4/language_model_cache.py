@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+
+## @class LanguageModelCache
+# @brief Persistent content-addressed cache of the limited vocabulary files
+#
+# Each entry is a directory containing the dictionary, grammar, sentences and
+# language model files created by
+# limited_vocabulary_creator.LimitedVocabularyCreator, named after the hash of
+# the canonical (language, words, grammar, sentences) configuration. Entries
+# are built in a staging directory and renamed when complete, thus a cached
+# directory is never partially written. The least recently used entries are
+# evicted if the cache size exceeds its cap, except for the pinned ones, i.e.
+# the entries a Sphinx subprocess is configured with
+# (see sphinx4_wrapper.Sphinx4Wrapper::configureSphinx).
+class LanguageModelCache:
+
+  ## The prefix of the staging directories
+  staging_prefix = 'staging_'
+  ## Staging directories older than this (seconds) are considered abandoned
+  staging_timeout = 3600
+
+  ## Constructor performing initializations
+  #
+  # @param directory [string] The cache directory
+  # @param max_size  [int] The cache size cap in bytes
+  def __init__(self, directory, max_size):
+    ## The cache directory
+    self._directory = directory
+    ## The cache size cap in bytes
+    self._max_size = max_size
+
+    ## Cache hits counter
+    self._hits = 0
+    ## Cache misses counter
+    self._misses = 0
+    ## Evictions counter
+    self._evictions = 0
+    ## The pinned entries: key -> number of pins
+    self._pins = {}
+    ## Protects the counters, the pins and the eviction
+    self._lock = threading.Lock()
+
+    if not os.path.isdir(self._directory):
+      os.makedirs(self._directory)
+    self._removeAbandonedStaging()
+
+  ## Creates the cache key of a limited vocabulary configuration
+  #
+  # The words are sorted and the phonemes are normalized as written in the
+  # dictionary, whereas the grammar and sentences order is preserved.
+  #
+  # @param language  [string] The language
+  # @param words     [dictionary] The words and their phonemes
+  # @param grammar   [list::string] The Sphinx grammar parameter
+  # @param sentences [list::string] The Sphinx sentences parameter
+  #
+  # @return key [string] The cache key
+  def createKey(self, language, words, grammar, sentences):
+    canonical_words = [[word, [phoneme.replace('-', '').replace('_', '') \
+        for phoneme in words[word]]] for word in sorted(words)]
+    canonical = json.dumps(\
+        [language, canonical_words, list(grammar), list(sentences)])
+    return hashlib.sha1(canonical).hexdigest()
+
+  ## Returns the directory of a cached entry
+  #
+  # @param key [string] The cache key
+  #
+  # @return directory [string] The entry directory, None if not cached
+  def get(self, key):
+    directory = self._entryDirectory(key)
+    if os.path.isdir(directory):
+      try:
+        os.utime(directory, None)
+      except OSError:
+        pass
+      with self._lock:
+        self._hits += 1
+      return directory
+    with self._lock:
+      self._misses += 1
+    return None
+
+  ## Creates a staging directory, where a new entry is built
+  #
+  # @return directory [string] The staging directory
+  def createStagingDirectory(self):
+    return tempfile.mkdtemp(prefix = self.staging_prefix, dir = self._directory)
+
+  ## Stores a built entry
+  #
+  # The staging directory is renamed to the entry directory. If the entry was
+  # concurrently stored the staging directory is discarded.
+  #
+  # @param key               [string] The cache key
+  # @param staging_directory [string] The directory containing the entry files
+  #
+  # @return directory [string] The entry directory
+  def put(self, key, staging_directory):
+    directory = self._entryDirectory(key)
+    try:
+      os.rename(staging_directory, directory)
+    except OSError:
+      shutil.rmtree(staging_directory, ignore_errors = True)
+    self._evict(key)
+    return directory
+
+  ## Pins an entry, thus it is not evicted until unpinned
+  #
+  # An entry may be pinned several times, remaining pinned until unpinned as
+  # many times.
+  #
+  # @param directory [string] The entry directory (see #get), other directories are ignored
+  def pin(self, directory):
+    key = self._entryKey(directory)
+    if key is None:
+      return
+    with self._lock:
+      self._pins[key] = self._pins.get(key, 0) + 1
+
+  ## Unpins an entry pinned by #pin
+  #
+  # @param directory [string] The entry directory (see #get), other directories are ignored
+  def unpin(self, directory):
+    key = self._entryKey(directory)
+    with self._lock:
+      if key not in self._pins:
+        return
+      self._pins[key] -= 1
+      if self._pins[key] == 0:
+        del self._pins[key]
+
+  ## Returns the cache statistics
+  #
+  # @return statistics [dictionary] Hits, misses, evictions, entries and size
+  def getStatistics(self):
+    entries = self._listEntries()
+    with self._lock:
+      return {
+          'hits': self._hits,
+          'misses': self._misses,
+          'evictions': self._evictions,
+          'entries': len(entries),
+          'size': sum([size for [mtime, key, size] in entries])
+          }
+
+  ## Evicts the least recently used entries until the size cap is respected
+  #
+  # The pinned entries are never evicted, thus they may exceed the cap.
+  #
+  # @param keep [string] The key of an entry never to be evicted
+  def _evict(self, keep):
+    with self._lock:
+      entries = sorted(self._listEntries())
+      size = sum([entry_size for [mtime, key, entry_size] in entries])
+      for [mtime, key, entry_size] in entries:
+        if size <= self._max_size:
+          break
+        if key == keep or key in self._pins:
+          continue
+        shutil.rmtree(self._entryDirectory(key), ignore_errors = True)
+        size -= entry_size
+        self._evictions += 1
+
+  ## Lists the cache entries
+  #
+  # @return entries [list] The [modification time, key, size] of each entry
+  def _listEntries(self):
+    entries = []
+    for key in os.listdir(self._directory):
+      if key.startswith(self.staging_prefix):
+        continue
+      directory = self._entryDirectory(key)
+      try:
+        size = sum([os.path.getsize(os.path.join(directory, f)) \
+            for f in os.listdir(directory)])
+        entries.append([os.path.getmtime(directory), key, size])
+      except OSError:
+        # Concurrently evicted
+        continue
+    return entries
+
+  ## Removes the staging directories of interrupted builds
+  def _removeAbandonedStaging(self):
+    for f in os.listdir(self._directory):
+      path = os.path.join(self._directory, f)
+      try:
+        if f.startswith(self.staging_prefix) and \
+            time.time() - os.path.getmtime(path) > self.staging_timeout:
+          shutil.rmtree(path, ignore_errors = True)
+      except OSError:
+        continue
+
+  ## Returns the directory of an entry
+  #
+  # @param key [string] The cache key
+  #
+  # @return directory [string] The entry directory
+  def _entryDirectory(self, key):
+    return os.path.join(self._directory, key)
+
+  ## Returns the key of an entry directory
+  #
+  # @param directory [string] The directory
+  #
+  # @return key [string] The cache key, None if not an entry directory
+  def _entryKey(self, directory):
+    [parent, key] = os.path.split(os.path.normpath(directory))
+    if parent != os.path.normpath(self._directory) or \
+        key.startswith(self.staging_prefix):
+      return None
+    return key
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+
+from global_parameters import GlobalParams
+
+## @class LanguagePacks
+# @brief Registry of the pre-built limited vocabulary language packs
+#
+# The vocabularies known at deploy time (e.g. the cognitive exercises'
+# answers) get their configuration files (dictionary, grammar, sentences and
+# language model) pre-built in a pack directory each, by
+# tools/build_language_packs.py. The packs are registered in the
+# "index.json" file of the packs directory, by the hash of the canonical
+# (language, words, grammar, sentences) request, thus a request of a known
+# vocabulary employs its pack directly.
+#
+# The canonical request ignores the order of the words, grammar and
+# sentences, as well as the duplicate words.
+#
+# Each pack records the pronunciation version stamp of the language support
+# that built it (e.g. greek_support.GreekSupport#getPronunciationVersion),
+# thus a pack built by other letter tables, transformation algorithm or
+# dictionary is ignored and the vocabulary is created at runtime.
+class LanguagePacks(GlobalParams):
+
+  ## The registry file name
+  index_file = 'index.json'
+
+  ## Performs initializations
+  #
+  # @param directory [string] The packs directory (global_parameters.GlobalParams#_language_packs_url if not given)
+  def __init__(self, directory = None):
+    GlobalParams.__init__(self)
+
+    ## The packs directory
+    self._directory = directory
+    if self._directory is None:
+      self._directory = self._language_packs_url
+
+    ## The registered packs: key -> {names, language, version, language_model, word_mapping}
+    self._packs = {}
+    try:
+      with open(os.path.join(self._directory, self.index_file), 'r') as f:
+        self._packs = json.load(f)
+    except (IOError, ValueError):
+      pass
+
+    ## The Sphinx configuration of the packs
+    self._sphinx_configuration = { \
+      'jar_path' : ".:" + self._sphinx_jar_files_url + \
+            "/" + self._sphinx_jar_file + ":" \
+            + self._sphinx_package_url + "/src", \
+      'configuration_path' : self._language_models_url + "/greekPack/default.config.xml", \
+      'acoustic_model' : self._acoustic_models_url, \
+      'grammar_name' : 'custom', \
+      'grammar_folder' : '', \
+      'dictionary' : '', \
+      'language_model' : '', \
+      'grammar_disabled' : True
+      }
+
+  ## Creates the registry key of a limited vocabulary request
+  #
+  # @param language  [string] The language
+  # @param words     [list::string] The set of words to be identified
+  # @param grammar   [list::string] The Sphinx grammar parameter
+  # @param sentences [list::string] The Sphinx sentences parameter
+  #
+  # @return key [string] The registry key
+  def createKey(self, language, words, grammar, sentences):
+    canonical = json.dumps( [language, sorted(set(words)), sorted(grammar), \
+        sorted(sentences)] )
+    return hashlib.sha1(canonical).hexdigest()
+
+  ## Returns the pack of a limited vocabulary request
+  #
+  # @param language  [string] The language
+  # @param words     [list::string] The set of words to be identified
+  # @param grammar   [list::string] The Sphinx grammar parameter
+  # @param sentences [list::string] The Sphinx sentences parameter
+  # @param version   [string] The current pronunciation version stamp of the language support
+  #
+  # @return conf         [dictionary] The pack's Sphinx configuration
+  # @return word_mapping [dictionary] The Sphinx word->requested word mapping
+  # @return None if the vocabulary has no pack of the current version
+  def get(self, language, words, grammar, sentences, version):
+    key = self.createKey(language, words, grammar, sentences)
+    if key not in self._packs or version is None:
+      return None
+    pack = self._packs[key]
+    if pack.get('version') != version:
+      return None
+    package = os.path.join(self._directory, key)
+    if not os.path.isdir(package):
+      return None
+
+    conf = dict(self._sphinx_configuration)
+    conf['grammar_folder'] = package
+    conf['dictionary'] = os.path.join(package, 'custom.dict')
+    conf['language_model'] = os.path.join(package, pack['language_model'])
+    conf['grammar_disabled'] = (len(grammar) == 0)
+
+    word_mapping = {}
+    for word in pack['word_mapping']:
+      word_mapping[word.encode('utf-8')] = \
+          pack['word_mapping'][word].encode('utf-8')
+    return [conf, word_mapping]
+
+  ## Returns the number of registered packs
+  #
+  # @return size [int] The number of packs
+  def getSize(self):
+    return len(self._packs)
+
+  ## Registers a pack, copying its configuration files
+  #
+  # A pack may be registered by several vocabulary names. The registry file is
+  # saved by #save.
+  #
+  # @param name          [string] A descriptive name of the vocabulary
+  # @param language      [string] The language
+  # @param words         [list::string] The set of words to be identified
+  # @param grammar       [list::string] The Sphinx grammar parameter
+  # @param sentences     [list::string] The Sphinx sentences parameter
+  # @param configuration [dictionary] The Sphinx configuration of the created files (see limited_vocabulary_creator.LimitedVocabularyCreator::createConfigurationFiles)
+  # @param word_mapping  [dictionary] The Sphinx word->requested word mapping (UTF-8 strings)
+  # @param version       [string] The pronunciation version stamp of the language support that created the files
+  #
+  # @return key [string] The registry key
+  def add(self, name, language, words, grammar, sentences, configuration, \
+      word_mapping, version):
+    key = self.createKey(language, words, grammar, sentences)
+    package = os.path.join(self._directory, key)
+    if os.path.isdir(package):
+      shutil.rmtree(package)
+    os.makedirs(package)
+    for f in ['custom.dict', 'custom.gram', 'sentences.txt']:
+      shutil.copy(os.path.join(configuration['grammar_folder'], f), package)
+    shutil.copy(configuration['language_model'], package)
+
+    # Kept decoded, as loaded from the registry file
+    decoded_word_mapping = {}
+    for word in word_mapping:
+      decoded_word_mapping[word.decode('utf-8')] = \
+          word_mapping[word].decode('utf-8')
+
+    names = []
+    if key in self._packs:
+      names = self._packs[key]['names']
+    if name not in names:
+      names.append(name)
+    self._packs[key] = {
+        'names': names,
+        'language': language,
+        'version': version,
+        'language_model': os.path.basename(configuration['language_model']),
+        'word_mapping': decoded_word_mapping
+        }
+    return key
+
+  ## Saves the registry file
+  #
+  # The file is written in a temporary file and renamed, thus it is never
+  # partially written.
+  def save(self):
+    if not os.path.isdir(self._directory):
+      os.makedirs(self._directory)
+    [fd, tmp_file] = tempfile.mkstemp(dir = self._directory)
+    with os.fdopen(fd, 'w') as f:
+      json.dump(self._packs, f, indent = 2, sort_keys = True, \
+          separators = (',', ': '))
+      f.write('\n')
+    os.chmod(tmp_file, 0644)
+    os.rename(tmp_file, os.path.join(self._directory, self.index_file))
@@ -27,6 +27,9 @@ import os
 
 from global_parameters import GlobalParams
 from rapp_exceptions import RappError
+from language_model_cache import LanguageModelCache
+from language_model_builder import LanguageModelBuilder
+from shared_resources import SharedResources
 
 from rapp_tools import *
 
@@ -43,10 +46,27 @@ class LimitedVocabularyCreator(GlobalParams):
           self._tmp_language_models_url )
       os.makedirs(self._tmp_language_models_url)
 
-    self.languages_package = tempfile.mkdtemp( prefix='tmp_language_pack_', dir = self._tmp_language_models_url )
+    ## The temporary directory of the configuration files
+    #
+    # Created on the first configuration (see #_getLanguagesPackage), thus
+    # the instances never configuring a limited vocabulary create none.
+    self.languages_package = None
 
-    atexit.register(shutil.rmtree, self.languages_package)
+    ## The language model cache (None if disabled)
+    #
+    # Instantiates language_model_cache.LanguageModelCache, shared by all the
+    # instances (see shared_resources.SharedResources)
+    self._language_model_cache = None
+    if self._language_model_cache_size > 0:
+      self._language_model_cache = SharedResources.get( \
+          ('language_model_cache', self._language_model_cache_url), \
+          lambda: LanguageModelCache( self._language_model_cache_url, \
+            self._language_model_cache_size ) )
 
+    ## The in-process language model builder
+    #
+    # Instantiates language_model_builder.LanguageModelBuilder
+    self._language_model_builder = LanguageModelBuilder()
 
     self.sphinx_configuration = { \
       'jar_path' : ".:" + self._sphinx_jar_files_url + \
@@ -71,23 +91,124 @@ class LimitedVocabularyCreator(GlobalParams):
   #           ...
   #         }
   #
+  # If the language model cache is enabled and the configuration was
+  # previously created, the cached files are employed instead.
+  #
   # @param words      [list::string] The set of words to be identified
   # @param grammar    [list::string] The Sphinx grammar parameter
   # @param sentences  [list::string] The Sphinx sentences parameter
+  # @param language   [string] The language (part of the cache key)
   #
   # @return conf   [dictionary] The final configuration
   # @return status [string] Either the error (string) or True (bool)
-  def createConfigurationFiles(self, words, grammar, sentences):
-    tmp_configuration = self.sphinx_configuration
+  def createConfigurationFiles(self, words, grammar, sentences, language = ''):
+    # A new configuration per call, thus the callers never share it
+    tmp_configuration = dict(self.sphinx_configuration)
 
     rapp_print( "Creating configuration files with parameters:" )
     rapp_print( "Words: " + str(words) )
     rapp_print( "Sentences: " + str(sentences) )
     rapp_print( "Grammar: " + str(grammar) )
+
+    # Check grammar: All words must exist in words
+    for gram in grammar:
+      gram_words = gram.split(" ")
+      for gw in gram_words:
+          if gw not in words and gram not in words:
+              raise RappError('Word ' + gw + ' is not in words but\
+                      exists in grammar')
+
+    # Check sentences: All words must exist in words
+    for sent in sentences:
+      sent_words = sent.split(" ")
+      for sw in sent_words:
+          if sw not in words and sent not in words:
+              raise RappError('Word ' + sw + ' is not in words but\
+                    exists in a sentence')
+
+    if len(grammar) == 0:
+      tmp_configuration['grammar_disabled'] = True
+    else:
+      tmp_configuration['grammar_disabled'] = False
+    tmp_configuration['grammar_name'] = 'custom'
+
+    package = None
+    if self._language_model_cache is not None:
+      key = self._language_model_cache.createKey( \
+          language, words, grammar, sentences )
+      package = self._language_model_cache.get(key)
+      if package is not None:
+        rapp_print( "Sphinx: Employing cached language model files" )
+
+    if package is None:
+      package = self._getLanguagesPackage()
+      self._writeConfigurationFiles(package, words, grammar, sentences)
+      # Failed builds are not cached
+      if self._language_model_cache is not None and \
+          self._languageModelFile(package) is not None:
+        staging = self._language_model_cache.createStagingDirectory()
+        for f in os.listdir(package):
+          shutil.copy(os.path.join(package, f), staging)
+        package = self._language_model_cache.put(key, staging)
+
+    tmp_configuration['dictionary'] = os.path.join( package, 'custom.dict' )
+    tmp_configuration['grammar_folder'] = package
+    language_model = self._languageModelFile(package)
+    if language_model is None:
+      language_model = os.path.join( package, "sentences.lm.bin" )
+    tmp_configuration['language_model'] = language_model
+
+    return tmp_configuration
+
+  ## Returns the temporary directory of the configuration files
+  #
+  # The directory is created on the first call and removed at exit.
+  #
+  # @return languages_package [string] The directory path
+  def _getLanguagesPackage(self):
+    if self.languages_package is None:
+      self.languages_package = tempfile.mkdtemp( \
+          prefix='tmp_language_pack_', dir = self._tmp_language_models_url )
+      atexit.register(shutil.rmtree, self.languages_package, True)
+    return self.languages_package
+
+  ## Returns the language model cache statistics
+  #
+  # The cache is shared by all the instances, thus so are its statistics.
+  #
+  # @return statistics [dictionary] The statistics (see language_model_cache.LanguageModelCache::getStatistics), empty if the cache is disabled
+  def getCacheStatistics(self):
+    if self._language_model_cache is None:
+      return {}
+    return self._language_model_cache.getStatistics()
+
+  ## Returns the language model file of a configuration directory
+  #
+  # The in-process builder creates the ARPA model 'sentences.lm', whereas the
+  # toolkit creates the binary model 'sentences.lm.bin'.
+  #
+  # @param package [string] The configuration directory
+  #
+  # @return language_model [string] The language model path, None if missing
+  def _languageModelFile(self, package):
+    for name in ['sentences.lm', 'sentences.lm.bin']:
+      language_model = os.path.join( package, name )
+      if os.path.isfile(language_model):
+        return language_model
+    return None
+
+  ## Writes the configuration files and creates the language model
+  #
+  # Vocabularies up to GlobalParams::_language_model_builder_max_words words
+  # get their language model built in-process, larger ones via the toolkit.
+  #
+  # @param package    [string] The directory to write the files
+  # @param words      [list::string] The set of words to be identified
+  # @param grammar    [list::string] The Sphinx grammar parameter
+  # @param sentences  [list::string] The Sphinx sentences parameter
+  def _writeConfigurationFiles(self, package, words, grammar, sentences):
     # Create custom dictionary file
-    tmp_configuration['dictionary'] = os.path.join( self.languages_package, \
-        'custom.dict' )
-    custom_dict = open(tmp_configuration['dictionary'], 'w')
+    custom_dict = open(os.path.join( package, 'custom.dict' ), 'w')
     for word in words:
       tmp_line = word
       for phoneme in words[word]:
@@ -95,69 +216,51 @@ class LimitedVocabularyCreator(GlobalParams):
       custom_dict.write(tmp_line + '\n')
     custom_dict.close()
 
-    # Check grammar
-    if len(grammar) == 0:
-      tmp_configuration['grammar_disabled'] = True
-    else:
-      tmp_configuration['grammar_disabled'] = False
-    tmp_configuration['grammar_name'] = 'custom'
-    tmp_configuration['grammar_folder'] = self.languages_package
-    custom_grammar = open(os.path.join( tmp_configuration['grammar_folder'], \
-        tmp_configuration['grammar_name']) + '.gram', 'w')
+    # Create grammar file
+    custom_grammar = open(os.path.join( package, 'custom.gram' ), 'w')
     custom_grammar.write('#JSGF V1.0;\n')
-    custom_grammar.write("grammar " + tmp_configuration['grammar_name'] + ';\n')
+    custom_grammar.write("grammar custom;\n")
     counter = 1
-    #custom_grammar.write("public <cmd1>=(")
-    for i in range(0, len(grammar)):
-      gram = grammar[i]
-      # check is all words in grammar exist in words
-      gram_words = gram.split(" ")
-      for gw in gram_words:
-          if gw not in words and gram not in words:
-              raise RappError('Word ' + gw + ' is not in words but\
-                      exists in grammar')
-
+    for gram in grammar:
       custom_grammar.write("public <cmd" + str(counter) + ">=" + "\"" + gram + "\";\n")
-      #custom_grammar.write("\"" + gram + "\"")
-      #if i == len(grammar) - 1:
-          #custom_grammar.write(");")
-      #else:
-          #custom_grammar.write(" | ")
       counter += 1
     custom_grammar.close()
 
     # Fix sentences / language model
-    # Check sentences: All words must exist in sentences
-    # Continue with the sentences setup
-    tmp_configuration['language_model'] = os.path.join( self.languages_package, \
-      "sentences.lm.bin" )
-    custom_sentences = open(self.languages_package + '/sentences.txt', 'w')
+    custom_sentences = open(os.path.join( package, 'sentences.txt' ), 'w')
     if len(sentences) != 0:
       for sent in sentences:
-        # Split sentence
-        sent_words = sent.split(" ")
-        for sw in sent_words:
-            if sw not in words and sent not in words:
-                raise RappError('Word ' + sw + ' is not in words but\
-                      exists in a sentence')
-
         custom_sentences.write("<s> " + sent + " </s>\n")
     else:
       for word in words:
         custom_sentences.write("<s> " + word + " </s>\n")
     custom_sentences.close()
 
-    # Run script to fix the language model
+    # The previous language models are removed, so that a failed build is not
+    # mistaken for a successful one
     rapp_print( "Sphinx: Creating language model files\n" )
+    for name in ['sentences.lm', 'sentences.lm.bin']:
+      language_model = os.path.join( package, name )
+      if os.path.isfile(language_model):
+        os.remove(language_model)
+
+    if len(words) <= self._language_model_builder_max_words:
+      try:
+        self._language_model_builder.buildLanguageModel( \
+            os.path.join( package, 'sentences.txt' ), \
+            os.path.join( package, 'sentences.lm' ) )
+      except (IOError, OSError) as e:
+        rapp_print( "Sphinx: Language model build failed: " + str(e) )
+      return
+
+    # Run script to fix the language model
     if self._allow_sphinx_output == True:
         bash_file = self._language_models_url + "/greekPack/run.sh"
-        bash_command = "cp " + bash_file + " " + self.languages_package + \
-            " && cd " + self.languages_package + " && bash run.sh"
+        bash_command = "cp " + bash_file + " " + package + \
+            " && cd " + package + " && bash run.sh"
     else:
         bash_file = self._language_models_url + "/greekPack/run_silent.sh"
-        bash_command = "cp " + bash_file + " " + self.languages_package + \
-            " && cd " + self.languages_package + " && bash run_silent.sh"
+        bash_command = "cp " + bash_file + " " + package + \
+            " && cd " + package + " && bash run_silent.sh"
 
     os.system(bash_command)
-
-    return tmp_configuration
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import os
+import tempfile
+import threading
+
+## @class PronunciationCache
+# @brief Persistent word->phonemes cache
+#
+# The entries are kept in memory and appended to a text file, one
+# "word<TAB>phoneme phoneme ...<LF>" line per word, thus they survive
+# restarts. The first line of the file is the version stamp of the rules
+# producing the phonemes: a file of another version (i.e. created by other
+# rules) is discarded on loading. Incomplete lines (e.g. of an interrupted
+# write) are ignored.
+#
+# The lines of the words cached anew supersede the older ones, thus the file
+# is compacted on loading, when containing superseded lines or more words than
+# the cap, keeping the most recently cached words.
+class PronunciationCache:
+
+  ## Constructor performing initializations
+  #
+  # @param cache_file  [string] The cache file
+  # @param version     [string] The version stamp of the rules
+  # @param max_entries [int] The cap of the loaded words (0 disables the cap)
+  def __init__(self, cache_file, version, max_entries = 0):
+    ## The cache file
+    self._cache_file = cache_file
+    ## The version stamp of the rules
+    self._version = version
+    ## The cap of the loaded words
+    self._max_entries = max_entries
+    ## The word->phonemes entries
+    self._entries = {}
+
+    ## Cache hits counter
+    self._hits = 0
+    ## Cache misses counter
+    self._misses = 0
+    ## Protects the entries, the counters and the cache file
+    self._lock = threading.Lock()
+
+    directory = os.path.dirname(self._cache_file)
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+    [valid, words] = self._load()
+    if not valid:
+      self._rewrite(words)
+
+  ## Returns the phonemes of a word
+  #
+  # @param word [string] The word
+  #
+  # @return phonemes [list::string] The word phonemes, None if not cached
+  def get(self, word):
+    with self._lock:
+      phonemes = self._entries.get(word)
+      if phonemes is None:
+        self._misses += 1
+        return None
+      self._hits += 1
+      return list(phonemes)
+
+  ## Stores the phonemes of a word
+  #
+  # The words containing line or field separators are not cached.
+  #
+  # @param word     [string] The word
+  # @param phonemes [list::string] The word phonemes
+  def put(self, word, phonemes):
+    if '\t' in word or '\n' in word:
+      return
+    with self._lock:
+      if self._entries.get(word) == phonemes:
+        return
+      self._entries[word] = list(phonemes)
+      try:
+        with open(self._cache_file, 'a') as f:
+          f.write(self._formatEntry(word, phonemes))
+      except IOError:
+        pass
+
+  ## Returns the cache statistics
+  #
+  # @return statistics [dictionary] Hits, misses and entries
+  def getStatistics(self):
+    with self._lock:
+      return {
+          'hits': self._hits,
+          'misses': self._misses,
+          'entries': len(self._entries)
+          }
+
+  ## Loads the entries of the cache file
+  #
+  # Only the most recently cached words are loaded if they exceed the cap.
+  #
+  # @return valid [bool] True if the cache file is of the current version, complete and compact
+  # @return words [list::string] The loaded words, least recently cached first
+  def _load(self):
+    try:
+      with open(self._cache_file, 'r') as f:
+        lines = f.read().split('\n')
+    except IOError:
+      return [False, []]
+    if len(lines) < 2 or lines[0] != self._version:
+      return [False, []]
+    # The file ends with a line feed, thus the last line is empty unless
+    # incomplete
+    positions = {}
+    for i in range(1, len(lines) - 1):
+      fields = lines[i].split('\t')
+      if len(fields) == 2:
+        self._entries[fields[0]] = fields[1].split()
+        positions[fields[0]] = i
+    words = sorted(positions, key = positions.get)
+    if self._max_entries > 0 and len(words) > self._max_entries:
+      for word in words[:-self._max_entries]:
+        del self._entries[word]
+      words = words[-self._max_entries:]
+    valid = lines[-1] == '' and len(lines) - 2 == len(positions) and \
+        len(words) == len(positions)
+    return [valid, words]
+
+  ## Rewrites the cache file with the version stamp and the loaded entries
+  #
+  # The file is written in a temporary file and renamed, thus it is never
+  # partially written.
+  #
+  # @param words [list::string] The loaded words, in the order to be written
+  def _rewrite(self, words):
+    directory = os.path.dirname(self._cache_file)
+    [fd, tmp_file] = tempfile.mkstemp(dir = directory)
+    with os.fdopen(fd, 'w') as f:
+      f.write(self._version + '\n')
+      for word in words:
+        f.write(self._formatEntry(word, self._entries[word]))
+    os.rename(tmp_file, self._cache_file)
+
+  ## Formats a cache file entry line
+  #
+  # @param word     [string] The word
+  # @param phonemes [list::string] The word phonemes
+  #
+  # @return line [string] The entry line
+  def _formatEntry(self, word, phonemes):
+    return word + '\t' + ' '.join(phonemes) + '\n'
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Aris Thallas
+# contact: aris.thallas@{iti.gr, gmail.com}
+import time
+import uuid
+import threading
+import collections
+
+## @class RecognitionJobs
+# @brief Asynchronous speech recognition jobs
+#
+# Requests are submitted as jobs, identified by a job ID, and processed in
+# submission order by a number of dispatcher threads, each one performing
+# a (blocking) recognition, e.g. via the worker_pool.WorkerPool. The job
+# status (queued, running, done or failed), the queue position, the partial
+# words (the utterances recognized so far, while running) and the final
+# result are available until the result expires.
+class RecognitionJobs:
+
+  ## Constructor performing initializations
+  #
+  # @param recognize   [function] Performs a recognition (job ID, request, partial callback), returning the response (words, error). The partial callback is called with the words of each recognized utterance.
+  # @param dispatchers [int] The number of concurrent recognitions
+  # @param result_ttl  [float] The time the finished jobs are kept (seconds)
+  def __init__(self, recognize, dispatchers, result_ttl):
+    ## Performs a recognition
+    self._recognize = recognize
+    ## The time the finished jobs are kept (seconds)
+    self._result_ttl = result_ttl
+
+    ## The jobs, by job ID
+    self._jobs = {}
+    ## The queued job IDs, in submission order
+    self._queue = collections.deque()
+    ## Protects the jobs and the queue, notified on submissions
+    self._condition = threading.Condition()
+    ## Signals the dispatcher threads to stop
+    self._stopped = False
+
+    ## The dispatcher threads
+    self._dispatchers = []
+    for i in range(max(1, dispatchers)):
+      thread = threading.Thread(target = self._dispatch)
+      thread.daemon = True
+      thread.start()
+      self._dispatchers.append(thread)
+
+  ## Submits a recognition job
+  #
+  # @param request [object] The recognition request
+  #
+  # @return job_id [string] The job ID
+  def submit(self, request):
+    job_id = uuid.uuid4().hex
+    with self._condition:
+      self._expire()
+      self._jobs[job_id] = { \
+          'status': 'queued', \
+          'request': request, \
+          'words': [], \
+          'error': '', \
+          'finished': None \
+          }
+      self._queue.append(job_id)
+      self._condition.notify()
+    return job_id
+
+  ## Returns the status of a job
+  #
+  # @param job_id [string] The job ID
+  #
+  # @return job [dictionary] The status (queued, running, done or failed), the queue position (0 if not queued), the words (partial while running) and the error, None if the job is unknown or expired
+  def getJob(self, job_id):
+    with self._condition:
+      self._expire()
+      if job_id not in self._jobs:
+        return None
+      job = self._jobs[job_id]
+      position = 0
+      if job['status'] == 'queued':
+        position = list(self._queue).index(job_id) + 1
+      return { \
+          'status': job['status'], \
+          'position': position, \
+          'words': list(job['words']), \
+          'error': job['error'] \
+          }
+
+  ## Returns the jobs statistics
+  #
+  # @return statistics [dictionary] The number of queued, running and finished jobs
+  def getStatistics(self):
+    with self._condition:
+      statuses = [job['status'] for job in self._jobs.values()]
+    return { \
+        'queued': statuses.count('queued'), \
+        'running': statuses.count('running'), \
+        'finished': statuses.count('done') + statuses.count('failed') \
+        }
+
+  ## Stops the dispatcher threads
+  #
+  # The running recognitions are completed, the queued jobs are dropped.
+  def shutdown(self):
+    with self._condition:
+      self._stopped = True
+      self._condition.notifyAll()
+
+  ## Dispatcher thread, performing the queued jobs
+  def _dispatch(self):
+    while True:
+      with self._condition:
+        while len(self._queue) == 0 and not self._stopped:
+          self._condition.wait()
+        if self._stopped:
+          return
+        job_id = self._queue.popleft()
+        job = self._jobs[job_id]
+        job['status'] = 'running'
+        request = job['request']
+
+      def partial(words, job = job):
+        with self._condition:
+          job['words'].extend(words)
+
+      try:
+        response = self._recognize(job_id, request, partial)
+        words = list(response.words)
+        error = response.error
+      except Exception as e:
+        words = []
+        error = 'Recognition failed: ' + str(e)
+
+      with self._condition:
+        job['words'] = words
+        job['error'] = error
+        job['status'] = 'failed' if error != '' else 'done'
+        job['request'] = None
+        job['finished'] = time.time()
+
+  ## Removes the finished jobs older than the result TTL
+  #
+  # The condition must be held.
+  def _expire(self):
+    now = time.time()
+    for job_id in [job_id for [job_id, job] in self._jobs.items() \
+        if job['finished'] is not None and \
+        now - job['finished'] > self._result_ttl]:
+      del self._jobs[job_id]
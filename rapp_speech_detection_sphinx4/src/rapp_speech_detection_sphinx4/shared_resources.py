@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import threading
+
+## @class SharedResources
+# @brief Process-wide registry of the read-only resources of the Sphinx workers
+#
+# The resources every worker needs but never modifies (the ROS package paths,
+# the dictionary indexes, the Greek letter tables etc.) are created once per
+# process, on first request, and shared by all the workers, thus the worker
+# startup time and memory do not grow with the number of workers.
+class SharedResources:
+
+  ## The resources, by key
+  _resources = {}
+  ## Protects the resources (reentrant, as a factory may request resources)
+  _lock = threading.RLock()
+
+  ## Returns a shared resource, creating it on first request
+  #
+  # A factory raising an exception creates no resource, thus it is retried on
+  # the next request.
+  #
+  # @param key     [hashable] The resource key
+  # @param factory [function] Creates the resource
+  #
+  # @return resource [object] The shared resource
+  @classmethod
+  def get(cls, key, factory):
+    with cls._lock:
+      if key not in cls._resources:
+        cls._resources[key] = factory()
+      return cls._resources[key]
+
+  ## Removes all the shared resources
+  #
+  # The workers already holding a resource keep it.
+  @classmethod
+  def clear(cls):
+    with cls._lock:
+      cls._resources = {}
@@ -30,6 +30,8 @@ from rapp_tools import *
 from sphinx4_configuration_params import *
 
 from global_parameters import GlobalParams
+from shared_resources import SharedResources
+from language_packs import LanguagePacks
 
 from rapp_platform_ros_communications.srv import (
   SpeechRecognitionSphinx4Srv,
@@ -71,14 +73,20 @@ class SpeechRecognitionSphinx4(GlobalParams):
     #
     # (see sphinx4_wrapper.Sphinx4Wrapper)
     self._sphinx4 = Sphinx4Wrapper()
-    ## Greek_support creates necessary files for Greek speech recognition
-    #
-    # (see greek_support.GreekSupport)
-    self._greek_support = GreekSupport()
     ## English creates necessary files for english speech recognition
     #
     # (see english_support.EnglishSupport)
     self._english_support = EnglishSupport()
+    ## Greek_support creates necessary files for Greek speech recognition
+    #
+    # Employs the English support for the English words.
+    # (see greek_support.GreekSupport)
+    self._greek_support = GreekSupport(self._english_support)
+    ## The pre-built language packs of the known vocabularies, shared by all
+    # the instances
+    #
+    # (see language_packs.LanguagePacks)
+    self._language_packs = SharedResources.get('language_packs', LanguagePacks)
     ## The Sphinx configuration parameters
     #
     # (see sphinx4_configuration_params.SphinxConfigurationParams)
@@ -124,9 +132,10 @@ class SpeechRecognitionSphinx4(GlobalParams):
 
   ## Performs Sphinx4 configuration and speech recognition
   #
-  # @param req  [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4TotalSrvRequest] The speech recognition request
+  # @param req              [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4TotalSrvRequest] The speech recognition request
+  # @param partial_callback [function] Called with the (mapped) words of each utterance as soon as it is recognized (optional)
   # @return res [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4TotalSrvResponse] The speech recognition response
-  def speechRecognitionBatch(self, req):
+  def speechRecognitionBatch(self, req, partial_callback = None):
 
     total_res = SpeechRecognitionSphinx4TotalSrvResponse()
 
@@ -160,18 +169,41 @@ class SpeechRecognitionSphinx4(GlobalParams):
     spee_req.path = req.path
     spee_req.audio_source = req.audio_source
     spee_req.user = req.user
-    spee_res = self._speechRecognition(spee_req)
+    spee_res = self._speechRecognition(spee_req, partial_callback)
     total_res.words = spee_res.words
     total_res.error = spee_res.error
     return total_res
 
+  ## Performs Sphinx4 configuration only, e.g. to pre-warm an idle instance
+  #
+  # @param req [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4TotalSrvRequest] The speech recognition request whose configuration is employed
+  #
+  # @return error [string] The configuration error, empty on success
+  def configureSpeechRecognition(self, req):
+    conf_req = SpeechRecognitionSphinx4ConfigureSrvRequest()
+    conf_req.language = req.language
+    conf_req.words = req.words
+    conf_req.grammar = req.grammar
+    conf_req.sentences = req.sentences
+    return self._configureSpeechRecognition(conf_req).error
+
+  ## Terminates the Sphinx4 subprocess
+  def shutdown(self):
+    self._sphinx4.shutdownSphinx()
+
   ## Performs Sphinx4 speech recognition
   #
-  # @param req  [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4SrvRequest] The speech recognition request
+  # @param req              [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4SrvRequest] The speech recognition request
+  # @param partial_callback [function] Called with the (mapped) words of each utterance as soon as it is recognized (optional)
   # @return res [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4SrvResponse] The speech recognition response
-  def _speechRecognition(self, req):
+  def _speechRecognition(self, req, partial_callback = None):
     res = SpeechRecognitionSphinx4SrvResponse()
-    words = self._sphinx4.performSpeechRecognition(req.path, req.audio_source, req.user)
+    sphinx_callback = None
+    if partial_callback is not None:
+      sphinx_callback = \
+          lambda words: partial_callback( self._mapWords( words ) )
+    words = self._sphinx4.performSpeechRecognition(req.path, req.audio_source, \
+        req.user, sphinx_callback)
     rapp_print (words)
     # Error handling - Must be implemented with exceptions
     if len(words) == 1 and "Error:" in words[0]:
@@ -179,16 +211,27 @@ class SpeechRecognitionSphinx4(GlobalParams):
       res.words = []
       return res
 
+    res.words = self._mapWords( words )
+    return res;
+
+  ## Maps the Sphinx4 result words to the requested words
+  #
+  # The non English words are recognized in their English characters form.
+  #
+  # @param words [list::string] The Sphinx4 result words
+  #
+  # @return mapped_words [list::string] The requested words
+  def _mapWords(self, words):
+    mapped_words = []
     for word in words:
       if self._configuration_params._language != "en":
         rapp_print ("Word: #" + word + "#")
         if word == "" or word == '<unk>':
           continue
-        res.words.append(self._word_mapping[word])
+        mapped_words.append(self._word_mapping[word])
       else:
-        res.words.append(word.replace("'"," "))
-
-    return res;
+        mapped_words.append(word.replace("'"," "))
+    return mapped_words
 
   ## Performs Sphinx4 configuration
   #
@@ -216,6 +259,23 @@ class SpeechRecognitionSphinx4(GlobalParams):
     if reconfigure == False:
       return res
 
+    # Known vocabularies employ their pre-built language pack, if built by
+    # the current language support
+    supports = {'en': self._english_support, 'el': self._greek_support}
+    if len(self._configuration_params._words) != 0 and \
+        self._configuration_params._language in supports:
+      pack = self._language_packs.get(self._configuration_params._language, \
+          self._configuration_params._words, \
+          self._configuration_params._grammar, \
+          self._configuration_params._sentences, \
+          supports[self._configuration_params._language].\
+            getPronunciationVersion())
+      if pack is not None:
+        rapp_print ("Pre-built language pack used")
+        [conf, self._word_mapping] = pack
+        self._sphinx4.configureSphinx(conf)
+        return res
+
     # English language
     if self._configuration_params._language == 'en':
       rapp_print ("Language set to English")
@@ -22,14 +22,23 @@ import rospy
 import sys
 import time
 import hashlib
-import threading
 
 from speech_recognition_sphinx4 import *
+from worker_pool import WorkerPool
+from recognition_jobs import RecognitionJobs
 
 
 from rapp_platform_ros_communications.srv import (
   SpeechRecognitionSphinx4TotalSrv,
-  SpeechRecognitionSphinx4TotalSrvResponse
+  SpeechRecognitionSphinx4TotalSrvResponse,
+  SpeechRecognitionSphinx4SubmitSrv,
+  SpeechRecognitionSphinx4SubmitSrvResponse,
+  SpeechRecognitionSphinx4JobSrv,
+  SpeechRecognitionSphinx4JobSrvResponse
+  )
+
+from rapp_platform_ros_communications.msg import (
+  SpeechRecognitionSphinx4PartialMsg
   )
 
 ## @class SpeechRecognitionSphinx4HandlerNode
@@ -39,28 +48,40 @@ from rapp_platform_ros_communications.srv import (
 # Sphinx4
 # (rapp_speech_detection_sphinx4.speech_recognition_sphinx4.SpeechRecognitionSphinx4).
 # Provides ros services and handles the requests according to the child
-# processes' status.
+# processes' status and configuration. The number of child processes scales
+# with the load (see worker_pool.WorkerPool). Besides the blocking batch
+# service, recognitions may be submitted as asynchronous jobs and polled by
+# their job ID (see recognition_jobs.RecognitionJobs). The words of each
+# utterance are published as soon as they are recognized, while decoding
+# continues.
 class SpeechRecognitionSphinx4HandlerNode():
 
   ## @brief Initializes the subprocesses and the services (constructor)
   def __init__(self):
 
-    ## The number of child subprocesses.
+    ## The minimum number of child subprocesses.
     self._threads = \
         rospy.get_param("rapp_speech_detection_sphinx4_threads")
-
-    ## The subprocesses structure that contains information used for the
-    # subprocess handling
-    self._availableProcesses = [{
-      'sphinx': SpeechRecognitionSphinx4(), \
-      'running': False, \
-      'configuration_hash': 0\
-      } for i in range(self._threads)]
-
-    ## Thread conditional variable used for the subprocess scheduling
-    self._lock = threading.Condition()
-    ## Total service callback threads waiting to execute
-    self._threadCounter = 0
+    ## The maximum number of child subprocesses.
+    self._max_threads = rospy.get_param( \
+        "rapp_speech_detection_sphinx4_max_threads", self._threads )
+
+    ## The elastic pool of Sphinx subprocesses
+    #
+    # (see worker_pool.WorkerPool)
+    self._pool = WorkerPool( \
+        SpeechRecognitionSphinx4, \
+        lambda sphinx, req: sphinx.configureSpeechRecognition( req ), \
+        lambda sphinx: sphinx.shutdown(), \
+        self._threads, \
+        self._max_threads, \
+        rospy.get_param( \
+          "rapp_speech_detection_sphinx4_idle_timeout", 300.0 ), \
+        rospy.get_param( \
+          "rapp_speech_detection_sphinx4_reconfiguration_cost", 2.0 ), \
+        rospy.get_param( \
+          "rapp_speech_detection_sphinx4_recognition_time", 1.0 ) )
+    rospy.on_shutdown( self._pool.shutdown )
 
     serv_batch_topic = \
         rospy.get_param("rapp_speech_detection_sphinx4_total_topic")
@@ -72,57 +93,124 @@ class SpeechRecognitionSphinx4HandlerNode():
         serv_batch_topic, SpeechRecognitionSphinx4TotalSrv, \
         self.handleSpeechRecognitionCallback)
 
+    partial_topic = \
+        rospy.get_param("rapp_speech_detection_sphinx4_partial_topic")
+    if(not partial_topic):
+      rospy.logerr("Sphinx4 Speech detection partial topic param not found")
+
+    ## Ros publisher of the partial recognition results (per utterance)
+    self._partial_publisher = rospy.Publisher( partial_topic, \
+        SpeechRecognitionSphinx4PartialMsg, queue_size = 10 )
+
+    ## The asynchronous recognition jobs, a dispatcher per subprocess
+    #
+    # (see recognition_jobs.RecognitionJobs)
+    self._jobs = RecognitionJobs( \
+        lambda job_id, req, partial: self._recognize( req, job_id, partial ), \
+        self._max_threads, \
+        rospy.get_param( \
+          "rapp_speech_detection_sphinx4_job_result_ttl", 300.0 ) )
+    rospy.on_shutdown( self._jobs.shutdown )
+
+    serv_submit_topic = \
+        rospy.get_param("rapp_speech_detection_sphinx4_submit_topic")
+    if(not serv_submit_topic):
+      rospy.logerr("Sphinx4 Speech detection submit topic param not found")
+
+    serv_job_topic = \
+        rospy.get_param("rapp_speech_detection_sphinx4_job_topic")
+    if(not serv_job_topic):
+      rospy.logerr("Sphinx4 Speech detection job topic param not found")
+
+    ## Ros service server for asynchronous recognition job submission
+    self._speech_recognition_submit_service = rospy.Service( \
+        serv_submit_topic, SpeechRecognitionSphinx4SubmitSrv, \
+        self.handleSubmitCallback)
+
+    ## Ros service server for asynchronous recognition job status and results
+    self._speech_recognition_job_service = rospy.Service( \
+        serv_job_topic, SpeechRecognitionSphinx4JobSrv, \
+        self.handleJobCallback)
+
   ## @brief The callback to perform speech recognition
   #
   # @param req  [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4TotalSrvRequest] The service request
   # @return res [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4TotalSrvResponse] The service response
   def handleSpeechRecognitionCallback(self, req):
+    return self._recognize( req )
 
-    res = SpeechRecognitionSphinx4TotalSrvResponse()
+  ## @brief The callback to submit an asynchronous speech recognition job
+  #
+  # The job is queued and the call returns immediately. The audio file must
+  # remain available until the job is performed.
+  #
+  # @param req  [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4SubmitSrvRequest] The service request
+  # @return res [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4SubmitSrvResponse] The service response
+  def handleSubmitCallback(self, req):
+    res = SpeechRecognitionSphinx4SubmitSrvResponse()
+    res.job_id = self._jobs.submit( req )
+    return res
+
+  ## @brief The callback to fetch an asynchronous speech recognition job status
+  #
+  # The status is one of 'queued' (with the queue position), 'running' (with
+  # the words recognized so far), 'done' or 'failed' (with the final words and
+  # error). Unknown or expired jobs are reported as errors.
+  #
+  # @param req  [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4JobSrvRequest] The service request
+  # @return res [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4JobSrvResponse] The service response
+  def handleJobCallback(self, req):
+    res = SpeechRecognitionSphinx4JobSrvResponse()
+    job = self._jobs.getJob( req.job_id )
+    if job is None:
+      res.status = 'unknown'
+      res.error = 'Unknown or expired job: ' + req.job_id
+      return res
+    res.status = job['status']
+    res.position = job['position']
+    res.words = job['words']
+    res.error = job['error']
+    return res
+
+  ## @brief Performs a speech recognition on a pooled subprocess
+  #
+  # Blocks until a subprocess is available and the recognition is complete.
+  # The words of each utterance are published as soon as they are recognized.
+  #
+  # @param req     [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4TotalSrvRequest] The recognition request
+  # @param job_id  [string] The asynchronous job ID, empty for the batch service
+  # @param partial [function] Called with the words of each utterance (optional)
+  # @return res [rapp_platform_ros_communications::SpeechDetectionSphinx4Wrapper::SpeechRecognitionSphinx4TotalSrvResponse] The recognition response
+  def _recognize(self, req, job_id = '', partial = None):
 
     request_hash = self._calculateRequestHash( req )
 
-    self._lock.acquire()
-    self._threadCounter += 1
-    if self._threadCounter > self._threads:
-      self._lock.wait()
-
-    # Search for available Sphinx with similar configuration
-    for proc in self._availableProcesses:
-      if proc['running'] == False and \
-         proc['configuration_hash'] == request_hash:
-
-        proc['running'] = True
-        self._lock.release()
-        res = proc['sphinx'].speechRecognitionBatch( req )
-
-        self._lock.acquire()
-        proc['running'] = False
-        self._threadCounter -= 1
-        if self._threadCounter >= self._threads:
-          self._lock.notify()
-        self._lock.release()
-
-        return res
-
-    # Search for available Sphinx
-    for proc in self._availableProcesses:
-      if proc['running'] == False:
-
-        proc['configuration_hash'] = request_hash
-        proc['running'] = True
-
-        self._lock.release()
-        res = proc['sphinx'].speechRecognitionBatch( req )
-
-        self._lock.acquire()
-        proc['running'] = False
-        self._threadCounter -= 1
-        if self._threadCounter >= self._threads:
-          self._lock.notify()
-        self._lock.release()
-
-        return res
+    def publishPartial(words):
+      msg = SpeechRecognitionSphinx4PartialMsg()
+      msg.job_id = job_id
+      msg.user = req.user
+      msg.path = req.path
+      msg.words = words
+      self._partial_publisher.publish( msg )
+      if partial is not None:
+        partial( words )
+
+    [index, sphinx, reconfigure] = self._pool.acquire( request_hash, req )
+    start = time.time()
+    try:
+      res = sphinx.speechRecognitionBatch( req, publishPartial )
+    finally:
+      self._pool.release( index, time.time() - start, reconfigure )
+
+    rospy.logdebug( "Sphinx4 scheduling statistics: " + \
+        str(self.getSchedulingStatistics()) )
+    return res
+
+  ## @brief Returns the subprocess scheduling statistics
+  #
+  # @return statistics [dictionary] The subprocesses (current, spawned, reaped and pre-warmed), the reconfigurations (performed and avoided), the queue wait time and the duration estimates (see worker_pool.WorkerPool::getStatistics)
+  def getSchedulingStatistics(self):
+    return self._pool.getStatistics()
 
   ## @brief Calculates the service request sha1 hash for process handling purposes
   #
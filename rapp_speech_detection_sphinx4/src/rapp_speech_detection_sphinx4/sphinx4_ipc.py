@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+
+import os
+import time
+import errno
+import select
+import socket
+
+## @class IpcError
+# @brief Raised when the IPC with a Sphinx subprocess fails
+class IpcError(Exception):
+  pass
+
+## @class IpcTimeoutError
+# @brief Raised when a Sphinx subprocess does not reply in time
+class IpcTimeoutError(IpcError):
+  pass
+
+## @class IpcChannel
+# @brief Newline framed, buffered IPC channel with a Sphinx subprocess
+#
+# Abstracts the transport, either a TCP connection or the subprocess'
+# stdin/stdout pipes (see createTcpChannel and createPipeChannel). Lines are
+# read via an internal buffer, thus a line is never split or merged with the
+# next, and reads may time out on both transports.
+class IpcChannel:
+
+  ## The maximum number of bytes read at once
+  read_size = 65536
+
+  ## Constructor performing initializations
+  #
+  # @param read_fd [int] The file descriptor the replies are read from
+  # @param read    [function] Reads up to a number of bytes, returning '' at the end of stream
+  # @param write   [function] Writes all the given bytes
+  # @param close   [function] Closes the transport
+  def __init__(self, read_fd, read, write, close):
+    ## The file descriptor the replies are read from
+    self._read_fd = read_fd
+    ## Reads up to a number of bytes
+    self._read = read
+    ## Writes all the given bytes
+    self._write = write
+    ## Closes the transport
+    self._close = close
+    ## The received bytes not yet returned as lines
+    self._buffer = ''
+
+  ## Sends data
+  #
+  # @param data [string] The data
+  #
+  # @exception IpcError The subprocess closed the channel
+  def send(self, data):
+    try:
+      self._write(data)
+    except (socket.error, IOError, OSError) as e:
+      raise IpcError(str(e))
+
+  ## Reads a line
+  #
+  # @param timeout [float] The timeout in seconds, None to block
+  #
+  # @return line [string] The line including the newline, empty at the end of stream
+  #
+  # @exception IpcTimeoutError No line arrived within the timeout
+  # @exception IpcError The transport failed
+  def readLine(self, timeout = None):
+    deadline = None
+    if timeout is not None:
+      deadline = time.time() + timeout
+    try:
+      while '\n' not in self._buffer:
+        if deadline is not None:
+          remaining = deadline - time.time()
+          if remaining <= 0 or \
+              len(select.select([self._read_fd], [], [], remaining)[0]) == 0:
+            raise IpcTimeoutError('Sphinx reply timed out')
+        data = self._read(self.read_size)
+        if len(data) == 0:
+          line = self._buffer
+          self._buffer = ''
+          return line
+        self._buffer += data
+    except select.error as e:
+      if e.args[0] == errno.EINTR:
+        return self.readLine(timeout)
+      raise IpcError(str(e))
+    except (socket.error, IOError, OSError) as e:
+      raise IpcError(str(e))
+    [line, self._buffer] = self._buffer.split('\n', 1)
+    return line + '\n'
+
+  ## Closes the channel
+  def close(self):
+    try:
+      self._close()
+    except (socket.error, IOError, OSError):
+      pass
+
+## Creates a channel over a TCP connection
+#
+# @param connection [socket] The accepted connection
+# @param server     [socket] The server socket, closed along with the channel
+#
+# @return channel [IpcChannel] The channel
+def createTcpChannel(connection, server):
+  # Each line is sent as soon as it is produced
+  connection.setsockopt( socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 )
+
+  def close():
+    connection.close()
+    server.close()
+
+  return IpcChannel(connection.fileno(), connection.recv, \
+      connection.sendall, close)
+
+## Creates a channel over a subprocess' stdin/stdout pipes
+#
+# @param stdin  [file] The subprocess' stdin
+# @param stdout [file] The subprocess' stdout
+#
+# @return channel [IpcChannel] The channel
+def createPipeChannel(stdin, stdout):
+  read_fd = stdout.fileno()
+  write_fd = stdin.fileno()
+
+  def read(size):
+    return os.read(read_fd, size)
+
+  def write(data):
+    while len(data) > 0:
+      data = data[os.write(write_fd, data):]
+
+  def close():
+    stdin.close()
+    stdout.close()
+
+  return IpcChannel(read_fd, read, write, close)
@@ -23,7 +23,13 @@ import subprocess
 import socket
 import time
 import os
+import wave
+import threading
 from global_parameters import GlobalParams
+from language_model_cache import LanguageModelCache
+from shared_resources import SharedResources
+from sphinx4_ipc import IpcError, IpcTimeoutError, createTcpChannel, \
+    createPipeChannel
 import rospy
 from rapp_tools import *
 
@@ -34,14 +40,17 @@ from rapp_platform_ros_communications.srv import(
     AudioProcessingDetectSilenceSrvRequest,
     AudioProcessingTransformAudioSrv,
     AudioProcessingTransformAudioSrvResponse,
-    AudioProcessingTransformAudioSrvRequest
+    AudioProcessingTransformAudioSrvRequest,
+    AudioProcessingPipelineSrv,
+    AudioProcessingPipelineSrvRequest
     )
 
 ## @class Sphinx4Wrapper
 # @brief Contains the Sphinx subprocess and is responsible for configuring Sphinx and performing the recognition request.
 #
-# Initializes a Sphinx.java subprocess and creates an IPC using sockets.
-# It is responsible for interacting with Sphinx via the socket to send
+# Initializes a Sphinx.java subprocess and creates an IPC using a TCP socket
+# or the subprocess' pipes (see sphinx4_ipc.IpcChannel).
+# It is responsible for interacting with Sphinx via the IPC to send
 # configuration params/instructions and initialize a recognition procedure.
 class Sphinx4Wrapper(GlobalParams):
 
@@ -54,14 +63,30 @@ class Sphinx4Wrapper(GlobalParams):
     ## Sphinx status flag
     self._sphinxDied = False
 
-    ## The IPC socket
-    self._sphinx_socket = None
-    ## The IPC socket port
-    self._sphinx_socket_PORT = None
+    ## The IPC channel (see sphinx4_ipc.IpcChannel)
+    self._channel = None
 
     ## The Sphinx subprocess
     self._sphinxSubprocess = None
 
+    ## The standby Sphinx subprocess (see _spawnSphinx), None if unavailable
+    self._standby = None
+    ## Protects the standby Sphinx subprocess
+    self._standby_lock = threading.Lock()
+
+    ## The language model cache (None if disabled), whose entry of the
+    # current configuration is pinned, thus never evicted while the Sphinx
+    # subprocesses employ its files (see #configureSphinx)
+    #
+    # Shared with limited_vocabulary_creator.LimitedVocabularyCreator
+    # (see shared_resources.SharedResources)
+    self._language_model_cache = None
+    if self._language_model_cache_size > 0:
+      self._language_model_cache = SharedResources.get( \
+          ('language_model_cache', self._language_model_cache_url), \
+          lambda: LanguageModelCache( self._language_model_cache_url, \
+            self._language_model_cache_size ) )
+
     # Denoise service topic name
     denoise_topic = rospy.get_param("rapp_audio_processing_denoise_topic")
     # Energy denoise service topic name
@@ -73,6 +98,9 @@ class Sphinx4Wrapper(GlobalParams):
     # Transform audio service topic name
     audio_trans_topic = \
         rospy.get_param("rapp_audio_processing_transform_audio_topic")
+    # Audio pipeline service topic name
+    audio_pipeline_topic = \
+        rospy.get_param("rapp_audio_processing_pipeline_topic")
 
     if(not denoise_topic):
       rospy.logerror("Audio processing denoise topic not found")
@@ -82,6 +110,8 @@ class Sphinx4Wrapper(GlobalParams):
       rospy.logerror("Audio processing detect silence topic not found")
     if(not audio_trans_topic):
       rospy.logerror("Audio processing transform audio topic not found")
+    if(not audio_pipeline_topic):
+      rospy.logerr("Audio processing pipeline topic not found")
 
     ## @brief Denoise service client
     #
@@ -107,74 +137,199 @@ class Sphinx4Wrapper(GlobalParams):
     self._audio_transform_srv = rospy.ServiceProxy( \
         audio_trans_topic, AudioProcessingTransformAudioSrv )
 
+    ## @brief Audio pipeline service client
+    #
+    # rapp_audio_processing.rapp_audio_processing.AudioProcessing::pipeline
+    self._audio_pipeline_service = rospy.ServiceProxy( \
+        audio_pipeline_topic, AudioProcessingPipelineSrv )
+
   ## Helper function for getting input from IPC with Sphinx subprocess
   #
-  # @return line [string] A buffer read from socket
-  def _readLine(self):
-    line = self.socket_connection.recv(1024)
+  # @param channel [sphinx4_ipc.IpcChannel] The IPC channel, the active one if None
+  # @param timeout [float] The timeout in seconds, None to block
+  #
+  # @return line [string] A line read from the IPC, empty if the channel closed
+  def _readLine(self, channel = None, timeout = None):
+    if channel is None:
+      channel = self._channel
+    line = channel.readLine(timeout)
     if self._allow_sphinx_output == True:
       rapp_print( line )
     return line
 
   ## Perform Sphinx4 initialization
-  # Initiates Sphinx subprocess, sets up socket IPC and configures Sphinx subprocess
+  # Initiates Sphinx subprocess, sets up the IPC and configures Sphinx subprocess
+  #
+  # If the warm standby is enabled, a standby Sphinx subprocess is prepared in
+  # the background.
   #
   # @param conf [dictionary] Contains the configuration parameters
   def initializeSphinx(self, conf):
 
     rapp_print(str(conf['jar_path']))
 
-    self._createSocket()
-
-    if self._allow_sphinx_output == True:
-        self._sphinxSubprocess = subprocess.Popen( ["java", "-cp", conf['jar_path'], "Sphinx4", str(self._sphinx_socket_PORT)] )
-    else:
-        try:
-          from subprocess import DEVNULL
-        except ImportError:
-          DEVNULL = open(os.devnull, 'wb')
-
-        self._sphinxSubprocess = subprocess.Popen( ["java", "-cp", conf['jar_path'], "Sphinx4", str(self._sphinx_socket_PORT)], \
-            stdout = DEVNULL, stderr = DEVNULL )
-
-    self.socket_connection, addr = self._sphinx_socket.accept()
+    instance = self._spawnSphinx( conf['jar_path'] )
+    self._sphinxSubprocess = instance['process']
+    self._channel = instance['channel']
 
     self.configureSphinx( conf )
 
+  ## Spawns a Sphinx subprocess and sets up its IPC
+  #
+  # The IPC transport is either a TCP socket or the subprocess' stdin/stdout
+  # pipes, according to GlobalParams::_sphinx_ipc_transport.
+  #
+  # @param jar_path [string] The Java class path
+  #
+  # @return instance [dictionary] The subprocess, the IPC channel and the configuration (None)
+  def _spawnSphinx(self, jar_path):
+    command = ["java", "-cp", jar_path, "Sphinx4"]
+
+    output = None
+    if self._allow_sphinx_output != True:
+      try:
+        from subprocess import DEVNULL
+      except ImportError:
+        DEVNULL = open(os.devnull, 'wb')
+      output = DEVNULL
+
+    if self._sphinx_ipc_transport == 'pipe':
+      # Sphinx writes its output on stderr, stdout carrying the IPC
+      process = subprocess.Popen( command + ["pipe"], \
+          stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = output )
+      channel = createPipeChannel( process.stdin, process.stdout )
+    else:
+      [sphinx_socket, port] = self._createSocket()
+      process = subprocess.Popen( command + [str(port)], \
+          stdout = output, stderr = output )
+      connection, addr = sphinx_socket.accept()
+      channel = createTcpChannel( connection, sphinx_socket )
+
+    return { \
+        'process': process, \
+        'channel': channel, \
+        'conf': None \
+        }
+
   ## Creates socket IPC between self and Sphinx subprocess
   # Creates the socket server with a system provided port, which is pass as an
   # argument to the created subprocess.
+  #
+  # @return sphinx_socket [socket] The socket server
+  # @return port          [int] The socket server port
   def _createSocket(self):
     HOST = self._socket_host
-    self._sphinx_socket = socket.socket( socket.AF_INET, socket.SOCK_STREAM ) # Create Unix Socket
-    self._sphinx_socket.setsockopt( socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    self._sphinx_socket.bind( (HOST, 0) )
-    self._sphinx_socket_PORT = self._sphinx_socket.getsockname()[1]
-    self._sphinx_socket.listen( 1 )
+    sphinx_socket = socket.socket( socket.AF_INET, socket.SOCK_STREAM ) # Create Unix Socket
+    sphinx_socket.setsockopt( socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sphinx_socket.bind( (HOST, 0) )
+    sphinx_socket.listen( 1 )
+    return [sphinx_socket, sphinx_socket.getsockname()[1]]
 
   ## Perform Sphinx4 configuration
   #
+  # The standby Sphinx subprocess (if enabled) is configured in the
+  # background. The language model cache entry of the configuration (if
+  # cached) is pinned instead of the previous one, thus its files exist as long
+  # as the subprocesses (e.g. respawned, see _respawnSphinx) may load them.
+  #
   # @param conf [dictionary] Contains the configuration parameters
   def configureSphinx(self, conf):
-    self._conf = conf
-    self.socket_connection.sendall("configurationPath#" + conf['configuration_path'] + '\r\n')
-    self._readLine()
-    self.socket_connection.sendall("acousticModel#" + conf['acoustic_model'] + '\r\n')
-    self._readLine()
-    self.socket_connection.sendall("grammarName#" + conf['grammar_name'] + "#" + \
-            conf['grammar_folder'] + '\r\n')
-    self._readLine()
-    self.socket_connection.sendall("dictionary#" + conf['dictionary'] + '\r\n')
-    self._readLine()
-    self.socket_connection.sendall("languageModel#" + conf['language_model'] + '\r\n')
-    self._readLine()
+    self._pinConfiguration( conf )
+    # A snapshot, since the callers may modify their configuration in place
+    self._conf = dict(conf)
+    self._configureChannel( self._channel, conf )
+    if self._sphinx_warm_standby == True:
+      self._prepareStandby()
+
+  ## Pins the language model cache entry of a configuration
+  #
+  # The entry of the current configuration is unpinned.
+  #
+  # @param conf [dictionary] The configuration to be employed, None to only unpin the current one
+  def _pinConfiguration(self, conf):
+    if self._language_model_cache is None:
+      return
+    if conf is not None:
+      self._language_model_cache.pin( conf['grammar_folder'] )
+    if isinstance(self._conf, dict):
+      self._language_model_cache.unpin( self._conf['grammar_folder'] )
+
+  ## Sends the configuration parameters over an IPC channel
+  #
+  # The commands are sent at once and their replies (one line each) are read
+  # afterwards, costing a single round trip.
+  #
+  # @param channel [sphinx4_ipc.IpcChannel] The IPC channel
+  # @param conf    [dictionary] Contains the configuration parameters
+  def _configureChannel(self, channel, conf):
+    commands = [ \
+        "configurationPath#" + conf['configuration_path'], \
+        "acousticModel#" + conf['acoustic_model'], \
+        "grammarName#" + conf['grammar_name'] + "#" + conf['grammar_folder'], \
+        "dictionary#" + conf['dictionary'], \
+        "languageModel#" + conf['language_model'] \
+        ]
     if(conf['grammar_disabled']):
-      self.socket_connection.sendall("disableGrammar#\r\n")
+      commands.append("disableGrammar#")
     else:
-      self.socket_connection.sendall("enableGrammar#\r\n")
-    self._readLine()
-    self.socket_connection.sendall("forceConfiguration#\r\n")
-    self._readLine()
+      commands.append("enableGrammar#")
+    commands.append("forceConfiguration#")
+
+    channel.send(''.join([command + '\r\n' for command in commands]))
+    for command in commands:
+      self._readLine(channel)
+
+  ## Checks that a Sphinx subprocess is alive and responsive
+  #
+  # @param instance [dictionary] The Sphinx subprocess (see _spawnSphinx)
+  #
+  # @return healthy [bool] True if the subprocess answered the health check
+  def _isHealthy(self, instance):
+    if instance['process'].poll() is not None:
+      return False
+    try:
+      instance['channel'].send("healthCheck#\r\n")
+      return "Healthy" in self._readLine( instance['channel'], \
+          self._health_check_timeout )
+    except IpcError:
+      return False
+
+  ## Prepares the standby Sphinx subprocess in the background
+  #
+  # The standby subprocess is spawned if missing or unhealthy and configured
+  # with the current configuration.
+  def _prepareStandby(self):
+    thread = threading.Thread( target = self._prepareStandbyBlocking )
+    thread.daemon = True
+    thread.start()
+
+  ## Prepares the standby Sphinx subprocess (see _prepareStandby)
+  def _prepareStandbyBlocking(self):
+    with self._standby_lock:
+      conf = self._conf
+      try:
+        if self._standby is not None and not self._isHealthy(self._standby):
+          self._terminateSphinx( self._standby )
+          self._standby = None
+        if self._standby is None:
+          self._standby = self._spawnSphinx( conf['jar_path'] )
+        if self._standby['conf'] != conf:
+          self._configureChannel( self._standby['channel'], conf )
+          self._standby['conf'] = dict(conf)
+      except (IpcError, socket.error, OSError) as e:
+        rospy.logwarn( "Sphinx standby preparation failed: " + str(e) )
+        if self._standby is not None:
+          self._terminateSphinx( self._standby )
+          self._standby = None
+
+  ## Terminates a Sphinx subprocess and closes its IPC
+  #
+  # @param instance [dictionary] The Sphinx subprocess (see _spawnSphinx)
+  def _terminateSphinx(self, instance):
+    if instance['process'].poll() is None:
+      instance['process'].kill()
+    instance['process'].wait()
+    instance['channel'].close()
 
   ## Creates audio profile based on the audio type for processing purposes.
   # Defines a set of audio processing procedures (i.e. denoising) to be
@@ -192,6 +347,7 @@ class Sphinx4Wrapper(GlobalParams):
     processingProfile['sox_denoising_scale'] = 0.0
     processingProfile['detect_silence'] = False
     processingProfile['detect_silence_threshold'] = 0.0
+    processingProfile['trim_silence'] = False
     processingProfile['energy_denoising'] = False
     processingProfile['energy_denoising_init_scale'] = 0.0
 
@@ -203,6 +359,7 @@ class Sphinx4Wrapper(GlobalParams):
       processingProfile['sox_denoising_scale'] = 0.15
       processingProfile['detect_silence'] = True
       processingProfile['detect_silence_threshold'] = 3.0
+      processingProfile['trim_silence'] = True
       processingProfile['energy_denoising'] = True
       processingProfile['energy_denoising_init_scale'] = 0.125
     elif audio_type == "nao_wav_4_ch":
@@ -211,6 +368,7 @@ class Sphinx4Wrapper(GlobalParams):
       processingProfile['sox_denoising_scale'] = 0.15
       processingProfile['detect_silence'] = True
       processingProfile['detect_silence_threshold'] = 3.0
+      processingProfile['trim_silence'] = True
       processingProfile['energy_denoising'] = True
       processingProfile['energy_denoising_init_scale'] = 0.125
     elif audio_type == "nao_wav_1_ch":
@@ -239,12 +397,14 @@ class Sphinx4Wrapper(GlobalParams):
 
   ## Performs the speech recognition and returns a list of words
   #
-  # @param audio_file [string] The audio file's name
-  # @param audio_type [string] The audio file's type
+  # @param audio_file       [string] The audio file's name
+  # @param audio_type       [string] The audio file's type
+  # @param partial_callback [function] Called with the words of each utterance as soon as Sphinx recognizes it (optional)
   #
   # @returns words [list::string] The result words
   # @exception RappError Audio transformation error
-  def performSpeechRecognition(self, audio_file, audio_type, user):
+  def performSpeechRecognition(self, audio_file, audio_type, user, \
+      partial_callback = None):
     # Check if path exists
     if os.path.isfile(audio_file) == False:
       return ["Error: Something went wrong with the local audio storage\
@@ -276,64 +436,49 @@ class Sphinx4Wrapper(GlobalParams):
     # Get processing profile
     profile = self._createProcessingProfile(audio_type)
 
-    transform_req = AudioProcessingTransformAudioSrvRequest()
-    transform_req.source_type = audio_type
-    transform_req.source_name = prev_audio_file
-    transform_req.target_type = 'wav'
-
-    # Check if sox_transform is needed
-    if profile['sox_transform'] == True:
-      next_audio_file += "_transformed.wav"
-      transform_req.target_name = next_audio_file
-
-      trans_response = self._audio_transform_srv( transform_req )
-
-      if trans_response.error != 'success':
-          return [ 'Audio transformation error: ' + error ]
-          #raise RappError( 'Audio transformation error: ' + error )
-
-      audio_to_be_erased.append(next_audio_file)
-      prev_audio_file = next_audio_file
-    if profile['sox_channels_and_rate'] == True:
-      next_audio_file += "_mono16k.wav"
-      transform_req.target_name = next_audio_file
-      transform_req.target_channels = 1
-      transform_req.target_rate = 16000
-
-      trans_response = self._audio_transform_srv( transform_req )
-
-      if trans_response.error != 'success':
-          return [ 'Audio transformation error: ' + error ]
-          #raise RappError( 'Audio transformation error: ' + error )
-      audio_to_be_erased.append(next_audio_file)
-      prev_audio_file = next_audio_file
-    if profile['sox_denoising'] == True:
-      next_audio_file = prev_audio_file + "_denoised.wav"
-      den_request = AudioProcessingDenoiseSrvRequest()
-      den_request.audio_file = prev_audio_file
-      den_request.denoised_audio_file = next_audio_file
-      den_request.audio_type = audio_type
-      den_request.user = user
-      den_request.scale = profile['sox_denoising_scale']
-      den_response = self._denoise_service(den_request)
-      if den_response.success != "true":
-        return ["Error:" + den_response.success]
-      audio_to_be_erased.append(next_audio_file)
-      prev_audio_file = next_audio_file
-    if profile['detect_silence'] == True:
-      # Detect silence
-      silence_req = AudioProcessingDetectSilenceSrvRequest()
-      silence_req.audio_file = prev_audio_file
-      silence_req.threshold = profile['detect_silence_threshold']
-      silence_res = self._detect_silence_service(silence_req)
-      rapp_print("Silence detection results: " + str(silence_res))
-      if silence_res.silence == "true":
-        return ["Error: No speech detected. RSD = " + str(silence_res.level)]
+    # Perform all the preprocessing stages in a single pass
+    if profile['sox_transform'] or profile['sox_channels_and_rate'] or \
+        profile['sox_denoising'] or profile['detect_silence'] or \
+        profile['trim_silence'] or profile['energy_denoising']:
+      pipeline_req = AudioProcessingPipelineSrvRequest()
+      pipeline_req.audio_file = prev_audio_file
+      pipeline_req.audio_type = audio_type
+      pipeline_req.user = user
+      pipeline_req.sox_transform = profile['sox_transform']
+      pipeline_req.sox_channels_and_rate = profile['sox_channels_and_rate']
+      pipeline_req.sox_denoising = profile['sox_denoising']
+      pipeline_req.sox_denoising_scale = profile['sox_denoising_scale']
+      pipeline_req.detect_silence = profile['detect_silence']
+      pipeline_req.detect_silence_threshold = \
+          profile['detect_silence_threshold']
+      pipeline_req.trim_silence = profile['trim_silence']
+      pipeline_req.energy_denoising = profile['energy_denoising']
+      pipeline_req.energy_denoising_scale = \
+          profile['energy_denoising_init_scale']
+      # Silence detection alone does not alter the audio file
+      if profile['sox_transform'] or profile['sox_channels_and_rate'] or \
+          profile['sox_denoising'] or profile['trim_silence'] or \
+          profile['energy_denoising']:
+        next_audio_file += "_processed.wav"
+        pipeline_req.processed_audio_file = next_audio_file
+
+      pipeline_res = self._audio_pipeline_service(pipeline_req)
+      if pipeline_res.success != "true":
+        return ["Error:" + pipeline_res.error]
+      if profile['detect_silence'] == True:
+        rapp_print("Silence detection results: " + str(pipeline_res))
+        if pipeline_res.silence == "true":
+          return ["Error: No speech detected. RSD = " + str(pipeline_res.level)]
+      if profile['trim_silence'] == True:
+        rapp_print("Trimmed " + str(pipeline_res.removed_ms) + " ms of silence")
+      if next_audio_file != prev_audio_file:
+        audio_to_be_erased.append(next_audio_file)
+        prev_audio_file = next_audio_file
 
     tries = 0
     while tries < 2:
-        # Perform energy denoising as well
-        if profile['energy_denoising'] == True:
+        # Perform stronger energy denoising on retries
+        if profile['energy_denoising'] == True and tries > 0:
           next_audio_file = prev_audio_file + "_energy_denoised.wav"
           dres = self._performEnergyDenoising(next_audio_file, prev_audio_file, \
                   profile['energy_denoising_init_scale'] + tries * 0.125)
@@ -343,7 +488,7 @@ class Sphinx4Wrapper(GlobalParams):
           prev_audio_file = next_audio_file
 
         new_audio_file = next_audio_file
-        words = self._callSphinxJava(new_audio_file)
+        words = self._callSphinxJava(new_audio_file, partial_callback)
         if self._sphinxDied == True:
             self._sphinxDied = False
             break
@@ -401,41 +546,137 @@ class Sphinx4Wrapper(GlobalParams):
 
   ## Communicate with Sphinx subprocess to initiate recognition and fetch results.
   #
-  # @param audio_file [string] The audio file path
+  # Sphinx streams a line per result ('#' followed by the words), terminated
+  # by a single 'stopPython' line. No acknowledgements are sent. If Sphinx
+  # does not finish within the recognition timeout it is respawned, so that
+  # its late results are not read by the next recognition.
+  #
+  # The audio is either streamed over the IPC or passed as a path, according
+  # to GlobalParams::_sphinx_audio_transfer (see _createAudioCommand).
+  #
+  # Each result line (an utterance) is forwarded to the partial callback as
+  # soon as it arrives, while decoding continues.
+  #
+  # @param audio_file       [string] The audio file path
+  # @param partial_callback [function] Called with the words of each utterance (optional)
   #
   # @return words [list::string] The Sphinx result
-  def _callSphinxJava(self, audio_file):
-    self.socket_connection.sendall("start\r\n")
-    self.socket_connection.sendall("audioInput#" + audio_file + "\r\n")
+  def _callSphinxJava(self, audio_file, partial_callback = None):
+    # A crashed Sphinx is replaced before the recognition
+    if self._sphinxSubprocess.poll() is not None:
+      rospy.logerr("Sphinx subprocess terminated, respawning")
+      self._respawnSphinx()
+
     start_time = time.time()
     words = []
-    while(True):
-      line = self._readLine()
-      self.socket_connection.sendall('Read line\r\n')
-      if(len(line)>0):
+    try:
+      self._channel.send( self._createAudioCommand(audio_file) )
+      while(True):
+        remaining_time = self._recognition_timeout - (time.time() - start_time)
+        line = self._readLine( timeout = max(0.0, remaining_time) )
+        if len(line) == 0:
+          raise IpcError("Sphinx subprocess terminated")
         if(line[0]=="#"):
-          stripped_down_line = line[1:-1].split(" ")
+          stripped_down_line = line[1:].rstrip('\r\n').split(" ")
           for word in stripped_down_line:
             words.append(word)
-        if("stopPython\n" in line):
+          if partial_callback is not None and \
+              len(line[1:].strip()) != 0:
+            partial_callback(stripped_down_line)
+        elif(line.startswith("stopPython")):
           break
-        if("CatchedException" in line):
-            rospy.logerr(line)
-            self._respawnSphinx()
-            self._sphinxDied = True
-            return words
-
-      if (time.time() - start_time > 10):
-        words.append("Error: Time out error")
-        break
+        elif("CatchedException" in line):
+          rospy.logerr(line)
+          self._respawnSphinx()
+          self._sphinxDied = True
+          return words
+        elif(line.startswith("Fatal error")):
+          words = ["Error: " + line.rstrip('\r\n')]
+    except IpcTimeoutError:
+      words.append("Error: Time out error")
+      rospy.logerr("Sphinx recognition timed out, respawning")
+      self._respawnSphinx()
+    except IpcError as e:
+      rospy.logerr("Sphinx IPC failed: " + str(e))
+      self._respawnSphinx()
+      self._sphinxDied = True
     return words
 
+  ## Creates the recognition command of an audio file
+  #
+  # In the 'stream' audio transfer mode, the 16 bit mono PCM samples of the
+  # (preprocessed) WAV file are sent after the command and Sphinx decodes them
+  # from memory, instead of opening the file. Other files, or files that
+  # cannot be read, are passed by path, letting Sphinx report the error.
+  #
+  # @param audio_file [string] The audio file path
+  #
+  # @return command [string] The command, followed by the samples if streamed
+  def _createAudioCommand(self, audio_file):
+    if self._sphinx_audio_transfer == 'stream':
+      try:
+        audio = wave.open(audio_file, 'rb')
+        try:
+          if audio.getsampwidth() == 2 and audio.getnchannels() == 1:
+            samples = audio.readframes( audio.getnframes() )
+            return "audioData#" + str(len(samples)) + "\r\n" + samples
+        finally:
+          audio.close()
+      except (IOError, EOFError, wave.Error) as e:
+        rospy.logwarn("Audio streaming failed, passing the path: " + str(e))
+    return "audioInput#" + audio_file + "\r\n"
+
+  ## Terminates the Sphinx subprocesses (active and standby)
+  #
+  # The language model cache entry of the configuration is unpinned.
+  def shutdownSphinx(self):
+    with self._standby_lock:
+      if self._standby is not None:
+        self._terminateSphinx( self._standby )
+        self._standby = None
+    if self._sphinxSubprocess is not None:
+      self._terminateSphinx( self._activeInstance() )
+      self._sphinxSubprocess = None
+    # Unpinned once, even if shut down again
+    self._pinConfiguration( None )
+    self._conf = ''
+
+  ## Returns the active Sphinx subprocess
+  #
+  # @return instance [dictionary] The Sphinx subprocess (see _spawnSphinx)
+  def _activeInstance(self):
+    return { \
+        'process': self._sphinxSubprocess, \
+        'channel': self._channel, \
+        'conf': self._conf \
+        }
+
   ## Respawns Sphinx subprocess, if it terminates abruptly
+  #
+  # The standby subprocess, if healthy, takes over immediately (configured
+  # if its configuration is stale) and a new standby is prepared in the
+  # background. Otherwise a new subprocess is initialized.
   def _respawnSphinx(self):
-    #rospy.logwarn("Respawning sphinx")
-    self._sphinxSubprocess.kill()
-    time.sleep(2)
+    self._terminateSphinx( self._activeInstance() )
+
+    standby = None
+    if self._sphinx_warm_standby == True:
+      with self._standby_lock:
+        standby = self._standby
+        self._standby = None
+
+    if standby is not None and self._isHealthy( standby ):
+      self._sphinxSubprocess = standby['process']
+      self._channel = standby['channel']
+      if standby['conf'] != self._conf:
+        self.configureSphinx( self._conf )
+      else:
+        self._prepareStandby()
+      return
+
+    if standby is not None:
+      self._terminateSphinx( standby )
+    rospy.logwarn( "Sphinx standby unavailable, initializing a new Sphinx" )
     self.initializeSphinx( self._conf )
-    #rospy.logwarn("Respawned sphinx")
 
 
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Athanassios Kintsakis, Manos Tsardoulias
+# contact: akintsakis@issel.ee.auth.gr, etsardou@iti.gr
+import os
+import re
+import sys
+import glob
+import rospkg
+import xml.etree.ElementTree as ET
+
+from rapp_speech_detection_sphinx4 import GreekSupport
+from rapp_speech_detection_sphinx4 import EnglishSupport
+from rapp_speech_detection_sphinx4 import LanguagePacks
+from rapp_speech_detection_sphinx4 import RappError
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), \
+    '..', 'benchmarks'))
+from vocabularies import vocabularies
+
+## @class LanguagePacksBuilder
+# Builds the language packs (language_packs.LanguagePacks) of the
+# vocabularies known at deploy time:
+# - the answers of each cognitive exercise question
+#   (rapp_cognitive_exercise/cognitiveTests/*.xml), requested with the
+#   answers' words as words, the answers as sentences and no grammar
+# - the vocabularies of benchmarks/vocabularies.py
+#
+# The packs are created in the prebuiltPacks directory of
+# rapp_sphinx4_language_models and must be rebuilt if the cognitive tests or
+# the vocabulary creation (e.g. the Greek letter tables) change, since the
+# packs of another pronunciation version stamp are ignored.
+class LanguagePacksBuilder:
+
+  ## Builds the language packs
+  def __init__(self):
+    english_support = EnglishSupport()
+    ## The language supports, by language
+    self._supports = {
+        'el': GreekSupport(english_support),
+        'en': english_support
+        }
+    packs = LanguagePacks()
+
+    for [name, language, words, grammar, sentences] in \
+        self._cognitiveTestsVocabularies() + self._benchmarkVocabularies():
+      try:
+        if language == 'el':
+          [conf, word_mapping] = self._supports[language].\
+              getLimitedVocebularyConfiguration(words, grammar, sentences)
+        else:
+          conf = self._supports[language].getLimitedVocebularyConfiguration( \
+              words, grammar, sentences)
+          word_mapping = {}
+      except RappError as e:
+        print "Skipping " + name + ": " + e.value
+        continue
+      key = packs.add(name, language, words, grammar, sentences, conf, \
+          word_mapping, self._supports[language].getPronunciationVersion())
+      print name + " (" + language + ", " + str(len(set(words))) + \
+          " words): " + key
+
+    packs.save()
+    print str(packs.getSize()) + " language packs"
+
+  ## Returns the vocabularies of the cognitive exercises' questions
+  #
+  # @return vocabularies [list::list] The [name, language, words, grammar, sentences] vocabularies
+  def _cognitiveTestsVocabularies(self):
+    tests_directory = os.path.join( \
+        rospkg.RosPack().get_path('rapp_cognitive_exercise'), 'cognitiveTests')
+    vocabularies = []
+    for test_file in sorted(glob.glob(os.path.join(tests_directory, '*.xml'))):
+      test_name = os.path.splitext(os.path.basename(test_file))[0]
+      for language in ET.parse(test_file).getroot().find('Languages'):
+        if language.tag not in self._supports:
+          continue
+        for question in language.findall('Question'):
+          sentences = []
+          for answer in question.findall('answer'):
+            sentences.append(answer.find('body').text.strip().encode('utf-8'))
+          words = []
+          for sentence in sentences:
+            for word in re.split('\s+', sentence):
+              if word not in words:
+                words.append(word)
+          vocabularies.append([test_name + '/' + language.tag + '/' + \
+              question.get('name'), language.tag, words, [], sentences])
+    return vocabularies
+
+  ## Returns the vocabularies of benchmarks/vocabularies.py
+  #
+  # @return vocabularies [list::list] The [name, language, words, grammar, sentences] vocabularies
+  def _benchmarkVocabularies(self):
+    return [['benchmarks/' + name, 'el', words, grammar, sentences] \
+        for [name, words, sentences, grammar] in vocabularies]
+
+# Main function
+if __name__ == "__main__":
+  LanguagePacksBuilder()
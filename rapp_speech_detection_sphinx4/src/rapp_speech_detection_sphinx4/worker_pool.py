@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- encode: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+# Authors: Aris Thallas
+# contact: aris.thallas@{iti.gr, gmail.com}
+
+import threading
+
+from configuration_scheduler import ConfigurationScheduler
+
+## @class WorkerPool
+# @brief Elastic pool of Sphinx workers
+#
+# Maintains between a minimum and a maximum number of workers (e.g.
+# speech_recognition_sphinx4.SpeechRecognitionSphinx4 instances), scheduled by
+# configuration_scheduler.ConfigurationScheduler. A worker is spawned in the
+# background when the waiting requests outnumber the idle workers, and it is
+# pre-warmed with the most popular configuration no idle worker holds. Workers
+# idle for longer than a timeout are reaped, down to the minimum.
+class WorkerPool:
+
+  ## The maximum number of configurations whose popularity is tracked
+  max_tracked_configurations = 64
+
+  ## Constructor performing initializations
+  #
+  # Spawns the minimum number of workers.
+  #
+  # @param factory              [function] Creates a worker
+  # @param configure            [function] Configures a worker (worker, request) for pre-warming, returning an error (empty on success)
+  # @param shutdown             [function] Terminates a worker
+  # @param min_workers          [int] The minimum number of workers
+  # @param max_workers          [int] The maximum number of workers
+  # @param idle_timeout         [float] Idle workers are reaped after this (seconds), 0 disables reaping
+  # @param reconfiguration_cost [float] The initial reconfiguration cost estimate (seconds)
+  # @param recognition_time     [float] The initial recognition time estimate (seconds)
+  def __init__(self, factory, configure, shutdown, min_workers, max_workers, \
+      idle_timeout, reconfiguration_cost, recognition_time):
+    ## Creates a worker
+    self._factory = factory
+    ## Configures a worker
+    self._configure = configure
+    ## Terminates a worker
+    self._shutdown = shutdown
+    ## The minimum number of workers
+    self._min_workers = max(1, min_workers)
+    ## The maximum number of workers
+    self._max_workers = max(self._min_workers, max_workers)
+    ## The idle timeout (seconds)
+    self._idle_timeout = idle_timeout
+
+    ## The worker scheduler
+    #
+    # (see configuration_scheduler.ConfigurationScheduler)
+    self._scheduler = ConfigurationScheduler( 0, reconfiguration_cost, \
+        recognition_time )
+
+    ## The workers, by scheduler process index
+    self._workers = {}
+    ## The number of workers being spawned
+    self._spawning = 0
+    ## The configurations' request counters and latest requests (for pre-warming)
+    self._configurations = {}
+    ## Protects the workers, the counters and the configurations
+    self._lock = threading.Lock()
+
+    ## Spawned workers counter (beyond the minimum)
+    self._spawned = 0
+    ## Reaped workers counter
+    self._reaped = 0
+    ## Pre-warmed workers counter
+    self._prewarmed = 0
+
+    for i in range(self._min_workers):
+      self._addWorker(self._factory(), None)
+
+    ## Signals the reaper thread to stop
+    self._stop = threading.Event()
+    ## The reaper thread
+    self._reaper = None
+    if self._idle_timeout > 0:
+      self._reaper = threading.Thread(target = self._reapPeriodically)
+      self._reaper.daemon = True
+      self._reaper.start()
+
+  ## Assigns a worker to a request, blocking until one is available
+  #
+  # @param configuration [string] The request's configuration hash
+  # @param request       [object] The request, employed for pre-warming
+  #
+  # @return index       [int] The index of the worker (to be released)
+  # @return worker      [object] The worker
+  # @return reconfigure [bool] True if the worker must be reconfigured
+  def acquire(self, configuration, request):
+    with self._lock:
+      self._trackConfiguration(configuration, request)
+    self._scale(self._scheduler.getBacklog() + 1)
+    [index, reconfigure] = self._scheduler.acquire(configuration)
+    with self._lock:
+      worker = self._workers[index]
+    return [index, worker, reconfigure]
+
+  ## Releases a worker
+  #
+  # @param index       [int] The index of the worker
+  # @param duration    [float] The request's duration (seconds)
+  # @param reconfigure [bool] True if the worker was reconfigured
+  def release(self, index, duration, reconfigure):
+    self._scheduler.release(index, duration, reconfigure)
+
+  ## Reaps the workers idle for longer than the timeout, down to the minimum
+  #
+  # The longest idle workers are reaped first.
+  #
+  # @return reaped [int] The number of reaped workers
+  def reap(self):
+    idle_times = self._scheduler.getIdleTimes()
+    candidates = sorted([[idle_time, index] \
+        for [index, idle_time] in idle_times.items() \
+        if idle_time > self._idle_timeout], reverse = True)
+    reaped = 0
+    for [idle_time, index] in candidates:
+      with self._lock:
+        if len(self._workers) <= self._min_workers:
+          break
+        # The worker may have been assigned meanwhile
+        if not self._scheduler.removeIdleProcess(index):
+          continue
+        worker = self._workers.pop(index)
+        self._reaped += 1
+      self._shutdown(worker)
+      reaped += 1
+    return reaped
+
+  ## Returns the pool statistics
+  #
+  # @return statistics [dictionary] The workers counters and the scheduling statistics (see configuration_scheduler.ConfigurationScheduler::getStatistics)
+  def getStatistics(self):
+    statistics = self._scheduler.getStatistics()
+    with self._lock:
+      statistics['workers'] = len(self._workers)
+      statistics['spawning'] = self._spawning
+      statistics['spawned'] = self._spawned
+      statistics['reaped'] = self._reaped
+      statistics['prewarmed'] = self._prewarmed
+    return statistics
+
+  ## Stops the reaper and terminates the idle workers
+  def shutdown(self):
+    self._stop.set()
+    with self._lock:
+      workers = [[index, self._workers[index]] for index in self._workers \
+          if self._scheduler.removeIdleProcess(index)]
+      for [index, worker] in workers:
+        del self._workers[index]
+    for [index, worker] in workers:
+      self._shutdown(worker)
+
+  ## Spawns a worker in the background if the backlog exceeds the idle workers
+  #
+  # @param backlog [int] The number of requests waiting for a worker
+  def _scale(self, backlog):
+    idle = len(self._scheduler.getIdleTimes())
+    with self._lock:
+      if backlog <= idle + self._spawning or \
+          len(self._workers) + self._spawning >= self._max_workers:
+        return
+      self._spawning += 1
+    thread = threading.Thread(target = self._spawn)
+    thread.daemon = True
+    thread.start()
+
+  ## Spawns and pre-warms a worker
+  def _spawn(self):
+    configuration = None
+    try:
+      worker = self._factory()
+      [configuration, request] = self._selectPrewarmConfiguration()
+      if configuration is not None:
+        if self._configure(worker, request) != '':
+          configuration = None
+    except Exception:
+      with self._lock:
+        self._spawning -= 1
+      raise
+    with self._lock:
+      self._spawning -= 1
+      self._spawned += 1
+      if configuration is not None:
+        self._prewarmed += 1
+    self._addWorker(worker, configuration)
+
+  ## Adds a worker to the pool
+  #
+  # @param worker        [object] The worker
+  # @param configuration [string] The worker's configuration hash, None if not configured
+  def _addWorker(self, worker, configuration):
+    with self._lock:
+      index = self._scheduler.addProcess(configuration)
+      self._workers[index] = worker
+
+  ## Selects the most popular configuration that no idle worker holds
+  #
+  # @return configuration [string] The configuration hash, None if all are held
+  # @return request       [object] The configuration's latest request
+  def _selectPrewarmConfiguration(self):
+    held = self._scheduler.getConfigurations(idle = True)
+    with self._lock:
+      candidates = sorted([[self._configurations[c][0], c] \
+          for c in self._configurations if c not in held], reverse = True)
+      if len(candidates) == 0:
+        return [None, None]
+      configuration = candidates[0][1]
+      return [configuration, self._configurations[configuration][1]]
+
+  ## Counts a request of a configuration (the lock must be held)
+  #
+  # The least popular configuration is forgotten when too many are tracked.
+  #
+  # @param configuration [string] The configuration hash
+  # @param request       [object] The request
+  def _trackConfiguration(self, configuration, request):
+    count = 0
+    if configuration in self._configurations:
+      count = self._configurations[configuration][0]
+    elif len(self._configurations) >= self.max_tracked_configurations:
+      least_popular = min([[self._configurations[c][0], c] \
+          for c in self._configurations])[1]
+      del self._configurations[least_popular]
+    self._configurations[configuration] = [count + 1, request]
+
+  ## Reaps the idle workers periodically, until the pool is shut down
+  def _reapPeriodically(self):
+    period = max(1.0, self._idle_timeout / 10.0)
+    while not self._stop.wait(period):
+      self.reap()
@@ -0,0 +1,101 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+import sys
+import unittest
+import roslib
+import time
+import threading
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import ConfigurationScheduler
+
+class TestAudioProcessing(unittest.TestCase):
+    def _acquireInThread(self, module, configuration, result):
+        def acquire():
+            result.extend(module.acquire(configuration))
+        thread = threading.Thread(target = acquire)
+        thread.start()
+        return thread
+
+    def test_affinity(self):
+        module = ConfigurationScheduler(2, 1.0, 1.0)
+        self.assertEqual(module.acquire('a'), [0, True])
+        module.release(0, 0.0, True)
+        self.assertEqual(module.acquire('b'), [1, True])
+        module.release(1, 0.0, True)
+        self.assertEqual(module.acquire('a'), [0, False])
+        module.release(0, 0.0, False)
+        statistics = module.getStatistics()
+        self.assertEqual(statistics['requests'], 3)
+        self.assertEqual(statistics['reconfigurations'], 2)
+
+    def test_leastRecentlyUsedEviction(self):
+        module = ConfigurationScheduler(2, 1.0, 1.0)
+        module.acquire('a')
+        module.acquire('b')
+        module.release(1, 0.0, True)
+        time.sleep(0.01)
+        module.release(0, 0.0, True)
+        # 'b' was used least recently
+        self.assertEqual(module.acquire('c'), [1, True])
+
+    def test_waitForConfiguration(self):
+        # Reconfiguring costs far more than a recognition
+        module = ConfigurationScheduler(2, 10.0, 0.2)
+        self.assertEqual(module.acquire('a'), [0, True])
+        module.release(0, 10.2, True)
+        self.assertEqual(module.acquire('a'), [0, False])
+        result = []
+        thread = self._acquireInThread(module, 'a', result)
+        time.sleep(0.1)
+        # The idle process was not reconfigured
+        self.assertEqual(result, [])
+        module.release(0, 0.2, False)
+        thread.join()
+        self.assertEqual(result, [0, False])
+        statistics = module.getStatistics()
+        self.assertEqual(statistics['reconfigurations_avoided'], 1)
+        self.assertTrue(statistics['queue_wait_time'] > 0.05)
+
+    def test_reconfigureWhenCheaper(self):
+        # Waiting costs more than reconfiguring
+        module = ConfigurationScheduler(2, 0.1, 10.0)
+        self.assertEqual(module.acquire('a'), [0, True])
+        self.assertEqual(module.acquire('a'), [1, True])
+        self.assertEqual(module.getStatistics()['reconfigurations_avoided'], 0)
+
+    def test_waitWhenAllRunning(self):
+        module = ConfigurationScheduler(1, 1.0, 1.0)
+        self.assertEqual(module.acquire('a'), [0, True])
+        result = []
+        thread = self._acquireInThread(module, 'b', result)
+        time.sleep(0.05)
+        self.assertEqual(result, [])
+        module.release(0, 1.0, True)
+        thread.join()
+        self.assertEqual(result, [0, True])
+
+    def test_estimatesUpdated(self):
+        module = ConfigurationScheduler(1, 1.0, 1.0)
+        module.acquire('a')
+        module.release(0, 4.0, True)
+        module.acquire('a')
+        module.release(0, 0.0, False)
+        statistics = module.getStatistics()
+        self.assertTrue(statistics['recognition_time'] < 1.0)
+        self.assertTrue(statistics['reconfiguration_cost'] > 1.0)
@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+import unittest
+import roslib
+import os
+import time
+import shutil
+import tempfile
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import DictionaryIndex
+from rapp_speech_detection_sphinx4 import RappError
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dictionary = os.path.join(self.directory, 'test.dict')
+        self.index = os.path.join(self.directory, 'index', 'test.idx')
+        self._writeDictionary(\
+            "'bout B AW T\n" + \
+            "a AH\n" + \
+            "a's EY Z\n" + \
+            "a(2) EY\n" + \
+            "read R EH D\n" + \
+            "read(2) R IY D\n" + \
+            "reader R IY D ER\n" + \
+            "zulu Z UW L UW")
+        self.module = DictionaryIndex(self.dictionary, self.index)
+
+    def tearDown(self):
+        self.module.close()
+        self.module = None
+        shutil.rmtree(self.directory)
+
+    def _writeDictionary(self, contents):
+        with open(self.dictionary, 'w') as f:
+            f.write(contents)
+
+    def test_lookup(self):
+        self.assertEqual(self.module.lookup('reader'), [['R', 'IY', 'D', 'ER']])
+        self.assertEqual(self.module.lookup("a's"), [['EY', 'Z']])
+
+    def test_alternativePronunciations(self):
+        self.assertEqual(self.module.lookup('a'), [['AH'], ['EY']])
+        self.assertEqual(self.module.lookup('read'), \
+            [['R', 'EH', 'D'], ['R', 'IY', 'D']])
+
+    def test_firstAndLastEntries(self):
+        self.assertEqual(self.module.lookup("'bout"), [['B', 'AW', 'T']])
+        self.assertEqual(self.module.lookup('zulu'), [['Z', 'UW', 'L', 'UW']])
+
+    def test_missingWords(self):
+        self.assertEqual(self.module.lookup('re'), [])
+        self.assertEqual(self.module.lookup('read(2)'), [])
+        self.assertEqual(self.module.lookup('zzz'), [])
+        self.assertEqual(self.module.lookup(''), [])
+
+    def test_indexIsReused(self):
+        modified = os.path.getmtime(self.index)
+        time.sleep(0.01)
+        index = DictionaryIndex(self.dictionary, self.index)
+        self.assertEqual(os.path.getmtime(self.index), modified)
+        self.assertEqual(index.lookup('a'), [['AH'], ['EY']])
+        index.close()
+
+    def test_staleIndexIsRebuilt(self):
+        self._writeDictionary("a AH\nb B IY\n")
+        index = DictionaryIndex(self.dictionary, self.index)
+        self.assertEqual(index.lookup('b'), [['B', 'IY']])
+        self.assertEqual(index.lookup('a'), [['AH']])
+        self.assertEqual(index.lookup('read'), [])
+        index.close()
+
+    def test_emptyIndex(self):
+        self.module.close()
+        with open(self.index, 'w') as f:
+            pass
+        self.module = DictionaryIndex(self.dictionary, self.index)
+        self.assertEqual(self.module.lookup('zulu'), [['Z', 'UW', 'L', 'UW']])
+        self.assertNotEqual(os.path.getsize(self.index), 0)
+
+    def test_emptyDictionary(self):
+        empty_dictionary = os.path.join(self.directory, 'empty.dict')
+        with open(empty_dictionary, 'w') as f:
+            pass
+        self.assertRaises(RappError, DictionaryIndex, empty_dictionary, \
+            os.path.join(self.directory, 'index', 'empty.idx'))
@@ -0,0 +1,57 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import unittest
+import roslib
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import GraphemeTransducer
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.module = GraphemeTransducer()
+        self.module.addRules({'a': 'A ', 'b': 'B ', 'ab': 'X ', 'abc': 'Y '})
+
+    def tearDown(self):
+        self.module = None
+
+    def test_longestMatch(self):
+        self.assertEqual(self.module.transduce('abcab'), 'Y X ')
+        self.assertEqual(self.module.transduce('aab'), 'A X ')
+        self.assertEqual(self.module.transduce('abb'), 'X B ')
+
+    def test_unmatchedLetters(self):
+        self.assertEqual(self.module.transduce('cad'), 'cA d')
+        self.assertEqual(self.module.transduce(''), '')
+
+    def test_firstRulePrecedence(self):
+        self.module.addRules({'a': 'Z '})
+        self.assertEqual(self.module.transduce('a'), 'A ')
+
+    def test_contextRules(self):
+        self.module.addContextRules({'bad': 'bbd', 'bac': 'bc'}, 1)
+        # The context is matched but not consumed
+        self.assertEqual(self.module.transduce('bad'), 'B B d')
+        self.assertEqual(self.module.transduce('babc'), 'B Y ')
+        self.assertEqual(self.module.transduce('ba'), 'B A ')
+
+    def test_cachedResults(self):
+        self.assertEqual(self.module.transduce('ab'), 'X ')
+        self.module.addRules({'bb': 'W '})
+        self.assertEqual(self.module.transduce('abb'), 'X B ')
+        self.assertEqual(self.module.transduce('bb'), 'W ')
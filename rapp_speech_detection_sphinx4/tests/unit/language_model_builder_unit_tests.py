@@ -0,0 +1,99 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+import sys
+import unittest
+import roslib
+import os
+import shutil
+import tempfile
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import LanguageModelBuilder
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.module = LanguageModelBuilder()
+        self.sentences = [ \
+                ['<s>', 'autos', '</s>'], \
+                ['<s>', 'dyskolo', '</s>'], \
+                ['<s>', 'autos', 'dyskolo', '</s>'] \
+                ]
+
+    def tearDown(self):
+        self.module = None
+        shutil.rmtree(self.directory)
+
+    def test_readSentences(self):
+        sentences_file = os.path.join(self.directory, 'sentences.txt')
+        with open(sentences_file, 'w') as f:
+            f.write('<s> autos </s>\n\nautos dyskolo\n')
+        sentences = self.module.readSentences(sentences_file)
+        self.assertEqual(sentences, [['<s>', 'autos', '</s>'], \
+                ['<s>', 'autos', 'dyskolo', '</s>']])
+
+    def test_unigramsNormalized(self):
+        [unigrams, bigrams] = self.module.estimate(self.sentences)
+        self.assertEqual(sorted(unigrams), \
+                ['</s>', '<s>', 'autos', 'dyskolo'])
+        self.assertEqual(unigrams['<s>'][0], self.module.log_zero)
+        total = sum([10 ** unigrams[w][0] for w in unigrams if w != '<s>'])
+        self.assertAlmostEqual(total, 1.0)
+
+    def test_bigramsNormalized(self):
+        [unigrams, bigrams] = self.module.estimate(self.sentences)
+        # Every history's distribution, including the back-off, sums to 1
+        for history in ['<s>', 'autos', 'dyskolo']:
+            total = 0.0
+            for word in unigrams:
+                if word == '<s>':
+                    continue
+                if (history, word) in bigrams:
+                    total += 10 ** bigrams[(history, word)]
+                else:
+                    total += 10 ** (unigrams[history][1] + unigrams[word][0])
+            self.assertAlmostEqual(total, 1.0)
+        # Seen bigrams are more probable than the backed-off ones
+        self.assertTrue(bigrams[('autos', 'dyskolo')] > \
+                unigrams['autos'][1] + unigrams['autos'][0])
+
+    def test_arpaFormat(self):
+        sentences_file = os.path.join(self.directory, 'sentences.txt')
+        language_model = os.path.join(self.directory, 'sentences.lm')
+        with open(sentences_file, 'w') as f:
+            f.write('<s> autos </s>\n<s> dyskolo </s>\n')
+        self.module.buildLanguageModel(sentences_file, language_model)
+        with open(language_model) as f:
+            lines = [line.strip() for line in f.readlines()]
+        self.assertEqual(lines[0], '\\data\\')
+        self.assertEqual(lines[1], 'ngram 1=4')
+        self.assertEqual(lines[2], 'ngram 2=4')
+        self.assertTrue('\\1-grams:' in lines)
+        self.assertTrue('\\2-grams:' in lines)
+        self.assertEqual(lines[-1], '\\end\\')
+        unigrams = lines[lines.index('\\1-grams:') + 1: \
+                lines.index('\\2-grams:') - 1]
+        bigrams = lines[lines.index('\\2-grams:') + 1: -2]
+        self.assertEqual(len(unigrams), 4)
+        self.assertEqual(len(bigrams), 4)
+        for line in unigrams:
+            self.assertEqual(len(line.split()), 3)
+        for line in bigrams:
+            self.assertEqual(len(line.split()), 3)
+            float(line.split()[0])
+
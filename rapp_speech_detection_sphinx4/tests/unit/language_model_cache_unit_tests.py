@@ -0,0 +1,111 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+import sys
+import unittest
+import roslib
+import os
+import time
+import shutil
+import tempfile
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import LanguageModelCache
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.module = LanguageModelCache(self.directory, 1000)
+
+    def tearDown(self):
+        self.module = None
+        shutil.rmtree(self.directory)
+
+    def _build(self, key, size):
+        staging = self.module.createStagingDirectory()
+        with open(os.path.join(staging, 'sentences.lm.bin'), 'w') as f:
+            f.write('x' * size)
+        return self.module.put(key, staging)
+
+    def test_canonicalKey(self):
+        words_1 = {'autos': ['AA','F','T','OW','S'], 'ekei': ['EH','K','IH']}
+        words_2 = {'ekei': ['EH','K','IH'], 'autos': ['AA','F','T','OW','S']}
+        key_1 = self.module.createKey('en', words_1, ['autos'], [])
+        key_2 = self.module.createKey('en', words_2, ('autos',), ())
+        self.assertEqual(key_1, key_2)
+        self.assertNotEqual(key_1, \
+                self.module.createKey('el', words_1, ['autos'], []))
+        self.assertNotEqual(key_1, \
+                self.module.createKey('en', words_1, [], ['autos']))
+
+    def test_hitMiss(self):
+        key = self.module.createKey('en', {'ekei': ['EH','K','IH']}, [], [])
+        self.assertEqual(self.module.get(key), None)
+        directory = self._build(key, 10)
+        self.assertEqual(self.module.get(key), directory)
+        self.assertTrue(\
+                os.path.isfile(os.path.join(directory, 'sentences.lm.bin')))
+        statistics = self.module.getStatistics()
+        self.assertEqual(statistics['hits'], 1)
+        self.assertEqual(statistics['misses'], 1)
+        self.assertEqual(statistics['entries'], 1)
+        self.assertEqual(statistics['size'], 10)
+
+    def test_concurrentPut(self):
+        key = self.module.createKey('en', {'ekei': ['EH','K','IH']}, [], [])
+        directory_1 = self._build(key, 10)
+        directory_2 = self._build(key, 10)
+        self.assertEqual(directory_1, directory_2)
+        self.assertEqual(self.module.getStatistics()['entries'], 1)
+
+    def test_eviction(self):
+        self._build('a', 400)
+        # Differentiate the modification times
+        os.utime(os.path.join(self.directory, 'a'), \
+                (time.time() - 10, time.time() - 10))
+        self._build('b', 400)
+        self._build('c', 400)
+        self.assertEqual(self.module.get('a'), None)
+        self.assertNotEqual(self.module.get('b'), None)
+        self.assertNotEqual(self.module.get('c'), None)
+        statistics = self.module.getStatistics()
+        self.assertEqual(statistics['evictions'], 1)
+        self.assertLessEqual(statistics['size'], 1000)
+
+    def test_pinning(self):
+        directory = self._build('a', 400)
+        os.utime(directory, (time.time() - 10, time.time() - 10))
+        self.module.pin(directory)
+        self.module.pin(directory)
+        self._build('b', 400)
+        self._build('c', 400)
+        self.assertEqual(self.module.get('a'), directory)
+        self.assertEqual(self.module.get('b'), None)
+        self.module.unpin(directory)
+        os.utime(directory, (time.time() - 10, time.time() - 10))
+        self._build('d', 400)
+        self.assertEqual(self.module.get('a'), directory)
+        self.module.unpin(directory)
+        os.utime(directory, (time.time() - 10, time.time() - 10))
+        self._build('e', 400)
+        self.assertEqual(self.module.get('a'), None)
+
+    def test_persistence(self):
+        key = self.module.createKey('en', {'ekei': ['EH','K','IH']}, [], [])
+        directory = self._build(key, 10)
+        self.module = LanguageModelCache(self.directory, 1000)
+        self.assertEqual(self.module.get(key), directory)
@@ -0,0 +1,106 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import unittest
+import roslib
+import os
+import shutil
+import tempfile
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import LanguagePacks
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.packs_directory = os.path.join(self.directory, 'packs')
+        self.configuration_directory = os.path.join(self.directory, 'conf')
+        os.makedirs(self.configuration_directory)
+        for f in ['custom.dict', 'custom.gram', 'sentences.txt', \
+            'sentences.lm']:
+            with open(os.path.join(self.configuration_directory, f), 'w') as h:
+                h.write(f + '\n')
+        self.configuration = { \
+            'grammar_folder': self.configuration_directory, \
+            'language_model': os.path.join(self.configuration_directory, \
+                'sentences.lm') \
+            }
+        self.module = LanguagePacks(self.packs_directory)
+
+    def tearDown(self):
+        self.module = None
+        shutil.rmtree(self.directory)
+
+    def test_unknownVocabulary(self):
+        self.assertIsNone(self.module.get('el', ['ναι'], [], ['ναι'], 'v1'))
+
+    def test_addGet(self):
+        self.module.add('test', 'el', ['ναι', 'όχι'], [], ['ναι', 'όχι'], \
+            self.configuration, {'nai': 'ναι', "o'xi": 'όχι'}, 'v1')
+        [conf, word_mapping] = self.module.get('el', ['όχι', 'ναι'], [], \
+            ['όχι', 'ναι'], 'v1')
+        package = conf['grammar_folder']
+        self.assertEqual(os.path.dirname(package), self.packs_directory)
+        self.assertEqual(conf['dictionary'], \
+            os.path.join(package, 'custom.dict'))
+        self.assertEqual(conf['language_model'], \
+            os.path.join(package, 'sentences.lm'))
+        self.assertEqual(conf['grammar_name'], 'custom')
+        self.assertTrue(conf['grammar_disabled'])
+        self.assertTrue(os.path.isfile(conf['dictionary']))
+        self.assertEqual(word_mapping, {'nai': 'ναι', "o'xi": 'όχι'})
+        self.assertIsNone(self.module.get('en', ['ναι', 'όχι'], [], \
+            ['ναι', 'όχι'], 'v1'))
+        self.assertIsNone(self.module.get('el', ['ναι'], [], ['ναι'], 'v1'))
+
+    def test_canonicalRequest(self):
+        first = self.module.createKey('el', ['ναι', 'όχι', 'ναι'], [], \
+            ['όχι', 'ναι'])
+        second = self.module.createKey('el', ['όχι', 'ναι'], [], \
+            ['ναι', 'όχι'])
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, self.module.createKey('el', \
+            ['όχι', 'ναι'], ['ναι', 'όχι'], ['ναι', 'όχι']))
+
+    def test_savedRegistry(self):
+        self.module.add('first', 'en', ['yes', 'no'], [], ['yes', 'no'], \
+            self.configuration, {}, 'v1')
+        self.module.add('second', 'en', ['no', 'yes'], [], ['yes', 'no'], \
+            self.configuration, {}, 'v1')
+        self.module.save()
+        packs = LanguagePacks(self.packs_directory)
+        self.assertEqual(packs.getSize(), 1)
+        [conf, word_mapping] = packs.get('en', ['yes', 'no'], [], \
+            ['yes', 'no'], 'v1')
+        self.assertEqual(word_mapping, {})
+
+    def test_missingPackDirectory(self):
+        self.module.add('test', 'en', ['yes'], [], ['yes'], \
+            self.configuration, {}, 'v1')
+        shutil.rmtree(self.packs_directory)
+        self.assertIsNone(self.module.get('en', ['yes'], [], ['yes'], 'v1'))
+
+    def test_versionMismatch(self):
+        self.module.add('test', 'en', ['yes'], [], ['yes'], \
+            self.configuration, {}, 'v1')
+        self.module.save()
+        packs = LanguagePacks(self.packs_directory)
+        self.assertIsNone(packs.get('en', ['yes'], [], ['yes'], 'v2'))
+        self.assertIsNone(packs.get('en', ['yes'], [], ['yes'], None))
+        self.assertIsNotNone(packs.get('en', ['yes'], [], ['yes'], 'v1'))
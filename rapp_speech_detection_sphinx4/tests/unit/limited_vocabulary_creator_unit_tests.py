@@ -72,14 +72,18 @@ class TestAudioProcessing(unittest.TestCase):
         self.assertEqual('autos AA F T OW S\n' in dict_words, True)
         self.assertEqual('dyskolo D IH S K OW L OW\n' in dict_words, True)
 
-        # Check lm.dmp and .arpa
+        # Check lm.bin and .arpa (toolkit) or the ARPA .lm (in-process)
         lm = language_model
         self.assertEqual(os.path.isfile(lm), True)
-        lm = language_model[:-6] + 'arpa'
-        self.assertEqual(os.path.isfile(lm), True)
-
-        # language model is the lm.dmp. Check the .txt instead.
-        language_model = language_model[:-6] + 'txt'
+        if language_model.endswith('.lm.bin'):
+            lm = language_model[:-6] + 'arpa'
+            self.assertEqual(os.path.isfile(lm), True)
+        else:
+            with open(lm) as f:
+                self.assertEqual(f.readline(), '\\data\\\n')
+
+        # Check the .txt the language model was built from
+        language_model = os.path.join( grammar_folder, 'sentences.txt' )
         with open(language_model) as f:
             sentences = f.readlines()
         self.assertEqual('<s> autos </s>\n' in sentences, True)
@@ -135,16 +139,31 @@ class TestAudioProcessing(unittest.TestCase):
         self.assertEqual('ekei EH K IH\n' in dict_words, True)
         self.assertEqual('kserw K S EH R OW\n' in dict_words, True)
 
-        # Check lm.dmp and .arpa
+        # Check lm.bin and .arpa (toolkit) or the ARPA .lm (in-process)
         lm = language_model
         self.assertEqual(os.path.isfile(lm), True)
-        lm = language_model[:-6] + 'arpa'
-        self.assertEqual(os.path.isfile(lm), True)
-
-        # language model is the lm.dmp. Check the .txt instead.
-        language_model = language_model[:-6] + 'txt'
+        if language_model.endswith('.lm.bin'):
+            lm = language_model[:-6] + 'arpa'
+            self.assertEqual(os.path.isfile(lm), True)
+        else:
+            with open(lm) as f:
+                self.assertEqual(f.readline(), '\\data\\\n')
+
+        # Check the .txt the language model was built from
+        language_model = os.path.join( grammar_folder, 'sentences.txt' )
         with open(language_model) as f:
             sentences = f.readlines()
         self.assertEqual('<s> ekei </s>\n' in sentences, True)
         self.assertEqual('<s> kserw </s>\n' in sentences, True)
 
+
+    def test_separateConfigurations(self):
+        first = self.module.createConfigurationFiles( \
+            {'nai': ['N', 'EH']}, [], ['nai'])
+        first_dictionary = first['dictionary']
+        second = self.module.createConfigurationFiles( \
+            {'oxi': ['OW', 'HH', 'IH']}, ['oxi'], ['oxi'])
+        self.assertIsNot(first, second)
+        self.assertEqual(first['dictionary'], first_dictionary)
+        self.assertEqual(first['grammar_disabled'], True)
+        self.assertEqual(second['grammar_disabled'], False)
@@ -0,0 +1,98 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import unittest
+import roslib
+import os
+import shutil
+import tempfile
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import PronunciationCache
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.directory, 'cache', 'test.cache')
+        self.module = PronunciationCache(self.cache_file, 'version1')
+
+    def tearDown(self):
+        self.module = None
+        shutil.rmtree(self.directory)
+
+    def test_getPut(self):
+        self.assertIsNone(self.module.get('hello'))
+        self.module.put('hello', ['HH', 'AH', 'L', 'OW'])
+        self.assertEqual(self.module.get('hello'), ['HH', 'AH', 'L', 'OW'])
+        statistics = self.module.getStatistics()
+        self.assertEqual(statistics['hits'], 1)
+        self.assertEqual(statistics['misses'], 1)
+        self.assertEqual(statistics['entries'], 1)
+
+    def test_persistence(self):
+        self.module.put('hello', ['HH', 'AH', 'L', 'OW'])
+        self.module.put('ναι', ['N', 'EH'])
+        cache = PronunciationCache(self.cache_file, 'version1')
+        self.assertEqual(cache.get('hello'), ['HH', 'AH', 'L', 'OW'])
+        self.assertEqual(cache.get('ναι'), ['N', 'EH'])
+
+    def test_versionInvalidation(self):
+        self.module.put('hello', ['HH', 'AH', 'L', 'OW'])
+        cache = PronunciationCache(self.cache_file, 'version2')
+        self.assertIsNone(cache.get('hello'))
+        cache.put('world', ['W', 'ER', 'L', 'D'])
+        cache = PronunciationCache(self.cache_file, 'version2')
+        self.assertIsNone(cache.get('hello'))
+        self.assertEqual(cache.get('world'), ['W', 'ER', 'L', 'D'])
+
+    def test_incompleteEntry(self):
+        self.module.put('hello', ['HH', 'AH', 'L', 'OW'])
+        with open(self.cache_file, 'a') as f:
+            f.write('world\tW E')
+        cache = PronunciationCache(self.cache_file, 'version1')
+        self.assertIsNone(cache.get('world'))
+        cache.put('world', ['W', 'ER', 'L', 'D'])
+        cache = PronunciationCache(self.cache_file, 'version1')
+        self.assertEqual(cache.get('hello'), ['HH', 'AH', 'L', 'OW'])
+        self.assertEqual(cache.get('world'), ['W', 'ER', 'L', 'D'])
+
+    def test_separatorWords(self):
+        self.module.put('a\tb', ['AH'])
+        self.assertIsNone(self.module.get('a\tb'))
+
+    def test_compaction(self):
+        self.module.put('hello', ['HH', 'AH', 'L', 'OW'])
+        self.module.put('hello', ['HH', 'EH', 'L', 'OW'])
+        cache = PronunciationCache(self.cache_file, 'version1')
+        self.assertEqual(cache.get('hello'), ['HH', 'EH', 'L', 'OW'])
+        with open(self.cache_file, 'r') as f:
+            self.assertEqual(f.read(), 'version1\nhello\tHH EH L OW\n')
+
+    def test_cap(self):
+        self.module.put('one', ['W', 'AH', 'N'])
+        self.module.put('two', ['T', 'UW'])
+        self.module.put('three', ['TH', 'R', 'IY'])
+        self.module.put('one', ['W', 'AA', 'N'])
+        cache = PronunciationCache(self.cache_file, 'version1', 2)
+        self.assertIsNone(cache.get('two'))
+        self.assertEqual(cache.get('three'), ['TH', 'R', 'IY'])
+        self.assertEqual(cache.get('one'), ['W', 'AA', 'N'])
+        with open(self.cache_file, 'r') as f:
+            self.assertEqual(f.read(), \
+                'version1\nthree\tTH R IY\none\tW AA N\n')
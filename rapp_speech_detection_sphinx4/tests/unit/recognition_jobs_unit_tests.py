@@ -0,0 +1,130 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+import unittest
+import roslib
+import time
+import threading
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import RecognitionJobs
+
+class Response:
+    def __init__(self, words, error):
+        self.words = words
+        self.error = error
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = []
+
+    def tearDown(self):
+        self.release.set()
+        self.module.shutdown()
+        self.module = None
+
+    def _recognize(self, job_id, request, partial):
+        self.started.append(request)
+        partial(request.split(' ')[:1])
+        self.release.wait(5)
+        if request == 'fail':
+            raise RuntimeError('Sphinx died')
+        if request == 'error':
+            return Response([], 'Error: Audio source unrecognized')
+        return Response(request.split(' '), '')
+
+    def _waitFinished(self, job_id):
+        for i in range(200):
+            job = self.module.getJob(job_id)
+            if job['status'] in ['done', 'failed']:
+                return job
+            time.sleep(0.01)
+        return job
+
+    def test_submitReturnsImmediately(self):
+        self.module = RecognitionJobs(self._recognize, 1, 10.0)
+        start = time.time()
+        job_id = self.module.submit('nai oxi')
+        self.assertTrue(time.time() - start < 0.5)
+        self.assertNotEqual(self.module.getJob(job_id)['status'], 'done')
+        self.release.set()
+        job = self._waitFinished(job_id)
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['words'], ['nai', 'oxi'])
+        self.assertEqual(job['error'], '')
+
+    def test_queuePosition(self):
+        self.module = RecognitionJobs(self._recognize, 1, 10.0)
+        first = self.module.submit('a')
+        second = self.module.submit('b')
+        third = self.module.submit('c')
+        for i in range(100):
+            if self.module.getJob(first)['status'] == 'running':
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.module.getJob(first)['status'], 'running')
+        self.assertEqual(self.module.getJob(second)['position'], 1)
+        self.assertEqual(self.module.getJob(third)['position'], 2)
+        self.assertEqual(self.module.getStatistics(), \
+            {'queued': 2, 'running': 1, 'finished': 0})
+        self.release.set()
+        self.assertEqual(self._waitFinished(third)['words'], ['c'])
+        self.assertEqual(self.started, ['a', 'b', 'c'])
+
+    def test_concurrentDispatchers(self):
+        self.module = RecognitionJobs(self._recognize, 3, 10.0)
+        for request in ['a', 'b', 'c']:
+            self.module.submit(request)
+        for i in range(100):
+            if len(self.started) == 3:
+                break
+            time.sleep(0.01)
+        self.assertEqual(sorted(self.started), ['a', 'b', 'c'])
+
+    def test_failedJobs(self):
+        self.module = RecognitionJobs(self._recognize, 2, 10.0)
+        self.release.set()
+        job = self._waitFinished(self.module.submit('error'))
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'Error: Audio source unrecognized')
+        job = self._waitFinished(self.module.submit('fail'))
+        self.assertEqual(job['status'], 'failed')
+        self.assertTrue('Sphinx died' in job['error'])
+
+    def test_partialWords(self):
+        self.module = RecognitionJobs(self._recognize, 1, 10.0)
+        job_id = self.module.submit('nai oxi isos')
+        for i in range(100):
+            if self.module.getJob(job_id)['status'] == 'running':
+                break
+            time.sleep(0.01)
+        job = self.module.getJob(job_id)
+        self.assertEqual(job['status'], 'running')
+        self.assertEqual(job['words'], ['nai'])
+        self.release.set()
+        job = self._waitFinished(job_id)
+        self.assertEqual(job['words'], ['nai', 'oxi', 'isos'])
+
+    def test_unknownAndExpiredJobs(self):
+        self.module = RecognitionJobs(self._recognize, 1, 0.1)
+        self.assertEqual(self.module.getJob('missing'), None)
+        self.release.set()
+        job_id = self.module.submit('a')
+        self.assertEqual(self._waitFinished(job_id)['status'], 'done')
+        time.sleep(0.2)
+        self.assertEqual(self.module.getJob(job_id), None)
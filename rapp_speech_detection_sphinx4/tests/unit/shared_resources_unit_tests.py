@@ -0,0 +1,82 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import unittest
+import roslib
+import threading
+import time
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import SharedResources
+from rapp_speech_detection_sphinx4 import GreekSupport
+from rapp_speech_detection_sphinx4 import EnglishSupport
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def _factory(self):
+        self.calls.append(1)
+        return object()
+
+    def test_createdOnce(self):
+        resource = SharedResources.get('test_created_once', self._factory)
+        self.assertIs(SharedResources.get('test_created_once', \
+            self._factory), resource)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_distinctKeys(self):
+        first = SharedResources.get(('test_key', 1), self._factory)
+        second = SharedResources.get(('test_key', 2), self._factory)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_failingFactory(self):
+        def fail():
+            raise IOError('missing')
+        self.assertRaises(IOError, SharedResources.get, 'test_failing', fail)
+        resource = SharedResources.get('test_failing', self._factory)
+        self.assertIsNotNone(resource)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_concurrentRequests(self):
+        def slowFactory():
+            time.sleep(0.1)
+            return self._factory()
+        resources = []
+        threads = [threading.Thread(target = lambda: resources.append( \
+            SharedResources.get('test_concurrent', slowFactory))) \
+            for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(len(set([id(r) for r in resources])), 1)
+
+    def test_sharedSupportResources(self):
+        english_support = EnglishSupport()
+        first = GreekSupport(english_support)
+        second = GreekSupport()
+        self.assertIs(first._english_support, english_support)
+        self.assertIs(first._letters, second._letters)
+        self.assertIs(first._all_special_two_digit_letters, \
+            second._all_special_two_digit_letters)
+        self.assertIs(first._english_support._english_dictionary, \
+            second._english_support._english_dictionary)
+        self.assertIs(first.rospack, second.rospack)
@@ -0,0 +1,113 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+import os
+import unittest
+import roslib
+import socket
+import time
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import createTcpChannel
+from rapp_speech_detection_sphinx4 import createPipeChannel
+from rapp_speech_detection_sphinx4 import IpcError
+from rapp_speech_detection_sphinx4 import IpcTimeoutError
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.closers = []
+
+    def tearDown(self):
+        for close in self.closers:
+            try:
+                close()
+            except (IOError, OSError, socket.error):
+                pass
+
+    # Returns [channel, write to channel, read from channel, close peer]
+    def _pipeChannel(self):
+        [command_read, command_write] = os.pipe()
+        [result_read, result_write] = os.pipe()
+        channel = createPipeChannel(os.fdopen(command_write, 'wb'), \
+            os.fdopen(result_read, 'rb'))
+        peer = [os.fdopen(command_read, 'rb', 0), \
+            os.fdopen(result_write, 'wb', 0)]
+        def close():
+            for f in peer:
+                f.close()
+        self.closers.extend([channel.close, close])
+        def read(size):
+            return os.read(peer[0].fileno(), size)
+        return [channel, peer[1].write, read, close]
+
+    def _tcpChannel(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        client = socket.create_connection(server.getsockname())
+        connection, addr = server.accept()
+        channel = createTcpChannel(connection, server)
+        def close():
+            client.shutdown(socket.SHUT_RDWR)
+            client.close()
+        self.closers.extend([channel.close, client.close])
+        return [channel, client.sendall, client.recv, close]
+
+    def _channels(self):
+        return [self._pipeChannel(), self._tcpChannel()]
+
+    def test_linesSplitAcrossWrites(self):
+        for [channel, write, read, close] in self._channels():
+            write('#hello ')
+            write('world\nstop')
+            self.assertEqual(channel.readLine(1.0), '#hello world\n')
+            write('Python\n')
+            self.assertEqual(channel.readLine(1.0), 'stopPython\n')
+
+    def test_linesMergedInOneWrite(self):
+        for [channel, write, read, close] in self._channels():
+            write('Dictionary set\nGrammar enabled\nConfiguration performed\n')
+            self.assertEqual(channel.readLine(), 'Dictionary set\n')
+            self.assertEqual(channel.readLine(), 'Grammar enabled\n')
+            self.assertEqual(channel.readLine(1.0), 'Configuration performed\n')
+
+    def test_send(self):
+        for [channel, write, read, close] in self._channels():
+            channel.send('audioInput#/tmp/a.wav\r\n')
+            self.assertEqual(read(1024), 'audioInput#/tmp/a.wav\r\n')
+
+    def test_readTimeout(self):
+        for [channel, write, read, close] in self._channels():
+            write('#partial')
+            start = time.time()
+            self.assertRaises(IpcTimeoutError, channel.readLine, 0.1)
+            self.assertTrue(time.time() - start < 1.0)
+            # The partial line is kept
+            write(' line\n')
+            self.assertEqual(channel.readLine(1.0), '#partial line\n')
+
+    def test_endOfStream(self):
+        for [channel, write, read, close] in self._channels():
+            write('stopPython\n')
+            close()
+            self.assertEqual(channel.readLine(1.0), 'stopPython\n')
+            self.assertEqual(channel.readLine(1.0), '')
+
+    def test_sendAfterPeerClosed(self):
+        [channel, write, read, close] = self._pipeChannel()
+        close()
+        self.assertRaises(IpcError, channel.send, 'healthCheck#\r\n')
@@ -0,0 +1,168 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import unittest
+import roslib
+import os
+import time
+import shutil
+import wave
+import struct
+import tempfile
+import threading
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import Sphinx4Wrapper
+from rapp_speech_detection_sphinx4 import LanguageModelCache
+
+## A wrapper of fake Sphinx subprocesses, recording their configurations
+class StandbyWrapper(Sphinx4Wrapper):
+    def __init__(self):
+        self._conf = ''
+        self._channel = None
+        self._sphinxSubprocess = None
+        self._standby = None
+        self._standby_lock = threading.Lock()
+        self._sphinx_warm_standby = True
+        self._language_model_cache = None
+        self.spawned = 0
+        self.configurations = {}
+
+    def _spawnSphinx(self, jar_path):
+        self.spawned += 1
+        channel = 'channel' + str(self.spawned)
+        self.configurations[channel] = []
+        return {'process': 'process' + str(self.spawned), \
+            'channel': channel, 'conf': None}
+
+    def _configureChannel(self, channel, conf):
+        self.configurations[channel].append(dict(conf))
+
+    def _prepareStandby(self):
+        self._prepareStandbyBlocking()
+
+    def _isHealthy(self, instance):
+        return True
+
+    def _terminateSphinx(self, instance):
+        pass
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.module = StandbyWrapper()
+        self.conf = {'jar_path': 'jar', 'dictionary': 'first.dict', \
+            'language_model': 'first.lm'}
+
+    def tearDown(self):
+        self.module = None
+
+    def test_standbyReconfiguration(self):
+        self.module.initializeSphinx(self.conf)
+        # The callers may modify their configuration in place
+        self.conf['dictionary'] = 'second.dict'
+        self.conf['language_model'] = 'second.lm'
+        self.module.configureSphinx(self.conf)
+        self.assertEqual(self.module.configurations['channel2'][-1], \
+            self.conf)
+
+        self.module._respawnSphinx()
+        self.assertEqual(self.module._channel, 'channel2')
+        self.assertEqual(self.module.configurations['channel2'][-1], \
+            self.conf)
+        # The new standby is configured as well
+        self.assertEqual(self.module.configurations['channel3'][-1], \
+            self.conf)
+
+    def test_pinnedConfiguration(self):
+        directory = tempfile.mkdtemp()
+        try:
+            cache = LanguageModelCache(directory, 1000)
+            self.module._language_model_cache = cache
+
+            def build(key):
+                staging = cache.createStagingDirectory()
+                for f in ['custom.dict', 'sentences.lm']:
+                    with open(os.path.join(staging, f), 'w') as h:
+                        h.write('x' * 200)
+                package = cache.put(key, staging)
+                return {'jar_path': 'jar', 'grammar_folder': package, \
+                    'dictionary': os.path.join(package, 'custom.dict'), \
+                    'language_model': os.path.join(package, 'sentences.lm')}
+
+            first = build('first')
+            # The least recently used entry
+            os.utime(first['grammar_folder'], \
+                (time.time() - 10, time.time() - 10))
+            self.module.initializeSphinx(first)
+            build('second')
+            build('third')
+            self.assertTrue(os.path.isfile(first['dictionary']))
+            self.assertTrue(os.path.isfile(first['language_model']))
+
+            self.module._respawnSphinx()
+            conf = self.module.configurations[self.module._channel][-1]
+            self.assertEqual(conf, first)
+            self.assertTrue(os.path.isfile(conf['dictionary']))
+            self.assertTrue(os.path.isfile(conf['language_model']))
+
+            # Unpinned when reconfigured
+            self.module.configureSphinx(build('fourth'))
+            build('fifth')
+            self.assertFalse(os.path.isdir(first['grammar_folder']))
+        finally:
+            shutil.rmtree(directory)
+
+    def _writeWav(self, path, channels, width, frames):
+        audio = wave.open(path, 'wb')
+        audio.setnchannels(channels)
+        audio.setsampwidth(width)
+        audio.setframerate(16000)
+        audio.writeframes(frames)
+        audio.close()
+
+    def test_audioStreaming(self):
+        directory = tempfile.mkdtemp()
+        try:
+            self.module._sphinx_audio_transfer = 'stream'
+            samples = struct.pack('<5h', 0, 1, -1, 32767, -32768)
+            mono = os.path.join(directory, 'mono.wav')
+            self._writeWav(mono, 1, 2, samples)
+            self.assertEqual(self.module._createAudioCommand(mono), \
+                'audioData#10\r\n' + samples)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_audioStreamingFallback(self):
+        directory = tempfile.mkdtemp()
+        try:
+            self.module._sphinx_audio_transfer = 'stream'
+            stereo = os.path.join(directory, 'stereo.wav')
+            self._writeWav(stereo, 2, 2, struct.pack('<4h', 0, 1, 2, 3))
+            eight_bit = os.path.join(directory, 'eight_bit.wav')
+            self._writeWav(eight_bit, 1, 1, '\x80\x81\x7f')
+            missing = os.path.join(directory, 'missing.wav')
+            for path in [stereo, eight_bit, missing]:
+                self.assertEqual(self.module._createAudioCommand(path), \
+                    'audioInput#' + path + '\r\n')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_audioPath(self):
+        self.module._sphinx_audio_transfer = 'path'
+        self.assertEqual(self.module._createAudioCommand('/tmp/audio.wav'), \
+            'audioInput#/tmp/audio.wav\r\n')
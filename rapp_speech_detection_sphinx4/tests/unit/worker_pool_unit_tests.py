@@ -0,0 +1,128 @@
+#! /usr/bin/env python
+
+#Copyright 2015 RAPP
+
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+
+    #http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+import sys
+import unittest
+import roslib
+import time
+import threading
+
+roslib.load_manifest("rapp_speech_detection_sphinx4")
+
+from rapp_speech_detection_sphinx4 import WorkerPool
+
+class TestAudioProcessing(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.configured = []
+        self.terminated = []
+
+    def tearDown(self):
+        self.module.shutdown()
+        self.module = None
+
+    def _create(self):
+        worker = len(self.created)
+        self.created.append(worker)
+        return worker
+
+    def _configure(self, worker, request):
+        self.configured.append([worker, request])
+        return ''
+
+    def _terminate(self, worker):
+        self.terminated.append(worker)
+
+    def _createPool(self, min_workers, max_workers, idle_timeout = 0):
+        self.module = WorkerPool(self._create, self._configure, \
+                self._terminate, min_workers, max_workers, idle_timeout, \
+                1.0, 1.0)
+
+    def _waitForWorkers(self, workers):
+        start = time.time()
+        while self.module.getStatistics()['workers'] < workers and \
+                time.time() - start < 5:
+            time.sleep(0.01)
+
+    def test_minimumSpawnedEagerly(self):
+        self._createPool(2, 4)
+        self.assertEqual(self.created, [0, 1])
+        self.assertEqual(self.module.getStatistics()['workers'], 2)
+
+    def test_scaleOnBacklog(self):
+        self._createPool(1, 2)
+        [index, worker, reconfigure] = self.module.acquire('a', 'request_a')
+        self.assertEqual(worker, 0)
+        # All workers are running, another worker is spawned
+        [index_b, worker_b, reconfigure_b] = \
+                self.module.acquire('b', 'request_b')
+        self.assertEqual(worker_b, 1)
+        self._waitForWorkers(2)
+        statistics = self.module.getStatistics()
+        self.assertEqual(statistics['workers'], 2)
+        self.assertEqual(statistics['spawned'], 1)
+        self.module.release(index, 0.0, reconfigure)
+        self.module.release(index_b, 0.0, reconfigure_b)
+
+    def test_maximumRespected(self):
+        self._createPool(1, 1)
+        [index, worker, reconfigure] = self.module.acquire('a', 'request_a')
+        result = []
+        def acquire():
+            result.append(self.module.acquire('b', 'request_b'))
+        thread = threading.Thread(target = acquire)
+        thread.start()
+        time.sleep(0.1)
+        self.assertEqual(result, [])
+        self.assertEqual(self.created, [0])
+        self.module.release(index, 0.0, reconfigure)
+        thread.join()
+        self.assertEqual(result[0][1], 0)
+        self.module.release(result[0][0], 0.0, result[0][2])
+
+    def test_prewarmPopularConfiguration(self):
+        self._createPool(1, 2)
+        for i in range(3):
+            [index, worker, reconfigure] = \
+                    self.module.acquire('popular', 'request_popular')
+            self.module.release(index, 0.0, reconfigure)
+        [index, worker, reconfigure] = self.module.acquire('a', 'request_a')
+        # The only worker was reconfigured for 'a', thus the spawned worker
+        # is pre-warmed with the popular configuration
+        [index_b, worker_b, reconfigure_b] = \
+                self.module.acquire('popular', 'request_popular')
+        self.assertEqual(worker_b, 1)
+        self.assertEqual(reconfigure_b, False)
+        self.assertEqual(self.configured, [[1, 'request_popular']])
+        self.assertEqual(self.module.getStatistics()['prewarmed'], 1)
+        self.module.release(index, 0.0, reconfigure)
+        self.module.release(index_b, 0.0, reconfigure_b)
+
+    def test_reapIdle(self):
+        self._createPool(1, 3, 0.05)
+        [index, worker, reconfigure] = self.module.acquire('a', 'request_a')
+        [index_b, worker_b, reconfigure_b] = \
+                self.module.acquire('b', 'request_b')
+        self._waitForWorkers(2)
+        self.module.release(index, 0.0, reconfigure)
+        self.module.release(index_b, 0.0, reconfigure_b)
+        time.sleep(0.1)
+        # Reaped down to the minimum
+        self.module.reap()
+        statistics = self.module.getStatistics()
+        self.assertEqual(statistics['workers'], 1)
+        self.assertEqual(statistics['reaped'], 1)
+        self.assertEqual(len(self.terminated), 1)